@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_namespaces_on_commit
+
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_invalidate_cache(sender, instance, **kwargs):
+    """Kategoriya o'zgarganda kategoriya va retsept javoblari keshini eskirtirish"""
+    bump_namespaces_on_commit("categories", "recipes")
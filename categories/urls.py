@@ -1,11 +1,30 @@
 from django.urls import path
+
+from core.async_views import select_view
+
 from . import views
 
 app_name = "categories"
 
 urlpatterns = [
-    path("", views.CategoryListCreateView.as_view(), name="category_list_create"),
-    path("<int:pk>/", views.CategoryDetailView.as_view(), name="category_detail"),
-    path("<int:pk>/recipes/", views.CategoryRecipesView.as_view(), name="category_recipes"),
-    path("popular/", views.PopularCategoriesView.as_view(), name="popular_categories"),
+    path(
+        "",
+        select_view(views.CategoryListCreateView, views.AsyncCategoryListCreateView).as_view(),
+        name="category_list_create",
+    ),
+    path(
+        "<int:pk>/",
+        select_view(views.CategoryDetailView, views.AsyncCategoryDetailView).as_view(),
+        name="category_detail",
+    ),
+    path(
+        "<int:pk>/recipes/",
+        select_view(views.CategoryRecipesView, views.AsyncCategoryRecipesView).as_view(),
+        name="category_recipes",
+    ),
+    path(
+        "popular/",
+        select_view(views.PopularCategoriesView, views.AsyncPopularCategoriesView).as_view(),
+        name="popular_categories",
+    ),
 ]
@@ -1,13 +1,22 @@
 import logging
 
 from django.db.models import Count, Q
-from rest_framework import generics, permissions
+from django_filters.rest_framework import DjangoFilterBackend as DjangoFilterFilter
+from rest_framework import filters, generics, permissions
 from rest_framework.response import Response
-from rest_framework.views import APIView
+
+from core.async_views import AsyncAPIViewMixin
+from core.cache import CachedResponseMixin, aget_cached_value, get_cached_value
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
 
 from .models import Category
 from .serializers import CategoryListSerializer, CategorySerializer
+from dishes.filters import RecipeFilter
+from dishes.ingredients import RecipeIngredientFilter
 from dishes.models import Recipe
+from dishes.ratings import with_user_rating
+from dishes.search import RecipeFullTextSearchFilter
 from dishes.serializers import RecipeListSerializer
 
 
@@ -15,7 +24,8 @@ logger = logging.getLogger("categories")
 
 
 
-class CategoryListCreateView(generics.ListCreateAPIView):
+class CategoryListCreateView(CachedResponseMixin, generics.ListCreateAPIView):
+    cache_namespaces = ("categories",)
     queryset = Category.objects.annotate(recipes_count=Count("recipe")).order_by("name")
 
     def get_serializer_class(self):
@@ -29,9 +39,20 @@ class CategoryListCreateView(generics.ListCreateAPIView):
         return [permissions.AllowAny()]
 
 
-class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    # recipes_count retsept saqlanganda/o'chirilganda o'zgaradi
+    conditional_namespaces = ("categories",)
+
+    def get_validator_queryset(self):
+        return Category.objects.filter(pk=self.kwargs["pk"]).values_list("updated_at")
+
+    def get_validator_row(self):
+        return self.get_validator_queryset().first()
+
+    async def aget_validator_row(self):
+        return await self.get_validator_queryset().afirst()
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -39,29 +60,61 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [permissions.IsAdminUser()]
 
 
-class CategoryRecipesView(APIView):
-    """Kategoriya bo'yicha retseptlar"""
+class CategoryRecipesView(CachedResponseMixin, generics.ListAPIView):
+    """Kategoriya bo'yicha retseptlar (cursor paginatsiya, RecipeListCreateView filterlari bilan)"""
 
+    serializer_class = RecipeListSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespaces = ("categories", "recipes")
+    filter_backends = [
+        DjangoFilterFilter,
+        filters.SearchFilter,
+        filters.OrderingFilter,
+        RecipeFullTextSearchFilter,
+        RecipeIngredientFilter,
+    ]
+    filterset_class = RecipeFilter
+    pagination_class = KeysetPagination
+    search_fields = ["title", "description", "ingredients"]
+    ordering_fields = ["created_at", "title", "prep_time", "cook_time", "total_time"]
+    ordering = ["-created_at"]
+
+    def get_queryset(self):
+        queryset = Recipe.objects.filter(
+            category_id=self.kwargs["pk"], is_draft=False
+        ).select_related("author", "category")
+        return with_user_rating(queryset, self.request.user)
+
+    def get_category_queryset(self):
+        return Category.objects.annotate(
+            recipes_count=Count("recipe", filter=Q(recipe__is_draft=False))
+        ).filter(pk=self.kwargs["pk"])
 
-    def get(self, request, pk):
-        try:
-            category = Category.objects.get(pk=pk)
-        except Category.DoesNotExist:
+    def get_category(self):
+        """Kategoriya sarlavhasi - retseptlar sonini hisoblamaslik uchun keshlanadi"""
+
+        def build():
+            category = self.get_category_queryset().first()
+            return CategorySerializer(category).data if category else None
+
+        return get_cached_value(f"category_header:{self.kwargs['pk']}", ("categories",), build)
+
+    def list(self, request, *args, **kwargs):
+        category = self.get_category()
+        if category is None:
             return Response({"error": "Category not found."}, status=404)
 
-        recipes = Recipe.objects.filter(category=category, is_draft=False).order_by("-created_at")
-        serializer = RecipeListSerializer(recipes, many=True)
-        return Response(
-            {"category": CategorySerializer(category).data, "recipes": serializer.data}
-        )
+        response = super().list(request, *args, **kwargs)
+        response.data = {"category": category, **response.data}
+        return response
 
 
-class PopularCategoriesView(generics.ListAPIView):
+class PopularCategoriesView(CachedResponseMixin, generics.ListAPIView):
     """Ommabop kategoriyalar"""
 
     serializer_class = CategoryListSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespaces = ("categories",)
 
     def get_queryset(self):
         return (
@@ -71,3 +124,46 @@ class PopularCategoriesView(generics.ListAPIView):
             .filter(recipes_count__gt=0)
             .order_by("-recipes_count")[:10]
         )
+
+
+# -------------------- ASYNC VIEWS (ASGI) --------------------
+class AsyncCategoryListCreateView(AsyncAPIViewMixin, CategoryListCreateView):
+    async def get(self, request, *args, **kwargs):
+        return await self.aget_cached_response(request, self.alist, *args, **kwargs)
+
+
+class AsyncCategoryDetailView(AsyncAPIViewMixin, CategoryDetailView):
+    def get_queryset(self):
+        # Model metodi (recipe_set.count()) o'rniga annotatsiya - serializer event loop'da ishlaydi
+        return Category.objects.annotate(recipes_count=Count("recipe"))
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aget_conditional_response(request, self.aretrieve, *args, **kwargs)
+
+
+class AsyncCategoryRecipesView(AsyncAPIViewMixin, CategoryRecipesView):
+    async def aget_category(self):
+        async def build():
+            category = await self.get_category_queryset().afirst()
+            return CategorySerializer(category).data if category else None
+
+        return await aget_cached_value(
+            f"category_header:{self.kwargs['pk']}", ("categories",), build
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        category = await self.aget_category()
+        if category is None:
+            return Response({"error": "Category not found."}, status=404)
+
+        response = await super().alist(request, *args, **kwargs)
+        response.data = {"category": category, **response.data}
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aget_cached_response(request, self.alist, *args, **kwargs)
+
+
+class AsyncPopularCategoriesView(AsyncAPIViewMixin, PopularCategoriesView):
+    async def get(self, request, *args, **kwargs):
+        return await self.aget_cached_response(request, self.alist, *args, **kwargs)
@@ -0,0 +1,122 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from rest_framework.response import Response
+
+
+def select_view(sync_view, async_view):
+    """ASGI ostida (``core/asgi.py``) async, WSGI ostida (``core/wsgi.py``) sync view"""
+    return async_view if settings.ASYNC_API_VIEWS else sync_view
+
+
+class AsyncAPIViewMixin:
+    """DRF view'ni ASGI event loop'ida ishlatish.
+
+    ``async def`` handlerlar to'g'ridan-to'g'ri bajariladi, sync handlerlar
+    (POST, PUT, DELETE) esa ``sync_to_async`` orqali thread'ga o'tkaziladi.
+    Autentifikatsiya faqat so'rovda token/sessiya bo'lsa thread'da bajariladi,
+    throttle'lar esa ``aallow_request`` (async Redis) orqali tekshiriladi -
+    anonim o'qishlar butunlay event loop'da qoladi.
+    """
+
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            if self.needs_sync_initial(request):
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+            else:
+                self.initial(request, *args, **kwargs)
+            await self.acheck_throttles(request)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def needs_sync_initial(self, request):
+        """JWT/sessiya foydalanuvchisi bazadan o'qiladi"""
+        return bool(
+            request.META.get("HTTP_AUTHORIZATION")
+            or settings.SESSION_COOKIE_NAME in request.COOKIES
+        )
+
+    def check_throttles(self, request):
+        # initial() ichida chaqiriladi - dispatch() acheck_throttles() bilan tekshiradi
+        pass
+
+    async def acheck_throttles(self, request):
+        """DRF ``check_throttles`` ning async varianti"""
+        durations = []
+        for throttle in self.get_throttles():
+            if hasattr(throttle, "aallow_request"):
+                allowed = await throttle.aallow_request(request, self)
+            else:
+                allowed = await sync_to_async(throttle.allow_request)(request, self)
+            if not allowed:
+                durations.append(throttle.wait())
+        if durations:
+            durations = [duration for duration in durations if duration is not None]
+            self.throttled(request, max(durations, default=None))
+
+    async def afilter_queryset(self, queryset):
+        """Filter backendlari bazaga murojaat qilishi mumkin (``ModelChoiceFilter``,
+        ``?author=``) - query parametrlari bo'lsa ular thread'da bajariladi
+        """
+        if not self.request.query_params:
+            return self.filter_queryset(queryset)
+        return await sync_to_async(self.filter_queryset)(queryset)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        if hasattr(self.paginator, "apaginate_queryset"):
+            return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        return await sync_to_async(self.paginator.paginate_queryset)(
+            queryset, self.request, view=self
+        )
+
+    async def aget_object(self):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404 from None
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+    async def acached_list(self, request, *args, **kwargs):
+        """``CachedResponseMixin`` keshi orqali ``alist``"""
+        return await self.aget_cached_response(request, self.alist, *args, **kwargs)
@@ -0,0 +1,271 @@
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisSerializer
+from django.db import transaction
+from django.utils.translation import get_language
+from rest_framework.response import Response
+
+from .redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger("django")
+
+# Async funksiyalar Django keshi (CACHES["default"] = REDIS_URL) bilan bir xil
+# kalit va formatda o'qiydi/yozadi - sync va async viewlar keshni bo'lishadi
+serializer = RedisSerializer()
+
+NAMESPACE_KEY = "response_cache:ns:{}"
+COUNTER_KEY = "response_cache:{}:{}"
+
+
+# Versiya max(versiya + 1, hozirgi vaqt) - u o'zgarish vaqtini ham bildiradi
+BUMP_SCRIPT = """
+local version = math.max(tonumber(redis.call('GET', KEYS[1]) or '0') + 1, tonumber(ARGV[1]))
+redis.call('SET', KEYS[1], string.format('%d', version))
+return version
+"""
+
+
+def version_clock():
+    """Mikrosekundlardagi joriy vaqt - namespace va ``Recipe.rating_version`` shu soat bilan"""
+    return time.time_ns() // 1000
+
+
+def initial_namespace_version():
+    # Kalit o'chib ketsa ham eski versiya raqamlari qayta ishlatilmasligi uchun
+    return version_clock()
+
+
+def get_namespace_versions(namespaces):
+    """Namespace versiyalarini bitta so'rovda olish"""
+    keys = {namespace: NAMESPACE_KEY.format(namespace) for namespace in namespaces}
+    stored = cache.get_many(keys.values())
+    versions = []
+    for namespace, key in keys.items():
+        version = stored.get(key)
+        if version is None:
+            cache.add(key, initial_namespace_version(), timeout=None)
+            version = cache.get(key)
+        versions.append(f"{namespace}.{version}")
+    return versions
+
+
+async def aget_namespace_versions(namespaces):
+    """``get_namespace_versions`` ning async Redis varianti"""
+    client = get_async_redis(decode_responses=False)
+    keys = [cache.make_and_validate_key(NAMESPACE_KEY.format(namespace)) for namespace in namespaces]
+    stored = await client.mget(keys) if keys else []
+    versions = []
+    for namespace, key, version in zip(namespaces, keys, stored, strict=True):
+        if version is None:
+            await client.set(key, initial_namespace_version(), nx=True)
+            version = await client.get(key)
+        versions.append(f"{namespace}.{int(version)}")
+    return versions
+
+
+def bump_namespaces(*namespaces):
+    """Namespace versiyasini oshirish - eski javoblar endi ishlatilmaydi.
+
+    Yangi versiya kamida joriy vaqt (µs), shuning uchun u ``Last-Modified``
+    sifatida ham o'qiladi (``core.conditional``).
+    """
+    for namespace in namespaces:
+        key = cache.make_and_validate_key(NAMESPACE_KEY.format(namespace))
+        try:
+            get_redis().eval(BUMP_SCRIPT, 1, key, version_clock())
+        except Exception as e:
+            logger.error(f"Cache namespace bump error ({namespace}): {e!s}")
+
+
+def bump_namespaces_on_commit(*namespaces):
+    """Tranzaksiya commit bo'lgandan keyin namespace'larni yangilash"""
+    transaction.on_commit(lambda: bump_namespaces(*namespaces))
+
+
+def get_cached_value(name, namespaces, build, timeout=None):
+    """Namespace versiyalari bilan keshlangan qiymat; topilmasa ``build()`` chaqiriladi.
+
+    ``build()`` None qaytarsa natija keshlanmaydi.
+    """
+    try:
+        versions = ":".join(get_namespace_versions(namespaces))
+        key = f"value:{name}:{versions}:{get_language()}"
+        value = cache.get(key)
+    except Exception as e:
+        logger.error(f"Value cache read error ({name}): {e!s}")
+        return build()
+
+    if value is None:
+        value = build()
+        if value is not None:
+            try:
+                cache.set(key, value, timeout=timeout or settings.RESPONSE_CACHE_TIMEOUT)
+            except Exception as e:
+                logger.error(f"Value cache write error ({name}): {e!s}")
+    return value
+
+
+async def aget_cached_value(name, namespaces, build, timeout=None):
+    """``get_cached_value`` ning async varianti; ``build`` - korutina funksiya"""
+    client = get_async_redis(decode_responses=False)
+    try:
+        versions = ":".join(await aget_namespace_versions(namespaces))
+        key = cache.make_and_validate_key(f"value:{name}:{versions}:{get_language()}")
+        value = await client.get(key)
+    except Exception as e:
+        logger.error(f"Value cache read error ({name}): {e!s}")
+        return await build()
+
+    if value is not None:
+        return serializer.loads(value)
+    value = await build()
+    if value is not None:
+        try:
+            await client.set(
+                key, serializer.dumps(value), ex=timeout or settings.RESPONSE_CACHE_TIMEOUT
+            )
+        except Exception as e:
+            logger.error(f"Value cache write error ({name}): {e!s}")
+    return value
+
+
+def record_cache_event(name, event):
+    key = COUNTER_KEY.format(name, event)
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+    except Exception as e:
+        logger.error(f"Cache counter error ({key}): {e!s}")
+
+
+async def arecord_cache_event(name, event):
+    key = COUNTER_KEY.format(name, event)
+    try:
+        # INCR yo'q kalitni 0 dan boshlaydi (sync variantdagi add + incr bilan bir xil)
+        await get_async_redis().incr(cache.make_and_validate_key(key))
+    except Exception as e:
+        logger.error(f"Cache counter error ({key}): {e!s}")
+
+
+def get_cache_stats(names):
+    """Har bir keshlangan view uchun hit/miss hisoblagichlari"""
+    keys = {
+        (name, event): COUNTER_KEY.format(name, event)
+        for name in names
+        for event in ("hit", "miss")
+    }
+    stored = cache.get_many(keys.values())
+    stats = {name: {"hit": 0, "miss": 0} for name in names}
+    for (name, event), key in keys.items():
+        stats[name][event] = stored.get(key, 0)
+    return stats
+
+
+class CachedResponseMixin:
+    """Anonim GET so'rovlari uchun versiyalangan javob keshi.
+
+    Kalit view nomi, ``cache_namespaces`` versiyalari, til va query string
+    bo'yicha tuziladi. Namespace versiyasi signal yoki admin action orqali
+    oshirilganda barcha eski javoblar avtomatik eskiradi.
+    """
+
+    cache_namespaces = ()
+    cache_timeout = None
+
+    # Keshlangan barcha view'lar ro'yxati (statistika uchun)
+    registry = set()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_namespaces:
+            CachedResponseMixin.registry.add(cls.get_cache_name())
+
+    @classmethod
+    def get_cache_name(cls):
+        # Async variantlar (AsyncFeaturedRecipesView) sync view keshini ishlatadi
+        return f"{cls.__module__.split('.')[0]}.{cls.__name__.removeprefix('Async')}"
+
+    def should_cache_response(self, request):
+        return request.method == "GET" and not request.user.is_authenticated
+
+    def get_response_cache_key(self, request, versions=None):
+        query = "&".join(sorted(request.META.get("QUERY_STRING", "").split("&")))
+        digest = hashlib.md5(
+            f"{request.path}?{query}".encode(), usedforsecurity=False
+        ).hexdigest()
+        if versions is None:
+            versions = get_namespace_versions(self.cache_namespaces)
+        versions = ":".join(versions)
+        return f"response:{self.get_cache_name()}:{versions}:{get_language()}:{digest}"
+
+    def get(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().get, *args, **kwargs)
+
+    def get_cached_response(self, request, handler, *args, **kwargs):
+        """``handler`` javobini keshdan qaytarish yoki hisoblab keshlash"""
+        if not self.should_cache_response(request):
+            return handler(request, *args, **kwargs)
+
+        name = self.get_cache_name()
+        try:
+            key = self.get_response_cache_key(request)
+            data = cache.get(key)
+        except Exception as e:
+            logger.error(f"Response cache read error ({name}): {e!s}")
+            return handler(request, *args, **kwargs)
+
+        if data is not None:
+            record_cache_event(name, "hit")
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            try:
+                timeout = self.cache_timeout or settings.RESPONSE_CACHE_TIMEOUT
+                cache.set(key, response.data, timeout=timeout)
+            except Exception as e:
+                logger.error(f"Response cache write error ({name}): {e!s}")
+        record_cache_event(name, "miss")
+        response["X-Cache"] = "MISS"
+        return response
+
+    async def aget_cached_response(self, request, handler, *args, **kwargs):
+        """``get_cached_response`` ning async varianti (``handler`` - korutina funksiya)"""
+        if not self.should_cache_response(request):
+            return await handler(request, *args, **kwargs)
+
+        name = self.get_cache_name()
+        client = get_async_redis(decode_responses=False)
+        try:
+            versions = await aget_namespace_versions(self.cache_namespaces)
+            key = cache.make_and_validate_key(self.get_response_cache_key(request, versions))
+            data = await client.get(key)
+        except Exception as e:
+            logger.error(f"Response cache read error ({name}): {e!s}")
+            return await handler(request, *args, **kwargs)
+
+        if data is not None:
+            await arecord_cache_event(name, "hit")
+            response = Response(serializer.loads(data))
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            try:
+                timeout = self.cache_timeout or settings.RESPONSE_CACHE_TIMEOUT
+                await client.set(key, serializer.dumps(response.data), ex=timeout)
+            except Exception as e:
+                logger.error(f"Response cache write error ({name}): {e!s}")
+        await arecord_cache_event(name, "miss")
+        response["X-Cache"] = "MISS"
+        return response
@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from celery.schedules import crontab
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
@@ -26,5 +27,13 @@ app.conf.beat_schedule = {
         "task": "dishes.tasks.publish_old_drafts_task",
         "schedule": 86400.0,  # Har 24 soatda
     },
+    "take-stats-snapshot": {
+        "task": "dishes.tasks.take_stats_snapshot",
+        "schedule": crontab(hour=23, minute=55),  # Har kuni kun oxirida
+    },
+    "dispatch-email-outbox": {
+        "task": "users.tasks.dispatch_email_outbox",
+        "schedule": 60.0,  # Qayta urinishlar va o'tkazib yuborilgan partiyalar uchun
+    },
 }
 app.conf.timezone = "Asia/Tashkent"
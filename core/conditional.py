@@ -0,0 +1,93 @@
+import hashlib
+from datetime import UTC, datetime
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+
+from .cache import aget_namespace_versions, get_namespace_versions
+
+
+def version_datetime(version):
+    """``version_clock()`` qiymatini (µs) vaqtga aylantirish"""
+    return datetime.fromtimestamp(int(version) / 1_000_000, tz=UTC)
+
+
+class ConditionalGetMixin:
+    """GET javoblariga kuchli ``ETag`` va ``Last-Modified``.
+
+    Validatorlar ``get_validator_row()`` (bitta yengil ``values_list`` so'rovi)
+    va ``conditional_namespaces`` kesh versiyalaridan tuziladi.
+    ``If-None-Match``/``If-Modified-Since`` mos kelsa 304 serializer
+    ishlamasdan qaytariladi. Qator ichidagi sonlar ``version_clock()``
+    versiyalari, sanalar esa ``updated_at`` ustunlari deb hisoblanadi.
+    """
+
+    conditional_namespaces = ()
+
+    def get_validator_row(self):
+        """Javob versiyasini belgilaydigan ustunlar; None - obyekt yo'q (oddiy yo'l)"""
+        return ()
+
+    async def aget_validator_row(self):
+        return await sync_to_async(self.get_validator_row)()
+
+    def get_validators(self, request, row, versions):
+        user = request.user.pk if request.user.is_authenticated else "anon"
+        query = "&".join(sorted(request.META.get("QUERY_STRING", "").split("&")))
+        renderer = getattr(request, "accepted_renderer", None)
+        parts = [
+            request.path,
+            query,
+            get_language(),
+            renderer.format if renderer else "",
+            str(user),
+            *(value.isoformat() if isinstance(value, datetime) else str(value) for value in row),
+            *versions,
+        ]
+        etag = hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+
+        times = [value if isinstance(value, datetime) else version_datetime(value) for value in row]
+        times += [version_datetime(version.rpartition(".")[2]) for version in versions]
+        last_modified = int(max(times).timestamp()) if times else None
+        return quote_etag(etag), last_modified
+
+    def get(self, request, *args, **kwargs):
+        return self.get_conditional_response(request, super().get, *args, **kwargs)
+
+    def get_conditional_response(self, request, handler, *args, **kwargs):
+        """``handler``ni faqat mijozdagi nusxa eskirgan bo'lsa chaqirish"""
+        row = self.get_validator_row()
+        if row is None:
+            return handler(request, *args, **kwargs)
+        versions = get_namespace_versions(self.conditional_namespaces)
+        etag, last_modified = self.get_validators(request, row, versions)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.set_validator_headers(response, etag, last_modified)
+
+    async def aget_conditional_response(self, request, handler, *args, **kwargs):
+        """``get_conditional_response`` ning async varianti (``handler`` - korutina funksiya)"""
+        row = await self.aget_validator_row()
+        if row is None:
+            return await handler(request, *args, **kwargs)
+        versions = await aget_namespace_versions(self.conditional_namespaces)
+        etag, last_modified = self.get_validators(request, row, versions)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return self.set_validator_headers(response, etag, last_modified)
+
+    def set_validator_headers(self, response, etag, last_modified):
+        if response.status_code not in (200, 304):
+            return response
+        response.headers.setdefault("ETag", etag)
+        if last_modified is not None:
+            response.headers.setdefault("Last-Modified", http_date(last_modified))
+        # ETag foydalanuvchiga bog'liq (user_rating) - proksilar token bo'yicha ajratsin
+        patch_vary_headers(response, ("Authorization",))
+        return response
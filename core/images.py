@@ -0,0 +1,191 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework import serializers
+
+logger = logging.getLogger("django")
+
+PIL_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+ORIENTATION_TAG = 0x0112
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}  # 90/270 gradusga burilgan rasmlar
+
+
+def rendition_prefix(instance):
+    """Obyektga tegishli variantlar papkasi: ``renditions/dishes.recipe/<pk>``.
+
+    Bir nechta obyekt bitta manbani ishlatishi mumkin (masalan, standart
+    ``static/image.png`` profil rasmi) - har biri o'z nusxasiga ega bo'ladi va
+    biri almashtirilsa yoki o'chirilsa, boshqalarining fayllari qoladi.
+    """
+    return posixpath.join(settings.IMAGE_RENDITION_DIR, instance._meta.label_lower, str(instance.pk))
+
+
+def rendition_name(prefix, source, width, fmt):
+    """``recipes/2025/01/02/a.jpg`` -> ``<prefix>/recipes/2025/01/02/a_320.webp``"""
+    stem = posixpath.splitext(source)[0]
+    return posixpath.join(prefix, f"{stem}_{width}.{fmt}")
+
+
+def open_source_image(field_file):
+    """Rasmni ochish, EXIF orientatsiyasini qo'llash va asl o'lchamlarni qaytarish"""
+    with field_file.open("rb") as f:
+        image = Image.open(f)
+        width, height = image.size
+        if image.getexif().get(ORIENTATION_TAG) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        # Katta JPEG'lar kerakli o'lchamga yaqin masshtabda dekodlanadi (tezroq)
+        target = max(settings.IMAGE_RENDITION_WIDTHS)
+        if image.format == "JPEG" and width > target:
+            image.draft("RGB", (target, target))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    return image, width, height
+
+
+def encode_rendition(image, prefix, source, width, fmt, quality):
+    """Bitta variantni kichraytirish, EXIF'siz kodlash va saqlash"""
+    height = max(1, round(image.height * width / image.width))
+    resized = image.resize((width, height), Image.Resampling.LANCZOS)
+    if fmt == "jpeg" and resized.mode == "RGBA":
+        background = Image.new("RGB", resized.size, "white")
+        background.paste(resized, mask=resized.getchannel("A"))
+        resized = background
+
+    buffer = BytesIO()
+    # exif berilmagani uchun metadata (GPS, kamera) variantlarga o'tmaydi
+    resized.save(buffer, PIL_FORMATS[fmt], quality=quality, optimize=True)
+    name = rendition_name(prefix, source, width, fmt)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    name = default_storage.save(name, ContentFile(buffer.getvalue()))
+    return {"format": fmt, "width": width, "height": height, "name": name}
+
+
+def build_renditions(field_file, prefix):
+    """Rasmning WebP/JPEG variantlarini yaratish.
+
+    Variantlar ``IMAGE_RENDITION_WIDTHS`` kengliklarida (asl rasmdan katta
+    bo'lmagan) thread pool'da parallel kodlanadi - Pillow resize va encode
+    paytida GIL'ni bo'shatadi. Natija modelning JSON maydonida saqlanadi.
+    """
+    image, width, height = open_source_image(field_file)
+    widths = [w for w in settings.IMAGE_RENDITION_WIDTHS if w < image.width]
+    if len(widths) < len(settings.IMAGE_RENDITION_WIDTHS):
+        widths.append(image.width)
+
+    jobs = [
+        (w, fmt, quality)
+        for w in widths
+        for fmt, quality in settings.IMAGE_RENDITION_FORMATS.items()
+    ]
+    with ThreadPoolExecutor(max_workers=settings.IMAGE_RENDITION_WORKERS) as pool:
+        renditions = list(
+            pool.map(
+                lambda job: encode_rendition(image, prefix, field_file.name, *job), jobs
+            )
+        )
+    return {
+        "source": field_file.name,
+        "width": width,
+        "height": height,
+        "renditions": renditions,
+    }
+
+
+def delete_renditions(instance, data, keep=()):
+    """Obyektning o'z variant fayllarini o'chirish.
+
+    ``rendition_prefix()`` dan tashqaridagi nomlar (eski, umumiy papkadagi
+    variantlar) boshqa obyektlarga ham tegishli bo'lishi mumkin - ular qoladi.
+    """
+    prefix = rendition_prefix(instance) + "/"
+    for rendition in (data or {}).get("renditions", []):
+        if rendition["name"] in keep or not rendition["name"].startswith(prefix):
+            continue
+        try:
+            default_storage.delete(rendition["name"])
+        except OSError as e:
+            logger.error(f"Rendition delete error ({rendition['name']}): {e!s}")
+
+
+def renditions_outdated(field_file, data):
+    """Variantlar joriy rasmga mos emasmi (rasm yuklangan yoki o'zgartirilgan)"""
+    return (field_file.name or "") != (data or {}).get("source", "")
+
+
+def refresh_renditions(instance, field_name, renditions_field):
+    """Model rasmi uchun variantlarni qayta yaratib, JSON maydonga yozish.
+
+    Yozish ``UPDATE ... WHERE <rasm> = <joriy rasm>`` ko'rinishida bo'ladi: shu
+    orada rasm almashtirilgan bo'lsa, eskirgan variantlar o'chiriladi va
+    ``None`` qaytadi (yangi rasm uchun alohida task ishlaydi). Modelda
+    ``updated_at`` bo'lsa u ham yangilanadi - ``.update()`` ``auto_now``ni
+    chetlab o'tadi, ETag/Last-Modified esa shu ustunga tayanadi.
+    """
+    field_file = getattr(instance, field_name)
+    previous = getattr(instance, renditions_field) or {}
+    data = {}
+    if field_file:
+        try:
+            data = build_renditions(field_file, rendition_prefix(instance))
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+            logger.warning(f"Cannot build renditions for {field_file.name}: {e!s}")
+            # Qayta-qayta urinmaslik uchun manba belgilab qo'yiladi
+            data = {"source": field_file.name, "renditions": []}
+
+    if field_file:
+        current = Q(**{field_name: field_file.name})
+    else:
+        current = Q(**{field_name: ""}) | Q(**{f"{field_name}__isnull": True})
+    values = {renditions_field: data}
+    if any(field.name == "updated_at" for field in instance._meta.concrete_fields):
+        values["updated_at"] = timezone.now()
+    updated = (
+        type(instance)._default_manager.filter(current, pk=instance.pk).update(**values)
+    )
+    if not updated:
+        delete_renditions(instance, data)
+        return None
+
+    delete_renditions(
+        instance, previous, keep={rendition["name"] for rendition in data.get("renditions", [])}
+    )
+    return data
+
+
+class ImageRenditionsField(serializers.ReadOnlyField):
+    """Variantlarni srcset ko'rinishida qaytaradi.
+
+    ``{"width", "height", "thumbnail", "srcset": {"webp": "url 320w, ..."}}``;
+    variantlar hali tayyor bo'lmasa ``None``.
+    """
+
+    def to_representation(self, value):
+        if not value or not value.get("renditions"):
+            return None
+        request = self.context.get("request")
+        srcset = {}
+        for rendition in sorted(value["renditions"], key=lambda r: r["width"]):
+            url = default_storage.url(rendition["name"])
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            srcset.setdefault(rendition["format"], []).append(
+                f"{url} {rendition['width']}w"
+            )
+        thumbnail = next(iter(srcset.values()))[0].rsplit(" ", 1)[0]
+        return {
+            "width": value.get("width"),
+            "height": value.get("height"),
+            "thumbnail": thumbnail,
+            "srcset": {fmt: ", ".join(items) for fmt, items in srcset.items()},
+        }
@@ -0,0 +1,258 @@
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from rest_framework import serializers
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+REDIS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+# Joriy so'rov metrikalari (RequestMetricsMiddleware tomonidan o'rnatiladi)
+current_request_metrics = ContextVar("current_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Bitta so'rov davomida yig'iladigan o'lchovlar"""
+
+    __slots__ = ("db_time", "queries", "serializer_depth", "serializer_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` uchun: so'rovlar soni va SQL vaqti"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+def record_current_query(execute, sql, params, many, context):
+    """Barcha ulanishlarga o'rnatiladigan wrapper: so'rovni joriy so'rov metrikalariga yozadi.
+
+    ``current_request_metrics`` ContextVar bo'lgani uchun async viewlar
+    ``sync_to_async`` thread'larida bajargan SQL ham hisobga olinadi.
+    """
+    metrics = current_request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.record_query(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    """``connection_created`` signali uchun"""
+    if record_current_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_current_query)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+
+class PrometheusText:
+    """Prometheus text formatidagi qatorlar (har bir nom ``prefix_`` bilan)"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.lines = []
+
+    def header(self, name, kind, help_text):
+        self.lines.append(f"# HELP {self.prefix}_{name} {help_text}")
+        self.lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+
+    def sample(self, name, labels, value):
+        self.lines.append(f"{self.prefix}_{name}{{{labels}}} {value}")
+
+    def histogram(self, name, labels, data):
+        # observe() har bir mos bucketni oshiradi - qiymatlar kumulyativ
+        for bound, count in zip(data.buckets, data.counts, strict=True):
+            self.lines.append(f'{self.prefix}_{name}_bucket{{{labels},le="{bound}"}} {count}')
+        self.lines.append(f'{self.prefix}_{name}_bucket{{{labels},le="+Inf"}} {data.total}')
+        self.sample(f"{name}_sum", labels, data.sum)
+        self.sample(f"{name}_count", labels, data.total)
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+class MetricsRegistry:
+    """Jarayon ichidagi endpoint metrikalari (Prometheus text formatida chiqariladi).
+
+    Qiymatlar faqat shu jarayonga tegishli: bir nechta worker bitta portda
+    ishlasa, har bir scrape boshqa worker'ga tushadi. Har bir worker alohida
+    scrape target bo'lishi kerak (README, "Metrikalar").
+
+    Label sifatida faqat URL nomi (``dishes:recipe_detail``), metod va status
+    ishlatiladi - kardinallik URL'lar soni bilan cheklanadi.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Scrape paytida hisoblanadigan gauge'lar: nom -> (tavsif, callback)
+        self.gauges = {}
+        self.reset()
+
+    def reset(self):
+        self.requests = defaultdict(int)
+        self.durations = {}
+        self.query_counts = {}
+        self.totals = defaultdict(float)
+        self.budget_exceeded = defaultdict(int)
+        self.redis_commands = {}
+        self.redis_errors = defaultdict(int)
+        self.throttled = defaultdict(int)
+
+    def observe(self, view, method, status, duration, metrics, response_size):
+        with self.lock:
+            self.requests[(view, method, str(status))] += 1
+            self.durations.setdefault(
+                (view, method), Histogram(DURATION_BUCKETS)
+            ).observe(duration)
+            self.query_counts.setdefault(view, Histogram(QUERY_BUCKETS)).observe(
+                metrics.queries
+            )
+            self.totals[("db_queries_total", view)] += metrics.queries
+            self.totals[("db_query_seconds_total", view)] += metrics.db_time
+            self.totals[("serializer_seconds_total", view)] += metrics.serializer_time
+            self.totals[("response_bytes_total", view)] += response_size
+
+    def record_budget_exceeded(self, view):
+        with self.lock:
+            self.budget_exceeded[view] += 1
+
+    def observe_redis_command(self, command, duration, failed=False):
+        with self.lock:
+            self.redis_commands.setdefault(command, Histogram(REDIS_BUCKETS)).observe(duration)
+            if failed:
+                self.redis_errors[command] += 1
+
+    def record_throttled(self, scope, view):
+        with self.lock:
+            self.throttled[(scope, view)] += 1
+
+    def register_gauge(self, name, help_text, collect):
+        """``collect()`` ``{labels: qiymat}`` lug'atini qaytaradi"""
+        self.gauges[name] = (help_text, collect)
+
+    def render(self):
+        text = PrometheusText(settings.METRICS_PREFIX)
+        with self.lock:
+            self._render_requests(text)
+            self._render_queries(text)
+            self._render_redis(text)
+            self._render_throttles(text)
+        # Gauge callback'lari lock'dan tashqarida (ular o'zi metrika yozishi mumkin)
+        self._render_gauges(text)
+        return text.render()
+
+    def _render_requests(self, text):
+        text.header("http_requests_total", "counter", "Requests by URL name, method and status")
+        for (view, method, status), count in sorted(self.requests.items()):
+            text.sample(
+                "http_requests_total", f'view="{view}",method="{method}",status="{status}"', count
+            )
+
+        text.header("http_request_duration_seconds", "histogram", "Request latency")
+        for (view, method), data in sorted(self.durations.items()):
+            text.histogram("http_request_duration_seconds", f'view="{view}",method="{method}"', data)
+
+    def _render_queries(self, text):
+        text.header("db_queries_per_request", "histogram", "SQL queries per request")
+        for view, data in sorted(self.query_counts.items()):
+            text.histogram("db_queries_per_request", f'view="{view}"', data)
+
+        for name, help_text in (
+            ("db_queries_total", "SQL queries executed"),
+            ("db_query_seconds_total", "Time spent in SQL queries"),
+            ("serializer_seconds_total", "Time spent serializing responses"),
+            ("response_bytes_total", "Response body bytes"),
+        ):
+            text.header(name, "counter", help_text)
+            for (metric, view), value in sorted(self.totals.items()):
+                if metric == name:
+                    text.sample(name, f'view="{view}"', value)
+
+        text.header("query_budget_exceeded_total", "counter", "Requests over their query budget")
+        for view, count in sorted(self.budget_exceeded.items()):
+            text.sample("query_budget_exceeded_total", f'view="{view}"', count)
+
+    def _render_redis(self, text):
+        text.header("redis_command_duration_seconds", "histogram", "Redis command latency")
+        for command, data in sorted(self.redis_commands.items()):
+            text.histogram("redis_command_duration_seconds", f'command="{command}"', data)
+
+        text.header("redis_command_errors_total", "counter", "Failed Redis commands")
+        for command, count in sorted(self.redis_errors.items()):
+            text.sample("redis_command_errors_total", f'command="{command}"', count)
+
+    def _render_throttles(self, text):
+        text.header("throttled_requests_total", "counter", "Requests rejected by rate limits")
+        for (scope, view), count in sorted(self.throttled.items()):
+            text.sample("throttled_requests_total", f'scope="{scope}",view="{view}"', count)
+
+    def _render_gauges(self, text):
+        for name, (help_text, collect) in sorted(self.gauges.items()):
+            text.header(name, "gauge", help_text)
+            for labels, value in sorted(collect().items()):
+                text.sample(name, labels, value)
+
+
+registry = MetricsRegistry()
+
+
+def timed_serializer_data(prop):
+    """Serializer ``.data`` vaqtini joriy so'rov metrikalariga qo'shish"""
+
+    def data(self):
+        metrics = current_request_metrics.get()
+        if metrics is None:
+            return prop.fget(self)
+        # Ichma-ich serializerlar vaqti ikki marta hisoblanmasligi uchun
+        metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            metrics.serializer_depth -= 1
+            if not metrics.serializer_depth:
+                metrics.serializer_time += time.perf_counter() - started
+
+    data.instrumented = True
+    return property(data)
+
+
+def instrument_serializers():
+    """DRF serializerlarining ``.data`` xususiyatini vaqt o'lchovi bilan o'rash"""
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data.fget, "instrumented", False):
+            cls.data = timed_serializer_data(cls.data)
+
+
+def metrics_view(request):
+    """Prometheus scrape endpointi"""
+    allowed = settings.METRICS_ALLOWED_IPS
+    if allowed and request.META.get("REMOTE_ADDR") not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,99 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .metrics import (
+    RequestMetrics,
+    current_request_metrics,
+    install_query_recorder,
+    instrument_serializers,
+    registry,
+)
+
+logger = logging.getLogger("django")
+
+
+class RequestMetricsMiddleware:
+    """Har bir so'rov uchun SQL soni/vaqti, serializer vaqti va javob hajmini o'lchash.
+
+    Natijalar URL nomi bo'yicha ``core.metrics.registry``ga yoziladi
+    (``/metrics``), javobga ``Server-Timing`` sarlavhasi qo'shiladi va
+    ``QUERY_BUDGETS``dan oshgan so'rovlar uchun ogohlantirish yoziladi.
+
+    ASGI ostida async rejimda ishlaydi - aks holda Django butun zanjirni
+    sync'ga o'tkazib, async viewlarni thread'da bajargan bo'lardi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        instrument_serializers()
+        # SQL har bir ulanishda (shu jumladan sync_to_async thread'larida) o'lchanadi
+        connection_created.connect(install_query_recorder, dispatch_uid="request_metrics")
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        return self.process(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        return self.process(request, response, metrics, started)
+
+    def process(self, request, response, metrics, started):
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        if view in settings.METRICS_EXCLUDED_VIEWS:
+            return response
+
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(
+            view, request.method, response.status_code, duration, metrics, size
+        )
+        self.check_query_budget(request, view, metrics)
+
+        if settings.SERVER_TIMING_ENABLED:
+            response["Server-Timing"] = (
+                f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries", '
+                f"serializer;dur={metrics.serializer_time * 1000:.1f}, "
+                f"total;dur={duration * 1000:.1f}"
+            )
+        return response
+
+    def check_query_budget(self, request, view, metrics):
+        budgets = settings.QUERY_BUDGETS
+        budget = budgets.get(view, budgets.get("default"))
+        if budget is None or metrics.queries <= budget:
+            return
+        registry.record_budget_exceeded(view)
+        logger.warning(
+            f"Query budget exceeded for {view}: {metrics.queries} queries "
+            f"(budget {budget}, {metrics.db_time * 1000:.1f}ms) "
+            f"{request.method} {request.get_full_path()}"
+        )
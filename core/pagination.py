@@ -0,0 +1,246 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import CharField, F, Q, TextField, Value
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """(saralash maydoni, id) juftligi bo'yicha keyset (cursor) paginatsiya.
+
+    Saralash maydoni querysetning birinchi ``order_by`` elementidan olinadi, shuning
+    uchun ``OrderingFilter`` bilan tanlangan tartib saqlanadi. Har bir sahifa
+    ``WHERE (field, id) < (cursor)`` ko'rinishidagi indeksli so'rov bo'lib,
+    ``COUNT(*)`` va ``OFFSET`` ishlatilmaydi.
+
+    ``?page=`` berilsa yoki tartib annotatsiya bo'yicha bo'lsa (masalan qidiruv
+    relevantligi), oddiy ``PageNumberPagination`` rejimiga o'tiladi.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_query_param = "page"
+    page_number_class = PageNumberPagination
+    invalid_cursor_message = "Invalid cursor"
+    keyset_annotation = "keyset_value"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return self.page_number_paginator.paginate_queryset(queryset, request, view)
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async viewlar uchun: sahifa async ORM bilan o'qiladi"""
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            # PageNumberPagination COUNT(*) bilan Paginator ishlatadi - sync
+            return await sync_to_async(self.page_number_paginator.paginate_queryset)(
+                queryset, request, view
+            )
+        return self.set_page([obj async for obj in page_queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """Sahifa uchun ``page_size + 1`` qatorli queryset; page-number rejimida None"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.page_number_paginator = None
+
+        keyset = self.get_keyset(queryset)
+        if keyset is None or self.page_query_param in request.query_params:
+            self.page_number_paginator = self.page_number_class()
+            return None
+
+        queryset, self.field, descending = keyset
+        self.cursor = cursor = self.decode_cursor(request, queryset.model)
+        self.reverse = reverse = bool(cursor and cursor["r"])
+        order_desc = descending != reverse
+
+        if order_desc:
+            queryset = queryset.order_by(f"-{self.field}", "-pk")
+        else:
+            queryset = queryset.order_by(self.field, "pk")
+
+        if cursor is not None:
+            lookup = "lt" if order_desc else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{lookup}": cursor["v"]})
+                | Q(**{self.field: cursor["v"], f"pk__{lookup}": cursor["pk"]})
+            )
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_keyset(self, queryset):
+        """Keyset uchun (queryset, maydon, kamayish tartibi) yoki None"""
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if not ordering or not isinstance(ordering[0], str):
+            return None
+
+        name = ordering[0]
+        descending = name.startswith("-")
+        name = name.lstrip("-")
+        if name == "?" or name in queryset.query.annotations:
+            return None
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.is_relation:
+            return None
+
+        if field.null:
+            # NULL qiymatlar bilan taqqoslash ishlamaydi (masalan tarjima ustunlari)
+            if not isinstance(field, (CharField, TextField)):
+                return None
+            queryset = queryset.annotate(
+                **{
+                    self.keyset_annotation: Coalesce(
+                        F(name), Value(""), output_field=TextField()
+                    )
+                }
+            )
+            name = self.keyset_annotation
+        return queryset, name, descending
+
+    def get_paginated_response(self, data):
+        if self.page_number_paginator is not None:
+            return self.page_number_paginator.get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.build_link(self.page[0], reverse=True)
+
+    def build_link(self, obj, reverse):
+        token = self.encode_cursor(getattr(obj, self.field), obj.pk, reverse=reverse)
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    @classmethod
+    def encode_cursor(cls, value, pk, reverse=False):
+        """Berilgan pozitsiyadan keyingi (yoki oldingi) sahifa uchun cursor"""
+        position = {
+            "v": cls.encode_value(value),
+            "pk": cls.encode_value(pk),
+            "r": reverse,
+        }
+        return base64.urlsafe_b64encode(
+            json.dumps(position, separators=(",", ":")).encode()
+        ).decode()
+
+    def decode_cursor(self, request, model):
+        """Cursor'ni o'qish; qiymatlar model maydonlari turiga o'tkaziladi.
+
+        Qo'lda o'zgartirilgan cursor (noto'g'ri sana, uuid va h.k.) 500 emas,
+        404 qaytaradi.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(token.encode()))
+            if not {"v", "pk", "r"} <= position.keys() or not isinstance(position["r"], bool):
+                raise ValueError(token)
+            if position["v"] is None or position["pk"] is None:
+                raise ValueError(token)
+            position["v"] = self.get_cursor_field(model).to_python(position["v"])
+            position["pk"] = model._meta.pk.to_python(position["pk"])
+        except (TypeError, ValueError, AttributeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+        return position
+
+    def get_cursor_field(self, model):
+        if self.field == self.keyset_annotation:
+            return TextField()
+        return model._meta.get_field(self.field)
+
+    @staticmethod
+    def encode_value(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return value
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor returned in next/previous links",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.page_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Switch to page-number pagination",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+import weakref
+
+import redis
+import redis.asyncio
+from django.conf import settings
+
+from .metrics import registry
+
+_client = None
+_client_lock = threading.Lock()
+# Har bir event loop uchun alohida async klient va pool (ulanishlar loop'ga bog'langan)
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def pool_options(decode_responses=True):
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "health_check_interval": 30,
+        "decode_responses": decode_responses,
+    }
+
+
+def command_name(args):
+    return str(args[0]).upper() if args else "UNKNOWN"
+
+
+class InstrumentedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error=True):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = super().execute(raise_on_error)
+            failed = False
+            return result
+        finally:
+            registry.observe_redis_command("PIPELINE", time.perf_counter() - started, failed)
+
+
+class InstrumentedRedis(redis.Redis):
+    """Har bir buyruq vaqtini ``core.metrics.registry``ga yozadigan klient"""
+
+    def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = super().execute_command(*args, **options)
+            failed = False
+            return result
+        finally:
+            registry.observe_redis_command(
+                command_name(args), time.perf_counter() - started, failed
+            )
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class InstrumentedAsyncPipeline(redis.asyncio.client.Pipeline):
+    async def execute(self, raise_on_error=True):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await super().execute(raise_on_error)
+            failed = False
+            return result
+        finally:
+            registry.observe_redis_command("PIPELINE", time.perf_counter() - started, failed)
+
+
+class InstrumentedAsyncRedis(redis.asyncio.Redis):
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await super().execute_command(*args, **options)
+            failed = False
+            return result
+        finally:
+            registry.observe_redis_command(
+                command_name(args), time.perf_counter() - started, failed
+            )
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedAsyncPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def get_redis():
+    """Jarayon uchun yagona ``REDIS_URL`` pool'i ustidagi klient.
+
+    Klient thread-safe - ulanishlar har bir buyruq uchun pool'dan olinadi.
+    Celery prefork ishchilari fork'dan keyin pool'ni redis-py o'zi (pid
+    tekshiruvi orqali) qayta ochadi - ulanishlar jarayonlar orasida bo'linmaydi.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                pool = redis.ConnectionPool.from_url(settings.REDIS_URL, **pool_options())
+                _client = InstrumentedRedis(connection_pool=pool)
+    return _client
+
+
+def get_async_redis(decode_responses=True):
+    """Joriy event loop pool'i ustidagi asyncio klient (ASGI viewlar uchun).
+
+    ``decode_responses=False`` Django kesh qiymatlari (pickle baytlari) uchun.
+    """
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(decode_responses)
+    if client is None:
+        # Bitta loop'da yuzlab so'rov bo'lishi mumkin - ulanish bo'shashini kutadi
+        # ("Too many connections" xatosi o'rniga)
+        pool = redis.asyncio.BlockingConnectionPool.from_url(
+            settings.REDIS_URL, timeout=settings.REDIS_SOCKET_TIMEOUT, **pool_options(decode_responses)
+        )
+        client = clients[decode_responses] = InstrumentedAsyncRedis(connection_pool=pool)
+    return client
+
+
+def get_many(keys, client=None):
+    """Bir nechta kalitni bitta ``MGET`` bilan o'qish; topilmaganlar qaytarilmaydi"""
+    keys = list(keys)
+    if not keys:
+        return {}
+    values = (client or get_redis()).mget(keys)
+    return {key: value for key, value in zip(keys, values, strict=True) if value is not None}
+
+
+def set_many(mapping, timeout=None, client=None):
+    """Bir nechta kalitni bitta pipeline (bitta round trip) bilan yozish"""
+    if not mapping:
+        return
+    with (client or get_redis()).pipeline(transaction=False) as pipe:
+        for key, value in mapping.items():
+            pipe.set(key, value, ex=timeout)
+        pipe.execute()
+
+
+def delete_many(keys, client=None):
+    keys = list(keys)
+    if not keys:
+        return 0
+    return (client or get_redis()).delete(*keys)
+
+
+def pool_stats(pool):
+    return (
+        len(pool._in_use_connections),
+        len(pool._available_connections),
+        pool.max_connections,
+    )
+
+
+def collect_pool_connections():
+    """``/metrics`` uchun pool holati: band, bo'sh va maksimal ulanishlar"""
+    clients = {"sync": _client} if _client is not None else {}
+    for index, loop_clients in enumerate(list(_async_clients.values())):
+        for decode_responses, client in loop_clients.items():
+            clients[f"async-{index}{'' if decode_responses else '-raw'}"] = client
+    values = {}
+    for name, client in clients.items():
+        in_use, idle, maximum = pool_stats(client.connection_pool)
+        values[f'pool="{name}",state="in_use"'] = in_use
+        values[f'pool="{name}",state="idle"'] = idle
+        values[f'pool="{name}",state="max"'] = maximum
+    return values
+
+
+registry.register_gauge(
+    "redis_pool_connections", "Redis connection pool usage", collect_pool_connections
+)
@@ -1,7 +1,7 @@
 from datetime import timedelta
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third party apps
 
     "rest_framework",
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -75,6 +77,8 @@ TEMPLATES = [
 
 # WSGI_APPLICATION = "core.wsgi.application"
 ASGI_APPLICATION = "core.asgi.application"
+# Recipe/kategoriya o'qish endpointlari uchun async viewlar (core/wsgi.py o'chiradi)
+ASYNC_API_VIEWS = config("ASYNC_API_VIEWS", default=True, cast=bool)
 
 # Database
 DATABASES = {
@@ -158,6 +162,52 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Redis token bucket'lari (core.throttling) - limitlar barcha web node'lar uchun umumiy
+    "DEFAULT_THROTTLE_CLASSES": ["core.throttling.RedisRateThrottle"],
+    "DEFAULT_THROTTLE_RATES": {
+        "anon_read": config("THROTTLE_ANON_READ", default="300/min"),
+        "search": config("THROTTLE_SEARCH", default="30/min"),
+        "writes": config("THROTTLE_WRITES", default="60/min"),
+        "auth": config("THROTTLE_AUTH", default="10/min"),
+        "verify": config("THROTTLE_VERIFY", default="10/h"),  # bitta akkaunt uchun (IP'dan qat'i nazar)
+    },
+    # Ishonchli reverse proxy'lar soni; 0 - X-Forwarded-For e'tiborsiz, REMOTE_ADDR olinadi
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
+}
+# Shu parametrlardan biri bo'lgan GET so'rovlar "search" limitiga ham tushadi
+THROTTLE_SEARCH_PARAMS = ("search", "q", "author", "have")
+
+# Comment threads
+COMMENT_MAX_DEPTH = 5  # javoblar ichma-ich joylashuvining maksimal chuqurligi
+COMMENT_REPLIES_PER_THREAD = 10  # har bir thread uchun birinchi sahifadagi javoblar
+
+# Popularity leaderboard (Bayes o'rtacha)
+POPULARITY_PRIOR_MEAN = 3.0  # baholar kam bo'lganda tortiladigan o'rtacha
+POPULARITY_PRIOR_WEIGHT = 5  # prior necha "virtual" bahoga teng
+RATING_BULK_MAX_SIZE = 500  # bulk reyting so'rovidagi maksimal elementlar
+MY_RATINGS_MAX_IDS = 500  # /recipes/my-ratings/?ids= dagi maksimal retseptlar soni
+INGREDIENT_FILTER_MAX_ITEMS = 20  # ?have= dagi maksimal ingredientlar soni
+
+# Responsive image renditions (core.images)
+IMAGE_RENDITION_WIDTHS = (320, 640, 1280)  # srcset kengliklari (px)
+IMAGE_RENDITION_FORMATS = {"webp": 80, "jpeg": 82}  # format: sifat
+IMAGE_RENDITION_WORKERS = 4  # bitta rasm variantlarini parallel kodlash
+IMAGE_RENDITION_DIR = "renditions"
+
+# Request metrics (core.middleware, /metrics)
+# Hisoblagichlar jarayon xotirasida - jarayonlar o'rtasida yig'ilmaydi. /metrics
+# har bir worker jarayoni uchun alohida scrape target bo'lishi kerak (README).
+METRICS_PREFIX = "culinary_canvas"
+METRICS_ALLOWED_IPS = config("METRICS_ALLOWED_IPS", default="127.0.0.1,::1", cast=Csv())
+METRICS_EXCLUDED_VIEWS = ("metrics",)
+SERVER_TIMING_ENABLED = config("SERVER_TIMING_ENABLED", default=True, cast=bool)
+# URL nomi bo'yicha so'rovlar soni chegarasi (oshsa ogohlantirish yoziladi)
+QUERY_BUDGETS = {
+    "default": 20,
+    "dishes:recipe_list_create": 5,
+    "dishes:recipe_detail": 5,
+    "dishes:recipe_comments": 5,
+    "categories:category_recipes": 5,
 }
 
 # JWT Configuration
@@ -188,23 +238,50 @@ CORS_ALLOWED_ORIGINS = [
 
 # Email Configuration
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+EMAIL_HOST = config("EMAIL_HOST", default="smtp.gmail.com")
+EMAIL_PORT = config("EMAIL_PORT", default=587, cast=int)
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
 EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
-DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+EMAIL_TIMEOUT = 30  # SMTP ulanish/javob kutish (s)
+DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default=EMAIL_HOST_USER)
+
+# Email outbox (users.outbox) - provayder: get_connection() parametrlari va limitlari
+EMAIL_OUTBOX_PROVIDERS = {
+    "default": {
+        "OPTIONS": {},  # bo'sh - yuqoridagi EMAIL_* sozlamalari ishlatiladi
+        "RATE_LIMIT": config("EMAIL_RATE_LIMIT", default=60, cast=int),  # xat/daqiqa, 0 - cheksiz
+        "BATCH_SIZE": 50,  # bitta partiyada olinadigan xatlar
+    },
+}
+EMAIL_OUTBOX_MAX_ATTEMPTS = 6  # shundan keyin xat "failed" bo'ladi
+EMAIL_OUTBOX_RETRY_DELAY = 30  # birinchi qayta urinish (s), har safar 2 baravar oshadi
+EMAIL_OUTBOX_RETRY_MAX_DELAY = 3600  # backoff yuqori chegarasi (s)
+EMAIL_OUTBOX_LEASE = 300  # dispatcher olgan xat shuncha vaqt boshqalarga berilmaydi (s)
+EMAIL_OUTBOX_DISPATCH_DELAY = 2  # partiya yig'ilishi uchun dispatcher kechiktiriladi (s)
+
+# Redis Configuration
+REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+REDIS_MAX_CONNECTIONS = config("REDIS_MAX_CONNECTIONS", default=50, cast=int)  # jarayondagi umumiy pool hajmi
+REDIS_SOCKET_TIMEOUT = config("REDIS_SOCKET_TIMEOUT", default=5, cast=float)  # buyruq/ulanish timeouti (soniya)
 
 # Celery Configuration
-CELERY_BROKER_URL = "redis://localhost:6379/0"
-CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
+CELERY_BROKER_URL = config("CELERY_BROKER_URL", default=REDIS_URL)
+CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND", default=REDIS_URL)
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 
-# Redis Configuration
-REDIS_URL = "redis://localhost:6379/0"
+# Cache Configuration
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "culinary_canvas",
+    }
+}
+RESPONSE_CACHE_TIMEOUT = 300  # anonim GET javoblari keshi (soniya)
 
 # Jazzmin Configuration
 
@@ -0,0 +1,260 @@
+import base64
+import json
+import uuid
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from categories.models import Category
+from core.pagination import KeysetPagination
+from core.redis_client import get_redis
+from core.throttling import THROTTLE_KEY, RedisRateThrottle, parse_rate
+from dishes.models import Recipe
+
+User = get_user_model()
+factory = APIRequestFactory()
+
+
+def make_request(**params):
+    return Request(factory.get("/recipes/", params))
+
+
+def raw_cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+class CursorTests(TestCase):
+    def setUp(self):
+        self.paginator = KeysetPagination()
+        self.paginator.field = "created_at"
+
+    def decode(self, token):
+        return self.paginator.decode_cursor(make_request(cursor=token), Recipe)
+
+    def test_round_trip(self):
+        created_at = timezone.now()
+        pk = uuid.uuid4()
+        token = KeysetPagination.encode_cursor(created_at, pk, reverse=True)
+
+        self.assertEqual(self.decode(token), {"v": created_at, "pk": pk, "r": True})
+
+    def test_round_trip_nullable_text_field(self):
+        self.paginator.field = self.paginator.keyset_annotation
+        pk = uuid.uuid4()
+        token = KeysetPagination.encode_cursor("Plov", pk)
+
+        self.assertEqual(self.decode(token), {"v": "Plov", "pk": pk, "r": False})
+
+    def test_missing_cursor(self):
+        self.assertIsNone(self.paginator.decode_cursor(make_request(), Recipe))
+
+    def test_invalid_cursor_is_not_found(self):
+        pk = str(uuid.uuid4())
+        now = timezone.now().isoformat()
+        tokens = [
+            "not base64!",
+            base64.urlsafe_b64encode(b"not json").decode(),
+            raw_cursor([now, pk]),
+            raw_cursor({"v": now, "pk": pk}),
+            raw_cursor({"v": now, "pk": pk, "r": "yes"}),
+            raw_cursor({"v": None, "pk": pk, "r": False}),
+            raw_cursor({"v": "yesterday", "pk": pk, "r": False}),
+            raw_cursor({"v": now, "pk": "42", "r": False}),
+            raw_cursor({"v": now, "pk": {"id": 1}, "r": False}),
+        ]
+        for token in tokens:
+            with self.subTest(token=token), self.assertRaises(NotFound):
+                self.decode(token)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(
+            email="chef@example.com", password="pass", first_name="Chef", last_name="Cook"
+        )
+        category = Category.objects.create(name="Main")
+        for number in range(5):
+            Recipe.objects.create(
+                title=f"Recipe {number}",
+                description="Description",
+                ingredients="rice",
+                instructions="Cook",
+                author=author,
+                category=category,
+            )
+        # Bir xil created_at - tartib pk bo'yicha davom etishi kerak
+        Recipe.objects.update(created_at=timezone.now())
+
+    def paginate(self, **params):
+        paginator = KeysetPagination()
+        queryset = Recipe.objects.order_by("-created_at")
+        page = paginator.paginate_queryset(queryset, make_request(page_size=2, **params))
+        return page, paginator
+
+    @staticmethod
+    def cursor(link):
+        return parse_qs(urlparse(link).query)["cursor"][0]
+
+    def test_walk_forward_and_back(self):
+        expected = list(Recipe.objects.order_by("-created_at", "-pk"))
+
+        pages = []
+        page, paginator = self.paginate()
+        self.assertIsNone(paginator.get_previous_link())
+        while True:
+            pages.append(page)
+            link = paginator.get_next_link()
+            if link is None:
+                break
+            page, paginator = self.paginate(cursor=self.cursor(link))
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual([obj for page in pages for obj in page], expected)
+
+        previous, paginator = self.paginate(cursor=self.cursor(paginator.get_previous_link()))
+        self.assertEqual(previous, pages[1])
+
+    def test_page_param_switches_to_page_numbers(self):
+        page, paginator = self.paginate(page=1)
+        self.assertIsNotNone(paginator.page_number_paginator)
+        self.assertEqual(len(page), 5)
+        self.assertEqual(paginator.get_paginated_response([]).data["count"], 5)
+
+
+TEST_RATES = {
+    "test": "2/min",
+    "test_account": "2/h",
+    "search": "",
+    "anon_read": "",
+    "writes": "",
+}
+
+
+def throttle_settings(**rates):
+    return override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {**TEST_RATES, **rates},
+        }
+    )
+
+
+class ThrottledView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = [RedisRateThrottle]
+    throttle_scope = "test"
+
+    def get(self, request):
+        return Response({})
+
+    def post(self, request):
+        return Response({})
+
+
+class AccountThrottledView(ThrottledView):
+    throttle_scope = None
+    throttle_account_scope = "test_account"
+    throttle_account_field = "email"
+
+
+class ParseRateTests(SimpleTestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("30/min"), (30, 60))
+        self.assertEqual(parse_rate("10/h"), (10, 3600))
+        self.assertEqual(parse_rate("5/s"), (5, 1))
+        self.assertEqual(parse_rate("1/day"), (1, 86400))
+
+
+@throttle_settings()
+class RedisRateThrottleTests(TestCase):
+    def setUp(self):
+        redis = get_redis()
+        for key in redis.scan_iter(THROTTLE_KEY.format("test*", "*")):
+            redis.delete(key)
+
+    def call(self, view, method="post", ip="192.0.2.1", user=None, **kwargs):
+        request = getattr(factory, method)("/throttled/", REMOTE_ADDR=ip, **kwargs)
+        if user is not None:
+            force_authenticate(request, user)
+        return view.as_view()(request)
+
+    def test_scopes(self):
+        throttle = RedisRateThrottle()
+        rates = {"search": "30/min", "anon_read": "300/min", "writes": "60/min"}
+        with throttle_settings(**rates):
+            request = ThrottledView().initialize_request(factory.get("/", {"q": "plov"}))
+            self.assertEqual(
+                [scope for scope, _ in throttle.get_scopes(request, ThrottledView)],
+                ["test", "search", "anon_read"],
+            )
+            request = ThrottledView().initialize_request(factory.post("/"))
+            self.assertEqual(
+                throttle.get_scopes(request, ThrottledView),
+                [("test", (2, 60)), ("writes", (60, 60))],
+            )
+
+    def test_bucket_limits_and_headers(self):
+        responses = [self.call(ThrottledView) for _ in range(3)]
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 429])
+        self.assertEqual(responses[0]["RateLimit-Limit"], "2")
+        self.assertEqual(responses[0]["RateLimit-Remaining"], "1")
+        self.assertEqual(responses[0]["RateLimit-Policy"], "2;w=60")
+        self.assertEqual(responses[2]["RateLimit-Remaining"], "0")
+        self.assertTrue(1 <= int(responses[2]["Retry-After"]) <= 30)
+        # Boshqa IP - alohida bucket
+        self.assertEqual(self.call(ThrottledView, ip="192.0.2.2").status_code, 200)
+
+    def test_authenticated_user_bucket(self):
+        user = User.objects.create_user(
+            email="chef@example.com", password="pass", first_name="Chef", last_name="Cook"
+        )
+        for ip in ("192.0.2.1", "192.0.2.2"):
+            self.assertEqual(self.call(ThrottledView, ip=ip, user=user).status_code, 200)
+        self.assertEqual(self.call(ThrottledView, ip="192.0.2.3", user=user).status_code, 429)
+
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        codes = [
+            self.call(ThrottledView, HTTP_X_FORWARDED_FOR=f"198.51.100.{n}").status_code
+            for n in range(3)
+        ]
+        self.assertEqual(codes, [200, 200, 429])
+
+    def test_forwarded_for_with_trusted_proxy(self):
+        with override_settings(
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+        ), throttle_settings():
+            codes = [
+                self.call(ThrottledView, HTTP_X_FORWARDED_FOR=f"198.51.100.{n}").status_code
+                for n in range(3)
+            ]
+        self.assertEqual(codes, [200, 200, 200])
+
+    def test_account_scope_across_ips(self):
+        codes = [
+            self.call(
+                AccountThrottledView, ip=f"192.0.2.{n}", data={"email": " Chef@Example.com"}
+            ).status_code
+            for n in range(3)
+        ]
+        self.assertEqual(codes, [200, 200, 429])
+        other = self.call(AccountThrottledView, data={"email": "cook@example.com"})
+        self.assertEqual(other.status_code, 200)
+        # Akkaunt maydoni bo'lmasa limit qo'llanmaydi
+        self.assertEqual(self.call(AccountThrottledView, method="get").status_code, 200)
+
+    def test_redis_error_allows_request(self):
+        with mock.patch("core.throttling.get_redis", side_effect=ConnectionError("down")):
+            codes = [self.call(ThrottledView).status_code for _ in range(3)]
+        self.assertEqual(codes, [200, 200, 200])
@@ -0,0 +1,179 @@
+import logging
+import math
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import registry
+from .redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger("django")
+
+THROTTLE_KEY = "throttle:{}:{}"
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Bir nechta token bucket'ni atomar tekshirish: hammasida token bo'lsagina har
+# biridan bittadan olinadi. Vaqt Redis serveridan (TIME) - web node'lar soati
+# farq qilsa ham limit bir xil. Natija: {ruxsat, {{qoldiq, kutish_ms, to'lish_ms}, ...}}
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local levels = {}
+local allowed = 1
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local period = tonumber(ARGV[i * 2])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local level = tonumber(bucket[1]) or capacity
+    local elapsed = math.max(0, now - (tonumber(bucket[2]) or now))
+    level = math.min(capacity, level + elapsed * capacity / period)
+    if level < 1 then
+        allowed = 0
+    end
+    levels[i] = level
+end
+local result = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local period = tonumber(ARGV[i * 2])
+    local level = levels[i]
+    if allowed == 1 then
+        level = level - 1
+    end
+    redis.call('HSET', key, 'tokens', level, 'ts', now)
+    redis.call('PEXPIRE', key, period)
+    local wait = 0
+    if level < 1 then
+        wait = math.ceil((1 - level) * period / capacity)
+    end
+    result[i] = {math.floor(level), wait, math.ceil((capacity - level) * period / capacity)}
+end
+return {allowed, result}
+"""
+
+
+def parse_rate(rate):
+    """``"30/min"`` -> ``(30, 60)`` (DRF ``DEFAULT_THROTTLE_RATES`` formati)"""
+    count, period = rate.split("/")
+    return int(count), PERIODS[period[0]]
+
+
+class RedisRateThrottle(BaseThrottle):
+    """Scope bo'yicha Redis token bucket limitlari (barcha web node'lar uchun umumiy).
+
+    Scope'lar: view'dagi ``throttle_scope`` (masalan ``auth``), qidiruv
+    parametrli GET (``search``), anonim o'qish (``anon_read``) va yozuvchi
+    metodlar (``writes``). ``throttle_account_scope`` berilgan view'da
+    (masalan email tasdiqlash) limit IP'dan tashqari so'rovdagi
+    ``throttle_account_field`` akkaunti bo'yicha ham hisoblanadi - IP
+    almashtirib bitta akkauntni tanlab topib bo'lmaydi. So'rovga tushgan barcha scope'lar bitta skript
+    chaqiruvi (bitta round trip) bilan tekshiriladi; eng kam qolgan scope
+    ``RateLimit-*`` headerlarida qaytariladi.
+    """
+
+    def get_scopes(self, request, view):
+        scopes = []
+        if getattr(view, "throttle_scope", None):
+            scopes.append(view.throttle_scope)
+        if request.method in SAFE_METHODS:
+            if any(request.query_params.get(param) for param in settings.THROTTLE_SEARCH_PARAMS):
+                scopes.append("search")
+            if not request.user.is_authenticated:
+                scopes.append("anon_read")
+        else:
+            scopes.append("writes")
+        self.account_ident = self.get_account_ident(request, view)
+        if self.account_ident:
+            scopes.append(view.throttle_account_scope)
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        # Bo'sh limit (masalan THROTTLE_ANON_READ=) - scope o'chirilgan
+        return [(scope, parse_rate(rates[scope])) for scope in dict.fromkeys(scopes) if rates.get(scope)]
+
+    def get_bucket_ident(self, request):
+        if request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        # get_ident() X-Forwarded-For'ga faqat NUM_PROXIES > 0 bo'lsa ishonadi
+        return f"ip:{self.get_ident(request)}"
+
+    def get_account_ident(self, request, view):
+        field = getattr(view, "throttle_account_field", None)
+        if not getattr(view, "throttle_account_scope", None) or not field:
+            return None
+        if request.method in SAFE_METHODS:
+            return None
+        try:
+            value = request.data.get(field)
+        except (ParseError, AttributeError):
+            # Noto'g'ri body - view o'zi 400 qaytaradi
+            return None
+        value = str(value or "").strip().lower()
+        return f"account:{value}" if value else None
+
+    def get_script_arguments(self, request, view, scopes):
+        ident = self.get_bucket_ident(request)
+        account_scope = getattr(view, "throttle_account_scope", None)
+        keys = [
+            THROTTLE_KEY.format(scope, self.account_ident if scope == account_scope else ident)
+            for scope, _ in scopes
+        ]
+        args = [value for _, (limit, period) in scopes for value in (limit, period * 1000)]
+        return keys, args
+
+    def allow_request(self, request, view):
+        scopes = self.get_scopes(request, view)
+        if not scopes:
+            return True
+        keys, args = self.get_script_arguments(request, view, scopes)
+        try:
+            result = get_redis().register_script(TOKEN_BUCKET_SCRIPT)(keys=keys, args=args)
+        except Exception as e:
+            # Redis ishlamasa so'rovlar bloklanmaydi
+            logger.error(f"Throttle check error: {e!s}")
+            return True
+        return self.apply_result(request, view, scopes, result)
+
+    async def aallow_request(self, request, view):
+        """``allow_request`` ning async Redis varianti (``AsyncAPIViewMixin``)"""
+        scopes = self.get_scopes(request, view)
+        if not scopes:
+            return True
+        keys, args = self.get_script_arguments(request, view, scopes)
+        try:
+            script = get_async_redis().register_script(TOKEN_BUCKET_SCRIPT)
+            result = await script(keys=keys, args=args)
+        except Exception as e:
+            logger.error(f"Throttle check error: {e!s}")
+            return True
+        return self.apply_result(request, view, scopes, result)
+
+    def apply_result(self, request, view, scopes, result):
+        allowed, buckets = result
+        (_, (limit, period)), (remaining, _, reset_ms) = min(
+            zip(scopes, buckets, strict=True), key=lambda item: item[1][0]
+        )
+        view.headers.update(
+            {
+                "RateLimit-Limit": str(limit),
+                "RateLimit-Remaining": str(remaining),
+                "RateLimit-Reset": str(math.ceil(reset_ms / 1000)),
+                "RateLimit-Policy": f"{limit};w={period}",
+            }
+        )
+        if allowed:
+            return True
+
+        match = request.resolver_match
+        view_name = match.view_name if match else "unresolved"
+        waits = []
+        for (scope, _), (_, wait_ms, _) in zip(scopes, buckets, strict=True):
+            if wait_ms:
+                registry.record_throttled(scope, view_name)
+                waits.append(wait_ms)
+        self.wait_seconds = max(waits) / 1000
+        return False
+
+    def wait(self):
+        return self.wait_seconds
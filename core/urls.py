@@ -8,6 +8,7 @@ from drf_spectacular.views import (
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
+from core.metrics import metrics_view
 from dishes.views import home
 
 urlpatterns = [
@@ -36,6 +37,8 @@ urlpatterns = [
     path("redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
      # Downloadable Schema (YML)
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    # Prometheus metrics
+    path("metrics", metrics_view, name="metrics"),
     path('', home, name='home'),
 ]
 
@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+# WSGI ostida async viewlar har bir so'rovda async_to_sync bilan o'ralardi
+os.environ.setdefault("ASYNC_API_VIEWS", "false")
 
 application = get_wsgi_application()
@@ -1,7 +1,11 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 
-from .models import Comment, Rating, Recipe
+from core.cache import bump_namespaces
+from users.search import author_matches
+
+from .models import Comment, Ingredient, Rating, Recipe, StatsSnapshot
 
 
 class RatingInline(admin.TabularInline):
@@ -40,15 +44,17 @@ class RecipeAdmin(admin.ModelAdmin):
         "created_at",
         "author__is_chef",
     )
-    search_fields = (
-        "title",
-        "description",
-        "author__email",
-        "author__first_name",
-        "author__last_name",
-    )
+    # Muallif bo'yicha qidiruv get_search_results'da (trigram indeks orqali)
+    search_fields = ("title", "description")
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ("created_at", "updated_at", "average_rating", "ratings_count")
+    readonly_fields = (
+        "created_at",
+        "updated_at",
+        "average_rating",
+        "ratings_count",
+        "rating_histogram",
+        "ingredient_count",
+    )
     inlines = [RatingInline, CommentInline]
 
     fieldsets = (
@@ -62,32 +68,59 @@ class RecipeAdmin(admin.ModelAdmin):
             {"fields": ("difficulty", "prep_time", "cook_time", "servings")},
         ),
         (_("Status"), {"fields": ("is_draft", "is_featured")}),
-        (_("Statistics"), {"fields": ("average_rating", "ratings_count")}),
+        (
+            _("Statistics"),
+            {
+                "fields": (
+                    "average_rating",
+                    "ratings_count",
+                    "rating_histogram",
+                    "ingredient_count",
+                )
+            },
+        ),
         (_("Timestamps"), {"fields": ("created_at", "updated_at")}),
     )
 
     actions = ["make_featured", "remove_featured", "publish_recipes", "make_draft"]
 
+    def get_search_results(self, request, queryset, search_term):
+        filtered, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        if search_term:
+            # users_user bilan JOIN o'rniga trigram indeksli EXISTS
+            filtered |= queryset.filter(author_matches(search_term))
+        return filtered, may_have_duplicates
+
     def make_featured(self, request, queryset):
         queryset.update(is_featured=True)
+        # queryset.update() signal yubormaydi - keshni o'zimiz eskirtiramiz
+        bump_namespaces("recipes", "categories")
         self.message_user(request, _("Selected recipes marked as featured."))
 
     make_featured.short_description = _("Mark selected recipes as featured")
 
     def remove_featured(self, request, queryset):
         queryset.update(is_featured=False)
+        # queryset.update() signal yubormaydi - keshni o'zimiz eskirtiramiz
+        bump_namespaces("recipes", "categories")
         self.message_user(request, _("Featured status removed from selected recipes."))
 
     remove_featured.short_description = _("Remove featured status")
 
     def publish_recipes(self, request, queryset):
         queryset.update(is_draft=False)
+        # queryset.update() signal yubormaydi - keshni o'zimiz eskirtiramiz
+        bump_namespaces("recipes", "categories")
         self.message_user(request, _("Selected recipes published."))
 
     publish_recipes.short_description = _("Publish selected recipes")
 
     def make_draft(self, request, queryset):
         queryset.update(is_draft=True)
+        # queryset.update() signal yubormaydi - keshni o'zimiz eskirtiramiz
+        bump_namespaces("recipes", "categories")
         self.message_user(request, _("Selected recipes marked as draft."))
 
     make_draft.short_description = _("Mark selected recipes as draft")
@@ -110,6 +143,12 @@ class CommentAdmin(admin.ModelAdmin):
 
     actions = ["approve_comments", "reject_comments"]
 
+    def get_readonly_fields(self, request, obj=None):
+        # Thread path yaratilgandan keyin o'zgarmaydi
+        if obj is not None:
+            return (*self.readonly_fields, "parent")
+        return self.readonly_fields
+
     def approve_comments(self, request, queryset):
         queryset.update(is_active=True)
         self.message_user(request, _("Selected comments approved."))
@@ -121,3 +160,36 @@ class CommentAdmin(admin.ModelAdmin):
         self.message_user(request, _("Selected comments rejected."))
 
     reject_comments.short_description = _("Reject selected comments")
+
+
+@admin.register(Ingredient)
+class IngredientAdmin(admin.ModelAdmin):
+    list_display = ("name", "recipes_count", "created_at")
+    search_fields = ("name",)
+    readonly_fields = ("created_at",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            recipes_count=Count("recipe_ingredients")
+        )
+
+    def recipes_count(self, obj):
+        return obj.recipes_count
+
+    recipes_count.short_description = _("Recipes count")
+    recipes_count.admin_order_field = "recipes_count"
+
+
+@admin.register(StatsSnapshot)
+class StatsSnapshotAdmin(admin.ModelAdmin):
+    list_display = (
+        "date",
+        "recipes_total",
+        "recipes_published",
+        "users_total",
+        "ratings_total",
+        "average_rating",
+        "comments_total",
+    )
+    date_hierarchy = "date"
+    readonly_fields = ("created_at", "updated_at")
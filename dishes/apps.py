@@ -6,4 +6,4 @@ class DishesConfig(AppConfig):
     name = "dishes"
 
     def ready(self):
-        pass
+        from . import signals  # noqa: F401
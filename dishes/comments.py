@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import Comment
+
+
+def load_comment_threads(roots, max_depth=None, replies_per_thread=None):
+    """Top-level izohlarning faol javoblarini bitta so'rovda yuklab, xotirada yig'ish.
+
+    Har bir thread ``root_id`` bo'yicha olinadi va ``path`` tartibida (chuqurlik
+    bo'yicha birinchi) qaytadi. ``replies_per_thread`` - har bir thread uchun
+    birinchi sahifa hajmi; qolganlari ``comment_replies`` endpointi orqali olinadi.
+
+    Har bir izohga ``thread_replies`` (bola izohlar ro'yxati) qo'yiladi,
+    top-level izohlarga esa ``thread_size`` (thread'dagi jami javoblar soni) va
+    ``last_loaded_reply`` (keyingi sahifa uchun) ham qo'yiladi.
+    """
+    if max_depth is None:
+        max_depth = settings.COMMENT_MAX_DEPTH
+    if replies_per_thread is None:
+        replies_per_thread = settings.COMMENT_REPLIES_PER_THREAD
+
+    roots = list(roots)
+    by_id = {}
+    for root in roots:
+        root.thread_replies = []
+        root.thread_size = 0
+        root.last_loaded_reply = None
+        by_id[root.pk] = root
+    if not roots or max_depth < 1:
+        return roots
+
+    replies = (
+        Comment.objects.filter(
+            root_id__in=list(by_id), is_active=True, depth__lte=max_depth
+        )
+        .select_related("user")
+        .annotate(
+            thread_position=Window(
+                RowNumber(), partition_by=[F("root_id")], order_by=F("path").asc()
+            ),
+            thread_size=Window(Count("id"), partition_by=[F("root_id")]),
+        )
+        .filter(thread_position__lte=replies_per_thread)
+        .order_by("root_id", "path")
+    )
+
+    for reply in replies:
+        reply.thread_replies = []
+        parent = by_id.get(reply.parent_id)
+        root = by_id[reply.root_id]
+        root.thread_size = reply.thread_size
+        root.last_loaded_reply = reply
+        if parent is None:
+            # Ota izoh faol emas yoki sahifadan tashqarida - javob ko'rsatilmaydi
+            continue
+        parent.thread_replies.append(reply)
+        by_id[reply.pk] = reply
+
+    return roots
+
+
+def thread_replies_queryset(comment, max_depth=None):
+    """Izohning barcha faol javoblari (``path`` tartibida, keyset paginatsiya uchun)"""
+    if max_depth is None:
+        max_depth = settings.COMMENT_MAX_DEPTH
+    subtree = Comment.objects.filter(
+        root_id=comment.root_id or comment.pk, path__startswith=comment.path
+    )
+    queryset = subtree.filter(
+        depth__gt=comment.depth, depth__lte=max_depth, is_active=True
+    )
+    # Faol bo'lmagan izohlarning javoblari ham yashiriladi
+    hidden = Q()
+    for path in subtree.filter(is_active=False).values_list("path", flat=True):
+        hidden |= Q(path__startswith=path)
+    if hidden:
+        queryset = queryset.exclude(hidden)
+    return queryset.select_related("user").order_by("path")
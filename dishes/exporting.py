@@ -0,0 +1,150 @@
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from modeltranslation.utils import build_localized_fieldname
+
+from .filters import RecipeFilter
+from .models import Recipe
+
+EXPORT_CHUNK_SIZE = 2000
+
+TRANSLATED_FIELDS = ("title", "description", "ingredients", "instructions")
+
+EXPORT_FIELDS = (
+    "id",
+    "slug",
+    "image",
+    "difficulty",
+    "prep_time",
+    "cook_time",
+    "total_time",
+    "servings",
+    "is_draft",
+    "is_featured",
+    "rating_count",
+    "rating_sum",
+    "rating_1_count",
+    "rating_2_count",
+    "rating_3_count",
+    "rating_4_count",
+    "rating_5_count",
+    "popularity_score",
+    "created_at",
+    "updated_at",
+    "author_id",
+    "author__email",
+    "author__first_name",
+    "author__last_name",
+    "category_id",
+)
+
+
+def language_codes():
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def export_fields():
+    """``values()`` uchun maydonlar: barcha tarjimalar bilan"""
+    translated = [
+        build_localized_fieldname(field, lang)
+        for field in TRANSLATED_FIELDS
+        for lang in language_codes()
+    ]
+    categories = [build_localized_fieldname("category__name", lang) for lang in language_codes()]
+    return [*EXPORT_FIELDS, *translated, *categories]
+
+
+def filter_export_queryset(params):
+    """``RecipeFilter`` bilan filterlangan eksport querysetini qaytarish.
+
+    Filter parametrlari noto'g'ri bo'lsa ``(None, errors)`` qaytariladi.
+    """
+    filterset = RecipeFilter(params, queryset=Recipe.objects.all())
+    if not filterset.is_valid():
+        return None, filterset.errors
+    return filterset.qs.order_by("created_at", "id").values(*export_fields()), None
+
+
+def serialize_row(row):
+    """``values()`` qatorini eksport yozuviga aylantirish"""
+    record = {field: row[field] for field in EXPORT_FIELDS if "__" not in field}
+    record["image"] = row["image"] or None
+    record["average_rating"] = (
+        round(row["rating_sum"] / row["rating_count"], 2) if row["rating_count"] else 0
+    )
+    record["author"] = {
+        "id": row["author_id"],
+        "email": row["author__email"],
+        "full_name": f"{row['author__first_name']} {row['author__last_name']}".strip(),
+    }
+    record["category"] = {
+        "id": row["category_id"],
+        "name": {
+            lang: row[build_localized_fieldname("category__name", lang)]
+            for lang in language_codes()
+        },
+    }
+    for field in TRANSLATED_FIELDS:
+        record[field] = {
+            lang: row[build_localized_fieldname(field, lang)] for lang in language_codes()
+        }
+    return record
+
+
+def iter_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Server-side cursor orqali NDJSON qatorlarini ketma-ket chiqarish.
+
+    ``iterator(chunk_size=...)`` PostgreSQL'da nomlangan cursor ochadi - xotirada
+    bir vaqtda faqat bitta partiya turadi.
+    """
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    batch = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        batch.append(encoder.encode(serialize_row(row)))
+        if len(batch) >= chunk_size:
+            yield ("\n".join(batch) + "\n").encode()
+            batch = []
+    if batch:
+        yield ("\n".join(batch) + "\n").encode()
+
+
+def iter_gzip(chunks):
+    """Baytlar oqimini gzip formatida siqib chiqarish"""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def aiter_chunks(chunks):
+    """Sync oqimni ASGI uchun async iteratorga aylantirish.
+
+    Aks holda Django ``StreamingHttpResponse`` sync iteratorni ASGI ostida
+    ``list()`` bilan to'liq xotiraga yig'adi. Har bir partiya alohida
+    ``sync_to_async`` chaqiruvida olinadi - thread_sensitive bo'lgani uchun
+    server-side cursor doim bitta ulanishda qoladi.
+    """
+    chunks = iter(chunks)
+    done = object()
+    try:
+        while (chunk := await sync_to_async(next)(chunks, done)) is not done:
+            yield chunk
+    finally:
+        # Mijoz uzilsa cursor yopiladi
+        await sync_to_async(chunks.close)()
+
+
+def parse_filters(values):
+    """``name=value`` ko'rinishidagi qatorlarni filter parametrlariga aylantirish"""
+    params = {}
+    for value in values:
+        name, sep, param = value.partition("=")
+        if not sep or not name:
+            raise ValueError(f"Invalid filter {value!r}, expected name=value")
+        params[name] = param
+    return params
+
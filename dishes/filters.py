@@ -1,7 +1,7 @@
 import django_filters
-from django.db.models import Q
 
 from categories.models import Category
+from users.search import author_matches
 
 from .models import Recipe
 
@@ -19,7 +19,8 @@ class RecipeFilter(django_filters.FilterSet):
     cook_time_max = django_filters.NumberFilter(
         field_name="cook_time", lookup_expr="lte"
     )
-    total_time_max = django_filters.NumberFilter(method="filter_total_time_max")
+    total_time_min = django_filters.NumberFilter(field_name="total_time", lookup_expr="gte")
+    total_time_max = django_filters.NumberFilter(field_name="total_time", lookup_expr="lte")
     servings_min = django_filters.NumberFilter(field_name="servings", lookup_expr="gte")
     servings_max = django_filters.NumberFilter(field_name="servings", lookup_expr="lte")
     is_featured = django_filters.BooleanFilter(field_name="is_featured")
@@ -29,14 +30,6 @@ class RecipeFilter(django_filters.FilterSet):
         model = Recipe
         fields = []
 
-    def filter_total_time_max(self, queryset, name, value):
-        """Jami vaqt bo'yicha filterlash"""
-        return queryset.extra(where=["prep_time + cook_time <= %s"], params=[value])
-
     def filter_by_author(self, queryset, name, value):
-        """Muallif nomi bo'yicha qidirish"""
-        return queryset.filter(
-            Q(author__first_name__icontains=value)
-            | Q(author__last_name__icontains=value)
-            | Q(author__email__icontains=value)
-        )
+        """Muallif ismi, familiyasi yoki emaili bo'yicha qidirish (trigram indeks orqali)"""
+        return queryset.filter(author_matches(value))
@@ -0,0 +1,346 @@
+import csv
+import functools
+import gzip
+import json
+import multiprocessing
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connections, transaction
+from modeltranslation.utils import build_localized_fieldname
+
+from categories.models import Category
+from core.cache import bump_namespaces_on_commit
+
+from .ingredients import sync_recipe_ingredients
+from .models import ImportCheckpoint, Recipe
+from .search import update_search_vectors
+from .slugs import SLUG_RETRIES, allocate_slugs, is_slug_conflict
+
+User = get_user_model()
+
+TRANSLATED_FIELDS = ("title", "description", "ingredients", "instructions")
+REQUIRED_FIELDS = ("title", "description", "ingredients", "instructions")
+INTEGER_FIELDS = {"prep_time": 0, "cook_time": 0, "servings": 1}
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+FALSE_VALUES = {"0", "false", "no", "n", "f"}
+
+
+class RowError(ValueError):
+    pass
+
+
+def validation_rules():
+    """Ishchi jarayonlarga uzatiladigan qoidalar (model importisiz tekshirish uchun)"""
+    return {
+        "languages": [code for code, _ in settings.LANGUAGES],
+        "default_language": settings.LANGUAGE_CODE,
+        "title_max_length": Recipe._meta.get_field("title").max_length,
+        "difficulties": [value for value, _ in Recipe.DIFFICULTY_CHOICES],
+        "default_difficulty": Recipe._meta.get_field("difficulty").default,
+        "default_is_draft": Recipe._meta.get_field("is_draft").default,
+    }
+
+
+def detect_format(path):
+    name = path.removesuffix(".gz")
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    raise ValueError(f"Cannot detect format of {path}, use --format")
+
+
+def read_rows(path, fmt, skip=0):
+    """Fayldan ``(qator raqami, xom qator)`` juftliklarini o'qish (.gz ham qo'llanadi)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (line for line in f if line.strip())
+        for number, row in enumerate(rows, start=1):
+            if number > skip:
+                yield number, row
+
+
+def translated_values(raw, field, rules):
+    """``title`` (matn yoki ``{lang: matn}``) va ``title_uz`` ustunlaridan tarjimalar"""
+    value = raw.get(field)
+    if isinstance(value, dict):
+        values = {lang: value.get(lang) for lang in rules["languages"]}
+    else:
+        values = {lang: None for lang in rules["languages"]}
+        values[rules["default_language"]] = value
+    for lang in rules["languages"]:
+        localized = raw.get(f"{field}_{lang}")
+        if localized not in (None, ""):
+            values[lang] = localized
+    return {
+        lang: str(text).strip() if text not in (None, "") else None
+        for lang, text in values.items()
+    }
+
+
+def parse_integer(raw, field, default):
+    value = raw.get(field)
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise RowError(f"{field}: {value!r} is not an integer") from None
+    if number < 0:
+        raise RowError(f"{field}: must not be negative")
+    return number
+
+
+def parse_boolean(raw, field, default):
+    value = raw.get(field)
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if not text:
+        # Bo'sh CSV katagi - qiymat berilmagan (parse_integer kabi)
+        return default
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise RowError(f"{field}: {value!r} is not a boolean")
+
+
+def natural_key(raw, field, key, default_language):
+    """``author`` / ``category`` qiymatidan tabiiy kalit (email yoki nom)"""
+    value = raw.get(f"{field}_{key}") or raw.get(field)
+    if isinstance(value, dict):
+        value = value.get(key)
+        if isinstance(value, dict):
+            value = value.get(default_language)
+    return str(value).strip().lower() if value not in (None, "") else None
+
+
+def parse_translated_fields(raw, rules):
+    """Tarjima qilinadigan maydonlar: ``{"title_en": ..., "title_uz": ..., ...}``"""
+    fields = {}
+    default_language = rules["default_language"]
+    for field in TRANSLATED_FIELDS:
+        values = translated_values(raw, field, rules)
+        if field in REQUIRED_FIELDS and not values[default_language]:
+            raise RowError(f"{field}: {default_language} value is required")
+        for lang, text in values.items():
+            if field == "title" and text and len(text) > rules["title_max_length"]:
+                raise RowError(f"title_{lang}: longer than {rules['title_max_length']} characters")
+            fields[f"{field}_{lang}"] = text
+    return fields
+
+
+def parse_natural_keys(raw, default_language):
+    """Muallif emaili va kategoriya nomi (ikkalasi ham majburiy)"""
+    author = natural_key(raw, "author", "email", default_language)
+    category = natural_key(raw, "category", "name", default_language)
+    if not author:
+        raise RowError("author email is required")
+    if not category:
+        raise RowError("category name is required")
+    return author, category
+
+
+def validate_row(item, rules):
+    """Xom qatorni tekshirish va normallashtirish (ishchi jarayonda bajariladi).
+
+    ``(qator raqami, maydonlar lug'ati, xato)`` qaytaradi; bazaga murojaat qilmaydi.
+    """
+    number, raw = item
+    try:
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except ValueError as e:
+                raise RowError(f"invalid JSON: {e}") from None
+        if not isinstance(raw, dict):
+            raise RowError("row must be an object")
+
+        fields = parse_translated_fields(raw, rules)
+        difficulty = raw.get("difficulty") or rules["default_difficulty"]
+        if difficulty not in rules["difficulties"]:
+            raise RowError(f"difficulty: {difficulty!r} is not a valid choice")
+        fields["difficulty"] = difficulty
+        for field, default in INTEGER_FIELDS.items():
+            fields[field] = parse_integer(raw, field, default)
+        fields["is_draft"] = parse_boolean(raw, "is_draft", rules["default_is_draft"])
+        fields["is_featured"] = parse_boolean(raw, "is_featured", False)
+        fields["author"], fields["category"] = parse_natural_keys(raw, rules["default_language"])
+    except RowError as e:
+        return number, None, str(e)
+    return number, fields, None
+
+
+def load_natural_keys():
+    """Muallif emaillari va kategoriya nomlaridan id'larga xaritalar"""
+    authors = {
+        email.lower(): pk for pk, email in User.objects.values_list("pk", "email").iterator()
+    }
+    categories = {}
+    name_fields = [
+        build_localized_fieldname("name", code) for code, _ in settings.LANGUAGES
+    ]
+    for row in Category.objects.values("pk", *name_fields):
+        for field in name_fields:
+            if row[field]:
+                categories.setdefault(row[field].lower(), row["pk"])
+    return authors, categories
+
+
+class RecipeImporter:
+    """NDJSON/CSV fayldan retseptlarni tez yuklash.
+
+    Qatorlar ``multiprocessing`` pool'ida tekshiriladi, muallif va kategoriyalar
+    xotiradagi xaritalar orqali topiladi, sluglar ``allocate_slugs`` bilan
+    oldindan ajratiladi va har bir partiya bitta tranzaksiyada ``bulk_create``
+    bilan yoziladi. Checkpoint (``ImportCheckpoint``) partiya bilan bitta
+    tranzaksiyada yangilanadi - to'xtatilgan import aynan oxirgi commit
+    qilingan partiyadan keyin davom ettiriladi, qatorlar qayta yuklanmaydi.
+    """
+
+    def __init__(self, path, fmt=None, batch_size=1000, workers=None, checkpoint=None, log=None):
+        self.path = path
+        self.format = fmt or detect_format(path)
+        self.batch_size = batch_size
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.checkpoint = checkpoint
+        self.log = log or (lambda message: None)
+        self.rules = validation_rules()
+        self.stats = {"imported": 0, "failed": 0}
+        # Checkpoint'dan tiklangan (oldingi ishga tegishli) yozuvlar soni
+        self.resumed = 0
+        self.errors = []
+
+    def read_checkpoint(self):
+        if not self.checkpoint:
+            return 0
+        state = ImportCheckpoint.objects.filter(name=self.checkpoint).first()
+        if state is None:
+            return 0
+        if state.source != os.path.abspath(self.path):
+            raise ValueError(f"Checkpoint {self.checkpoint} belongs to {state.source}")
+        self.stats.update(state.stats)
+        self.resumed = self.stats["imported"]
+        return state.line
+
+    def write_checkpoint(self, line, stats):
+        """Partiya tranzaksiyasi ichida chaqiriladi"""
+        if not self.checkpoint:
+            return
+        ImportCheckpoint.objects.update_or_create(
+            name=self.checkpoint,
+            defaults={"source": os.path.abspath(self.path), "line": line, "stats": stats},
+        )
+
+    def run(self):
+        self.skip = skip = self.read_checkpoint()
+        if skip:
+            self.log(f"Resuming after line {skip}")
+        self.authors, self.categories = load_natural_keys()
+
+        rows = read_rows(self.path, self.format, skip=skip)
+        pool = None
+        if self.workers > 1:
+            # Fork qilingan ishchilar ota jarayon ulanishini meros qilib olmasligi uchun
+            connections.close_all()
+            pool = multiprocessing.get_context("fork").Pool(self.workers)
+        try:
+            validated = self.validate(pool, rows)
+            self.import_batches(validated)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        if self.checkpoint:
+            ImportCheckpoint.objects.filter(name=self.checkpoint).delete()
+        return self.stats
+
+    def validate(self, pool, rows):
+        items = ((number, raw) for number, raw in rows)
+        if pool is None:
+            return (validate_row(item, self.rules) for item in items)
+        return pool.imap(
+            functools.partial(validate_row, rules=self.rules), items, chunksize=max(1, self.batch_size // self.workers)
+        )
+
+    def import_batches(self, validated):
+        started = time.perf_counter()
+        batch = []
+        last_line = 0
+        for number, fields, error in validated:
+            last_line = number
+            if error:
+                self.record_error(number, error)
+            else:
+                batch.append((number, fields))
+            if len(batch) >= self.batch_size:
+                self.write_batch(batch, last_line, started)
+                batch = []
+        self.write_batch(batch, last_line, started)
+
+    def record_error(self, number, error):
+        self.stats["failed"] += 1
+        self.errors.append((number, error))
+
+    def build_recipes(self, batch):
+        recipes = []
+        for number, fields in batch:
+            fields = dict(fields)
+            author_id = self.authors.get(fields.pop("author"))
+            category_id = self.categories.get(fields.pop("category"))
+            if author_id is None:
+                self.record_error(number, "author not found")
+            elif category_id is None:
+                self.record_error(number, "category not found")
+            else:
+                recipes.append(Recipe(author_id=author_id, category_id=category_id, **fields))
+        return recipes
+
+    def write_batch(self, batch, last_line, started):
+        recipes = self.build_recipes(batch)
+        default_title = build_localized_fieldname("title", self.rules["default_language"])
+        attempted = set()
+        stats = dict(self.stats, imported=self.stats["imported"] + len(recipes))
+        for attempt in range(SLUG_RETRIES):
+            # Oldingi urinish sluglari qayta berilmaydi - to'qnashuv hali commit
+            # qilinmagan (so'rovda ko'rinmaydigan) yozuv bilan bo'lsa ham
+            slugs = allocate_slugs(
+                [getattr(recipe, default_title) for recipe in recipes], reserved=attempted
+            )
+            attempted.update(slugs)
+            for recipe, slug in zip(recipes, slugs, strict=True):
+                recipe.slug = slug
+            try:
+                with transaction.atomic():
+                    if recipes:
+                        Recipe.objects.bulk_create(recipes)
+                        # bulk_create signal yubormaydi - qidiruv va ingredient indekslari shu yerda
+                        update_search_vectors([recipe.pk for recipe in recipes])
+                        sync_recipe_ingredients([recipe.pk for recipe in recipes])
+                        bump_namespaces_on_commit("recipes", "categories")
+                    # Checkpoint partiya bilan birga commit qilinadi
+                    self.write_checkpoint(last_line, stats)
+                break
+            except IntegrityError as e:
+                # Parallel yaratilgan retsept slugni egallagan - qayta ajratamiz
+                if not is_slug_conflict(e) or attempt == SLUG_RETRIES - 1:
+                    raise
+
+        self.stats = stats
+        elapsed = time.perf_counter() - started
+        processed = last_line - self.skip
+        self.log(
+            f"Line {last_line}: {self.stats['imported']} imported, "
+            f"{self.stats['failed']} failed ({processed / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+
@@ -0,0 +1,285 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Value
+from django.db.models.functions import Cast, Greatest
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Ingredient, Recipe, RecipeIngredient
+
+NAME_MAX_LENGTH = Ingredient._meta.get_field("name").max_length
+QUANTITY_MAX = Decimal("999999.99")
+
+# Kanonik birlik -> matndagi ko'rinishlari (en/uz/ru)
+UNIT_ALIASES = {
+    "g": ("g", "gr", "gram", "grams", "gramm", "г", "гр", "грамм"),
+    "kg": ("kg", "kilo", "kilogram", "kilograms", "кг"),
+    "ml": ("ml", "milliliter", "millilitre", "мл"),
+    "l": ("l", "liter", "litre", "liters", "litres", "litr", "л"),
+    "tbsp": ("tbsp", "tablespoon", "tablespoons", "osh qoshiq", "ст. л.", "ст.л.", "ст.л"),
+    "tsp": ("tsp", "teaspoon", "teaspoons", "choy qoshiq", "ч. л.", "ч.л.", "ч.л"),
+    "cup": ("cup", "cups", "stakan", "piyola", "стакан", "стакана"),
+    "pcs": ("pc", "pcs", "piece", "pieces", "dona", "ta", "шт.", "шт"),
+    "clove": ("clove", "cloves", "зубчик", "зубчика"),
+    "pinch": ("pinch", "chimdim", "щепотка"),
+}
+UNITS = sorted(
+    ((alias, unit) for unit, aliases in UNIT_ALIASES.items() for alias in aliases),
+    key=lambda item: -len(item[0]),
+)
+FRACTIONS = {"½": "0.5", "⅓": "0.33", "⅔": "0.67", "¼": "0.25", "¾": "0.75"}
+
+QUANTITY = r"(?P<quantity>\d+(?:[.,]\d+)?(?:\s+\d+/\d+)?|\d+/\d+|[½⅓⅔¼¾])(?:\s*-\s*\d+(?:[.,]\d+)?)?"
+LEADING_QUANTITY = re.compile(rf"^{QUANTITY}\s*(?P<rest>.*)$")
+TRAILING_QUANTITY = re.compile(rf"^(?P<rest>.*?)[\s\-–—:,]+{QUANTITY}\s*(?P<unit>.*)$")
+BULLET = re.compile(r"^[\-*•·–—]+\s*")
+PARENTHESES = re.compile(r"\([^)]*\)")
+NON_NAME_CHARS = re.compile(r"[^\w\s'\-]")
+SPACES = re.compile(r"\s+")
+
+
+def singularize(word):
+    """Lotin yozuvidagi ko'plik qo'shimchasini olib tashlash (eggs -> egg)"""
+    if len(word) <= 3 or not word.isascii():
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_ingredient_name(text):
+    """Lug'at kaliti: kichik harf, izohsiz, birlik shaklida"""
+    text = PARENTHESES.sub(" ", text.lower().replace("’", "'").replace("`", "'"))
+    # "onion, chopped" -> "onion"
+    text = text.split(",")[0]
+    text = SPACES.sub(" ", NON_NAME_CHARS.sub(" ", text)).strip(" -'")
+    if not text:
+        return ""
+    words = text.split(" ")
+    words[-1] = singularize(words[-1])
+    return " ".join(words)[:NAME_MAX_LENGTH]
+
+
+def parse_quantity(text):
+    text = FRACTIONS.get(text, text).replace(",", ".")
+    try:
+        if " " in text:
+            whole, fraction = text.split()
+            numerator, denominator = fraction.split("/")
+            value = Decimal(whole) + Decimal(numerator) / Decimal(denominator)
+        elif "/" in text:
+            numerator, denominator = text.split("/")
+            value = Decimal(numerator) / Decimal(denominator)
+        else:
+            value = Decimal(text)
+    except (InvalidOperation, ZeroDivisionError, ValueError):
+        return None
+    if value > QUANTITY_MAX:
+        return None
+    return value.quantize(Decimal("0.01"))
+
+
+def match_unit(text):
+    """Matn boshidagi birlik: ``(kanonik birlik, qolgan matn)``"""
+    for alias, unit in UNITS:
+        if text.startswith(alias):
+            rest = text[len(alias):]
+            if not rest or not rest[0].isalnum():
+                return unit, rest.strip(" .")
+    return "", text
+
+
+def parse_ingredient_line(line):
+    """Bitta qatordan ``(nom, miqdor, birlik)``; "200 g rice", "rice - 200 g", "tuxum 3 ta".
+
+    Nom topilmasa None qaytariladi.
+    """
+    text = BULLET.sub("", line.strip().lower())
+    quantity, unit = None, ""
+
+    match = LEADING_QUANTITY.match(text)
+    if match:
+        quantity = parse_quantity(match["quantity"])
+        unit, text = match_unit(match["rest"])
+        text = text.removeprefix("of ")
+    else:
+        match = TRAILING_QUANTITY.match(text)
+        if match:
+            trailing_unit, rest = match_unit(match["unit"].strip())
+            if not rest:
+                text = match["rest"]
+                quantity = parse_quantity(match["quantity"])
+                unit = trailing_unit
+
+    name = normalize_ingredient_name(text)
+    if not name:
+        return None
+    return name, quantity, unit
+
+
+def parse_ingredients(text):
+    """Ingredientlar matnidan ``(pozitsiya, nom, miqdor, birlik)`` ro'yxati (nomlar takrorlanmaydi)"""
+    parsed = []
+    seen = set()
+    lines = [line for line in (text or "").splitlines() if line.strip()]
+    for position, line in enumerate(lines):
+        result = parse_ingredient_line(line)
+        if result is None or result[0] in seen:
+            continue
+        seen.add(result[0])
+        parsed.append((position, *result))
+    return parsed
+
+
+def ingredient_source_fields():
+    return [f"ingredients_{code}" for code, _ in settings.LANGUAGES]
+
+
+def sync_recipe_ingredients(recipe_ids):
+    """Berilgan retseptlar ingredientlarini matndan qayta tuzish.
+
+    Barcha tarjimalar bitta lug'atga yoziladi; qator pozitsiyasi saqlanadi,
+    shuning uchun "egg" va "tuxum" bir ingredient sifatida sanaladi.
+    ``ingredient_count`` ham shu yozilgan pozitsiyalar soni - ``cook_with``
+    mosliklarni aynan shu pozitsiyalar bo'yicha sanaydi (faqat uz tilida
+    yozilgan retsept ham to'g'ri sanaladi).
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return 0
+
+    parsed = {}
+    counts = {}
+    for row in Recipe.objects.filter(pk__in=recipe_ids).values("pk", *ingredient_source_fields()):
+        entries = {}
+        for field in ingredient_source_fields():
+            for position, name, quantity, unit in parse_ingredients(row[field]):
+                entries.setdefault(name, (position, quantity, unit))
+        parsed[row["pk"]] = entries
+        counts[row["pk"]] = len({position for position, _, _ in entries.values()})
+
+    names = {name for entries in parsed.values() for name in entries}
+    with transaction.atomic():
+        Ingredient.objects.bulk_create(
+            [Ingredient(name=name) for name in names], ignore_conflicts=True
+        )
+        vocabulary = dict(
+            Ingredient.objects.filter(name__in=names).values_list("name", "pk")
+        )
+        RecipeIngredient.objects.filter(recipe_id__in=parsed).delete()
+        RecipeIngredient.objects.bulk_create(
+            [
+                RecipeIngredient(
+                    recipe_id=recipe_id,
+                    ingredient_id=vocabulary[name],
+                    position=position,
+                    quantity=quantity,
+                    unit=unit,
+                )
+                for recipe_id, entries in parsed.items()
+                for name, (position, quantity, unit) in entries.items()
+            ]
+        )
+        for count in set(counts.values()):
+            Recipe.objects.filter(
+                pk__in=[pk for pk, value in counts.items() if value == count]
+            ).update(ingredient_count=count)
+    return len(parsed)
+
+
+def cook_with(queryset, names, missing_max=None):
+    """Berilgan ingredientlardan kamida bittasi bor retseptlar.
+
+    Retseptlar tor ``(ingredient, recipe, position)`` indeksi orqali
+    ``recipe_ingredients`` bilan JOIN qilinadi va mos kelgan pozitsiyalar
+    bitta ``GROUP BY`` da sanaladi - ``missing_ingredients`` har bir retsept
+    uchun alohida (korrelyatsiyalangan) so'rov bilan hisoblanmaydi, shuning
+    uchun u bo'yicha saralash ham bitta o'tishda bajariladi. Har bir
+    ingredient retseptda ko'pi bilan bir marta sanalgani uchun
+    ``ingredient_count <= len(names) + missing_max`` sharti nomzodlarni
+    ``ingredient_count`` indeksi bilan oldindan qisqartiradi.
+    """
+    names = {normalize_ingredient_name(name) for name in names} - {""}
+    # filter() annotate()dan oldin - Count aynan shu JOIN'dagi mosliklarni sanaydi
+    queryset = queryset.filter(
+        recipe_ingredients__ingredient__in=Ingredient.objects.filter(name__in=names).values("pk")
+    )
+    if missing_max is not None:
+        queryset = queryset.filter(ingredient_count__lte=len(names) + missing_max)
+    queryset = queryset.annotate(
+        missing_ingredients=Greatest(
+            Cast(F("ingredient_count"), IntegerField())
+            - Count("recipe_ingredients__position", distinct=True),
+            Value(0),
+        )
+    )
+    if missing_max is not None:
+        queryset = queryset.filter(missing_ingredients__lte=missing_max)
+    return queryset
+
+
+class RecipeIngredientFilter(BaseFilterBackend):
+    """``?have=tuxum,guruch,piyoz`` - bor ingredientlardan tayyorlanadigan retseptlar.
+
+    ``?missing_max=2`` ko'pi bilan 2 ta ingredient yetishmaydigan retseptlarni
+    qoldiradi. ``ordering`` berilmasa, natijalar yetishmaydigan ingredientlar
+    soni bo'yicha saralanadi.
+    """
+
+    have_param = "have"
+    missing_param = "missing_max"
+
+    def filter_queryset(self, request, queryset, view):
+        names = [
+            name.strip()
+            for name in request.query_params.get(self.have_param, "").split(",")
+            if name.strip()
+        ]
+        if not names:
+            return queryset
+        if len(names) > settings.INGREDIENT_FILTER_MAX_ITEMS:
+            raise ValidationError(
+                {
+                    self.have_param: f"At most {settings.INGREDIENT_FILTER_MAX_ITEMS} "
+                    "ingredients are allowed."
+                }
+            )
+
+        missing_max = request.query_params.get(self.missing_param)
+        if missing_max is not None:
+            if not missing_max.isdigit():
+                raise ValidationError({self.missing_param: "A non-negative integer is required."})
+            missing_max = int(missing_max)
+
+        queryset = cook_with(queryset, names, missing_max)
+        if not request.query_params.get("ordering"):
+            # Teng yetishmovchilikda ko'proq mos kelgan (ya'ni kattaroq) retsept oldin
+            queryset = queryset.order_by(
+                "missing_ingredients", "-ingredient_count", "-created_at"
+            )
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.have_param,
+                "required": False,
+                "in": "query",
+                "description": "Comma-separated ingredients you have",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.missing_param,
+                "required": False,
+                "in": "query",
+                "description": "Maximum number of missing ingredients",
+                "schema": {"type": "integer", "minimum": 0},
+            },
+        ]
@@ -0,0 +1,256 @@
+import json
+import logging
+import statistics
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from dishes.models import Comment, Recipe
+
+logger = logging.getLogger("dishes")
+
+User = get_user_model()
+
+# (url nomi, metod, url kwargs, so'rov tanasi); yozuvchi so'rovlar rollback qilinadi
+ENDPOINTS = [
+    ("dishes:recipe_list_create", "GET", {}, None),
+    ("dishes:recipe_list_create", "POST", {}, "recipe"),
+    ("dishes:featured_recipes", "GET", {}, None),
+    ("dishes:popular_recipes", "GET", {}, None),
+    ("dishes:recipe_detail", "GET", {"slug": "recipe_slug"}, None),
+    ("dishes:recipe_ratings", "GET", {"recipe_id": "recipe_id"}, None),
+    ("dishes:recipe_ratings", "POST", {"recipe_id": "recipe_id"}, "rating"),
+    ("dishes:bulk_ratings", "POST", {}, "bulk_ratings"),
+    ("dishes:delete_rating", "DELETE", {"recipe_id": "recipe_id"}, None),
+    ("dishes:recipe_comments", "GET", {"recipe_id": "recipe_id"}, None),
+    ("dishes:recipe_comments", "POST", {"recipe_id": "recipe_id"}, "comment"),
+    ("dishes:comment_detail", "GET", {"pk": "comment_id"}, None),
+    ("dishes:comment_replies", "GET", {"pk": "comment_id"}, None),
+    ("categories:category_list_create", "GET", {}, None),
+    ("categories:category_detail", "GET", {"pk": "category_id"}, None),
+    ("categories:category_recipes", "GET", {"pk": "category_id"}, None),
+    ("categories:popular_categories", "GET", {}, None),
+    ("users:login", "POST", {}, "login"),
+    ("users:token_refresh", "POST", {}, "refresh"),
+    ("users:profile", "GET", {}, None),
+    ("users:user-recipes", "GET", {}, None),
+    ("users:user-stats", "GET", {}, None),
+]
+
+# Benchmark qilinmaydigan endpointlar va sababi
+SKIPPED = {
+    "dishes:home": "shadowed by recipe_list_create",
+    "dishes:export_recipes": "streams the whole recipe table",
+    "users:register": "sends a verification email",
+    "users:confirmation-email": "needs an emailed verification code",
+    "users:change-password": "invalidates the benchmark user's password",
+}
+
+URLCONFS = ("dishes.urls", "categories.urls", "users.urls")
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = "Measure latency and SQL query counts for every API endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Measured requests per endpoint (default: 20)",
+        )
+        parser.add_argument("--user", help="Email of the user to benchmark as")
+        parser.add_argument(
+            "--password",
+            default="password123",
+            help="Password of the benchmark user, used by the login endpoint",
+        )
+        parser.add_argument(
+            "--anonymous",
+            action="store_true",
+            help="Send read requests without authentication (exercises response caches)",
+        )
+        parser.add_argument("--only", help="Only run endpoints whose name contains this text")
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument("--baseline", help="Compare against a JSON file written by --output")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed p50 latency growth against the baseline (default: 0.25)",
+        )
+
+    def handle(self, *args, **options):
+        context = self.get_context(options)
+        self.report_coverage()
+
+        results = {}
+        for name, method, kwargs, body in ENDPOINTS:
+            if options["only"] and options["only"] not in name:
+                continue
+            key = f"{method} {name}"
+            results[key] = self.measure(
+                context,
+                method,
+                reverse(name, kwargs={arg: context[value] for arg, value in kwargs.items()}),
+                context["bodies"].get(body),
+                options,
+            )
+            self.write_result(key, results[key])
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        regressions = self.compare(results, options) if options["baseline"] else []
+        if regressions:
+            for message in regressions:
+                self.stdout.write(self.style.ERROR(f"  - {message}"))
+            raise CommandError(f"{len(regressions)} regressions against the baseline")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully benchmarked {len(results)} endpoints")
+        )
+        logger.info(f"Benchmarked {len(results)} API endpoints")
+
+    def get_context(self, options):
+        recipe = (
+            Recipe.objects.filter(is_draft=False)
+            .order_by("-rating_count", "-created_at")
+            .first()
+        )
+        if recipe is None:
+            raise CommandError("No published recipes found - run seed_data first")
+        user = recipe.author
+        if options["user"]:
+            user = User.objects.filter(email=options["user"]).first()
+            if user is None:
+                raise CommandError(f"User {options['user']} not found")
+
+        # comment_detail faqat muallifga ruxsat beradi
+        roots = Comment.objects.filter(parent=None, is_active=True).order_by("-created_at")
+        comment = roots.filter(user=user).first() or roots.first()
+        if comment is None:
+            raise CommandError("No comments found - run seed_data first")
+
+        return {
+            "user": user,
+            "recipe_id": recipe.pk,
+            "recipe_slug": recipe.slug,
+            "comment_id": comment.pk,
+            "category_id": recipe.category_id,
+            "bodies": {
+                "recipe": {
+                    "title": "Benchmark recipe",
+                    "description": "Benchmark",
+                    "ingredients": "rice\ncarrot",
+                    "instructions": "Cook.",
+                    "category": recipe.category_id,
+                },
+                "rating": {"rating": 4, "review": "Benchmark"},
+                "bulk_ratings": {
+                    "ratings": [
+                        {"recipe": str(pk), "rating": 5}
+                        for pk in Recipe.objects.order_by("-created_at").values_list(
+                            "pk", flat=True
+                        )[:50]
+                    ]
+                },
+                "comment": {"content": "Benchmark comment"},
+                "login": {"email": user.email, "password": options["password"]},
+                "refresh": {"refresh": str(RefreshToken.for_user(user))},
+            },
+        }
+
+    def measure(self, context, method, url, body, options):
+        # Har bir endpoint o'nlab marta chaqiriladi - rate limitlar o'chiriladi
+        rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            return self.measure_requests(context, method, url, body, options)
+
+    def measure_requests(self, context, method, url, body, options):
+        client = APIClient()
+        if method != "GET" or not options["anonymous"]:
+            client.force_authenticate(context["user"])
+
+        timings, queries, status_codes = [], [], set()
+        # Birinchi so'rov (isitish) natijaga kirmaydi
+        for iteration in range(options["iterations"] + 1):
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = getattr(client, method.lower())(url, body, format="json")
+                    elapsed = time.perf_counter() - started
+                # Yozuvchi so'rovlar bazani o'zgartirmasligi uchun
+                transaction.set_rollback(True)
+            if iteration:
+                timings.append(elapsed * 1000)
+                queries.append(len(captured.captured_queries))
+                status_codes.add(response.status_code)
+
+        return {
+            "url": url,
+            "status": sorted(status_codes),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "max_ms": round(max(timings), 2),
+            "queries": max(queries),
+        }
+
+    def write_result(self, key, result):
+        status = ",".join(str(code) for code in result["status"])
+        line = (
+            f"{key:<45} {status:>7} p50 {result['p50_ms']:>8.2f}ms "
+            f"p95 {result['p95_ms']:>8.2f}ms max {result['max_ms']:>8.2f}ms "
+            f"queries {result['queries']:>3}"
+        )
+        if any(code >= 400 for code in result["status"]):
+            line = self.style.WARNING(line)
+        self.stdout.write(line)
+
+    def report_coverage(self):
+        """URL'lardan benchmark qilinmaganlarini ko'rsatish"""
+        covered = {name for name, *_ in ENDPOINTS}
+        for urlconf in URLCONFS:
+            module = import_module(urlconf)
+            for pattern in module.urlpatterns:
+                name = f"{module.app_name}:{pattern.name}"
+                if name in covered:
+                    continue
+                reason = SKIPPED.get(name, "not benchmarked")
+                self.stdout.write(self.style.WARNING(f"Skipping {name}: {reason}"))
+
+    def compare(self, results, options):
+        with open(options["baseline"]) as f:
+            baseline = json.load(f)
+
+        regressions = []
+        for key, result in results.items():
+            previous = baseline.get(key)
+            if previous is None:
+                continue
+            if result["queries"] > previous["queries"]:
+                regressions.append(
+                    f"{key}: {previous['queries']} -> {result['queries']} queries"
+                )
+            limit = previous["p50_ms"] * (1 + options["threshold"])
+            if result["p50_ms"] > limit:
+                regressions.append(
+                    f"{key}: p50 {previous['p50_ms']}ms -> {result['p50_ms']}ms"
+                )
+        return regressions
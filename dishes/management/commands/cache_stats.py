@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from core.cache import CachedResponseMixin, get_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Display response cache hit/miss counters for cached API views"
+
+    def handle(self, *args, **options):
+        # URLconf'ni yuklash view modullarini import qiladi - keshlangan view'lar ro'yxatga olinadi
+        _ = get_resolver().url_patterns
+        names = sorted(CachedResponseMixin.registry)
+        stats = get_cache_stats(names)
+
+        self.stdout.write(self.style.SUCCESS("=== RESPONSE CACHE ==="))
+        for name in names:
+            hits = stats[name]["hit"]
+            misses = stats[name]["miss"]
+            total = hits + misses
+            ratio = hits / total * 100 if total else 0
+            self.stdout.write(f"{name}: {hits} hits, {misses} misses ({ratio:.1f}% hit rate)")
@@ -0,0 +1,81 @@
+import logging
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dishes.exporting import (
+    EXPORT_CHUNK_SIZE,
+    filter_export_queryset,
+    iter_gzip,
+    iter_ndjson,
+    parse_filters,
+)
+
+logger = logging.getLogger("dishes")
+
+
+class Command(BaseCommand):
+    help = "Stream all recipes with translations, author, category and ratings as NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="File to write to, '-' for stdout (default: -)",
+        )
+        parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"Rows fetched per server-side cursor round trip (default: {EXPORT_CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="RecipeFilter parameter, e.g. --filter difficulty=easy (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+        try:
+            params = parse_filters(options["filter"])
+        except ValueError as e:
+            raise CommandError(str(e)) from None
+
+        queryset, errors = filter_export_queryset(params)
+        if errors:
+            raise CommandError(f"Invalid filters: {errors.as_json()}")
+
+        chunks = iter_ndjson(queryset, chunk_size=options["chunk_size"])
+        if options["gzip"]:
+            chunks = iter_gzip(chunks)
+
+        started = time.perf_counter()
+        size = 0
+        if options["output"] == "-":
+            stream = sys.stdout.buffer
+        else:
+            stream = open(options["output"], "wb")
+        try:
+            for chunk in chunks:
+                stream.write(chunk)
+                size += len(chunk)
+        finally:
+            if stream is not sys.stdout.buffer:
+                stream.close()
+            else:
+                stream.flush()
+        elapsed = time.perf_counter() - started
+
+        # stdout eksportga band - xabar stderr'ga yoziladi
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Successfully exported {size / 1024 / 1024:.1f} MB in {elapsed:.1f}s"
+            )
+        )
+        logger.info(f"Exported recipes ({size} bytes) to {options['output']}")
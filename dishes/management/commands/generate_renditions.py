@@ -0,0 +1,55 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from dishes.models import Recipe
+from dishes.tasks import generate_recipe_thumbnails
+from users.tasks import generate_profile_picture_renditions
+
+logger = logging.getLogger("dishes")
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Generate responsive image renditions for recipe images and profile pictures"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only process images that have no renditions yet",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="run_async",
+            help="Queue Celery tasks instead of processing images in this process",
+        )
+
+    def handle(self, *args, **options):
+        targets = (
+            (Recipe.objects.all(), "image", generate_recipe_thumbnails),
+            (User.objects.all(), "profile_picture", generate_profile_picture_renditions),
+        )
+        total = 0
+        for queryset, field_name, task in targets:
+            queryset = queryset.exclude(**{field_name: ""}).exclude(
+                **{f"{field_name}__isnull": True}
+            )
+            if options["missing_only"]:
+                queryset = queryset.filter(**{f"{field_name}_renditions": {}})
+
+            for pk in queryset.order_by("pk").values_list("pk", flat=True).iterator():
+                if options["run_async"]:
+                    task.delay(str(pk))
+                else:
+                    task(str(pk))
+                total += 1
+            self.stdout.write(f"  - Processed {total} images")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully processed renditions for {total} images")
+        )
+        logger.info(f"Generated image renditions for {total} images")
@@ -0,0 +1,85 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dishes.importing import RecipeImporter
+
+logger = logging.getLogger("dishes")
+
+
+class Command(BaseCommand):
+    help = "Bulk-import recipes from an NDJSON or CSV file (optionally gzipped)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON (.ndjson/.jsonl) or CSV file, may end in .gz")
+        parser.add_argument(
+            "--format",
+            choices=["ndjson", "csv"],
+            help="Input format (default: detected from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Recipes written per bulk_create batch and transaction (default: 1000)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Processes used to validate rows (default: CPU count, 1 disables the pool)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "Checkpoint name stored in the database (default: <path>.checkpoint); "
+                "an existing one resumes the import"
+            ),
+        )
+        parser.add_argument(
+            "--no-checkpoint",
+            action="store_true",
+            help="Do not write or resume from a checkpoint",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        if options["workers"] is not None and options["workers"] < 1:
+            raise CommandError("--workers must be positive")
+
+        checkpoint = None
+        if not options["no_checkpoint"]:
+            checkpoint = options["checkpoint"] or f"{options['path']}.checkpoint"
+
+        try:
+            importer = RecipeImporter(
+                options["path"],
+                fmt=options["format"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                checkpoint=checkpoint,
+                log=lambda message: self.stdout.write(f"  - {message}"),
+            )
+            started = time.perf_counter()
+            stats = importer.run()
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e)) from None
+        elapsed = time.perf_counter() - started
+
+        for number, error in importer.errors[: 20 if options["verbosity"] < 2 else None]:
+            self.stdout.write(self.style.WARNING(f"Line {number}: {error}"))
+        if options["verbosity"] < 2 and len(importer.errors) > 20:
+            self.stdout.write(f"... {len(importer.errors) - 20} more errors (use -v 2)")
+
+        rate = (stats["imported"] - importer.resumed) / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully imported {stats['imported']} recipes "
+                f"({stats['failed']} failed) in {elapsed:.1f}s, {rate:.0f} rows/s"
+            )
+        )
+        logger.info(
+            f"Imported {stats['imported']} recipes from {options['path']} "
+            f"({stats['failed']} failed)"
+        )
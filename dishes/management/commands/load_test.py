@@ -0,0 +1,164 @@
+import http.client
+import json
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from dishes.models import Recipe
+
+from .benchmark_api import percentile
+
+logger = logging.getLogger("dishes")
+
+# ASGI/WSGI taqqoslash uchun o'qish endpointlari (url nomi, url kwargs)
+ENDPOINTS = [
+    ("dishes:recipe_list_create", {}),
+    ("dishes:featured_recipes", {}),
+    ("dishes:popular_recipes", {}),
+    ("dishes:recipe_detail", {"slug": "recipe_slug"}),
+    ("categories:category_recipes", {"pk": "category_id"}),
+]
+
+
+class Command(BaseCommand):
+    help = "Send concurrent anonymous GET requests to a running server and report throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://127.0.0.1:8000",
+            help="Server to load (default: http://127.0.0.1:8000)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Concurrent keep-alive connections (default: 32)",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10,
+            help="Seconds to run (default: 10)",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            default=[],
+            help="Path to request instead of the default read endpoints (repeatable)",
+        )
+        parser.add_argument("--output", help="Write results as JSON to this file")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1")
+        if options["duration"] <= 0:
+            raise CommandError("--duration must be positive")
+
+        url = urlsplit(options["base_url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("--base-url must be an http:// URL")
+        paths = options["path"] or self.default_paths()
+
+        timings, statuses, errors, elapsed = self.run_load(
+            url, paths, options["concurrency"], options["duration"]
+        )
+        if not timings:
+            raise CommandError(f"No successful requests ({len(errors)} errors)")
+
+        result = {
+            "base_url": options["base_url"],
+            "concurrency": options["concurrency"],
+            "paths": paths,
+            "requests": len(timings),
+            "errors": len(errors),
+            "status": {str(status): count for status, count in sorted(statuses.items())},
+            "requests_per_second": round(len(timings) / elapsed, 1),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+        }
+        self.write_result(result)
+        for message in errors[:5]:
+            self.stdout.write(self.style.WARNING(f"  - {message}"))
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(result, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully sent {len(timings)} requests to {options['base_url']}")
+        )
+        logger.info(
+            f"Load test against {options['base_url']}: {result['requests_per_second']} req/s "
+            f"at concurrency {options['concurrency']}"
+        )
+
+    def run_load(self, url, paths, concurrency, duration):
+        """``concurrency`` ta keep-alive ulanishdan ``duration`` soniya davomida GET so'rovlar.
+
+        Qaytaradi: ``(vaqtlar_ms, {status: soni}, xatolar, o'tgan_vaqt)``.
+        """
+        deadline = time.perf_counter() + duration
+        lock = threading.Lock()
+        timings, statuses, errors = [], {}, []
+
+        def worker(index):
+            connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+            local_timings = []
+            local_statuses = {}
+            request_number = index
+            while time.perf_counter() < deadline:
+                path = paths[request_number % len(paths)]
+                request_number += 1
+                started = time.perf_counter()
+                try:
+                    connection.request("GET", path, headers={"Accept": "application/json"})
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException) as e:
+                    connection.close()
+                    with lock:
+                        errors.append(f"{path}: {e!s}")
+                    continue
+                local_timings.append((time.perf_counter() - started) * 1000)
+                local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+            connection.close()
+            with lock:
+                timings.extend(local_timings)
+                for status, count in local_statuses.items():
+                    statuses[status] = statuses.get(status, 0) + count
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, range(concurrency)))
+        return timings, statuses, errors, time.perf_counter() - started
+
+    def default_paths(self):
+        recipe = (
+            Recipe.objects.filter(is_draft=False)
+            .order_by("-rating_count", "-created_at")
+            .first()
+        )
+        if recipe is None:
+            raise CommandError("No published recipes found - run seed_data first")
+        context = {"recipe_slug": recipe.slug, "category_id": recipe.category_id}
+        return [
+            reverse(name, kwargs={arg: context[value] for arg, value in kwargs.items()})
+            for name, kwargs in ENDPOINTS
+        ]
+
+    def write_result(self, result):
+        status = ", ".join(f"{code}: {count}" for code, count in result["status"].items())
+        self.stdout.write(
+            f"{result['requests']} requests ({status}), {result['errors']} errors\n"
+            f"{result['requests_per_second']:.1f} req/s  p50 {result['p50_ms']:.2f}ms  "
+            f"p95 {result['p95_ms']:.2f}ms  p99 {result['p99_ms']:.2f}ms"
+        )
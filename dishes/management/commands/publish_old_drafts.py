@@ -1,10 +1,9 @@
 import logging
-from datetime import timedelta
+import time
 
-from django.core.management.base import BaseCommand
-from django.utils import timezone
+from django.core.management.base import BaseCommand, CommandError
 
-from dishes.models import Recipe
+from dishes.publishing import iter_old_drafts, old_drafts_cutoff, publish_old_drafts
 
 logger = logging.getLogger("dishes")
 
@@ -24,18 +23,48 @@ class Command(BaseCommand):
             action="store_true",
             help="Show what would be published without actually publishing",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of recipes published per transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--max-rows",
+            type=int,
+            help="Stop after publishing this many recipes (default: no limit)",
+        )
 
     def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+        if options["max_rows"] is not None and options["max_rows"] < 1:
+            raise CommandError("--max-rows must be positive")
+
         days = options["days"]
         dry_run = options["dry_run"]
+        cutoff_date = old_drafts_cutoff(days)
 
-        # Calculate the cutoff date
-        cutoff_date = timezone.now() - timedelta(days=days)
-
-        # Find old draft recipes
-        old_drafts = Recipe.objects.filter(is_draft=True, created_at__lt=cutoff_date)
+        if dry_run:
+            chunks = iter_old_drafts(cutoff_date, options["chunk_size"], options["max_rows"])
+        else:
+            chunks = publish_old_drafts(
+                cutoff_date, options["chunk_size"], options["max_rows"]
+            )
 
-        count = old_drafts.count()
+        count = 0
+        started = time.perf_counter()
+        for rows in chunks:
+            count += len(rows)
+            elapsed = time.perf_counter() - started
+            # Har bir sarlavha faqat -v 2 bilan chiqariladi (katta hajmlar uchun)
+            if options["verbosity"] >= 2:
+                for row in rows:
+                    self.stdout.write(f"  - {row['title']} (created: {row['created_at']})")
+            self.stdout.write(
+                f"{'Found' if dry_run else 'Published'} {count} recipes "
+                f"({count / elapsed if elapsed else 0:.0f} rows/s)"
+            )
 
         if dry_run:
             self.stdout.write(
@@ -43,22 +72,12 @@ class Command(BaseCommand):
                     f"DRY RUN: Would publish {count} draft recipes older than {days} days"
                 )
             )
-            for recipe in old_drafts:
-                self.stdout.write(f"  - {recipe.title} (created: {recipe.created_at})")
+        elif count > 0:
+            self.stdout.write(
+                self.style.SUCCESS(f"Successfully published {count} draft recipes")
+            )
+            logger.info(f"Published {count} old draft recipes")
         else:
-            if count > 0:
-                # Update the recipes
-                old_drafts.update(is_draft=False)
-
-                self.stdout.write(
-                    self.style.SUCCESS(f"Successfully published {count} draft recipes")
-                )
-                logger.info(f"Published {count} old draft recipes")
-
-                # List published recipes
-                for recipe in old_drafts:
-                    self.stdout.write(f"  - Published: {recipe.title}")
-            else:
-                self.stdout.write(
-                    self.style.WARNING(f"No draft recipes found older than {days} days")
-                )
+            self.stdout.write(
+                self.style.WARNING(f"No draft recipes found older than {days} days")
+            )
@@ -0,0 +1,48 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from dishes.models import Recipe
+from dishes.search import update_search_vectors
+
+logger = logging.getLogger("dishes")
+
+
+class Command(BaseCommand):
+    help = "Rebuild full-text search vectors for recipes in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of recipes updated per statement (default: 1000)",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only index recipes that have no search vector yet",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        queryset = Recipe.objects.order_by("pk")
+        if options["missing_only"]:
+            queryset = queryset.filter(search_vector_en__isnull=True)
+
+        total = 0
+        last_pk = None
+        while True:
+            chunk = queryset
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            ids = list(chunk.values_list("pk", flat=True)[:chunk_size])
+            if not ids:
+                break
+
+            total += update_search_vectors(ids)
+            last_pk = ids[-1]
+            self.stdout.write(f"  - Indexed {total} recipes")
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully indexed {total} recipes"))
+        logger.info(f"Rebuilt search vectors for {total} recipes")
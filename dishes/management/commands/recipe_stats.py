@@ -1,63 +1,88 @@
+import json
+
 from django.core.management.base import BaseCommand
-from django.db.models import Avg, Count
 
-from categories.models import Category
-from dishes.models import Rating, Recipe
-from users.models import User
+from dishes.stats import collect_stats, snapshot_trend, take_snapshot
 
 
 class Command(BaseCommand):
     help = "Display recipe statistics"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=("text", "json"),
+            default="text",
+            help="Output format (default: text)",
+        )
+        parser.add_argument(
+            "--snapshot",
+            action="store_true",
+            help="Also save today's totals as a StatsSnapshot row",
+        )
+        parser.add_argument(
+            "--trend",
+            type=int,
+            metavar="DAYS",
+            help="Show daily growth for the last DAYS days from saved snapshots",
+        )
+
     def handle(self, *args, **options):
-        # General stats
-        total_recipes = Recipe.objects.count()
-        published_recipes = Recipe.objects.filter(is_draft=False).count()
-        draft_recipes = Recipe.objects.filter(is_draft=True).count()
+        stats = collect_stats()
+        if options["snapshot"]:
+            stats["snapshot"] = str(take_snapshot().date)
+        if options["trend"]:
+            stats["trend"] = snapshot_trend(options["trend"])
+
+        if options["format"] == "json":
+            self.stdout.write(json.dumps(stats, indent=2, default=str))
+            return
+        self.write_text(stats)
 
+    def write_text(self, stats):
+        recipes = stats["recipes"]
         self.stdout.write(self.style.SUCCESS("=== RECIPE STATISTICS ==="))
-        self.stdout.write(f"Total recipes: {total_recipes}")
-        self.stdout.write(f"Published: {published_recipes}")
-        self.stdout.write(f"Drafts: {draft_recipes}")
+        self.stdout.write(f"Total recipes: {recipes['total']}")
+        self.stdout.write(f"Published: {recipes['published']}")
+        self.stdout.write(f"Drafts: {recipes['drafts']}")
+        self.stdout.write(f"Featured: {recipes['featured']}")
 
-        # Category stats
         self.stdout.write("\n=== CATEGORY STATISTICS ===")
-        categories_with_counts = Category.objects.annotate(
-            recipe_count=Count("recipe")
-        ).order_by("-recipe_count")
-
-        for category in categories_with_counts:
-            self.stdout.write(f"{category.name}: {category.recipe_count} recipes")
+        for category in stats["categories"]:
+            self.stdout.write(f"{category['name']}: {category['recipe_count']} recipes")
 
-        # User stats
+        users = stats["users"]
         self.stdout.write("\n=== USER STATISTICS ===")
-        total_users = User.objects.count()
-        chefs = User.objects.filter(is_chef=True).count()
-        confirmed_users = User.objects.filter(email_confirmed=True).count()
+        self.stdout.write(f"Total users: {users['total']}")
+        self.stdout.write(f"Chefs: {users['chefs']}")
+        self.stdout.write(f"Confirmed emails: {users['confirmed']}")
 
-        self.stdout.write(f"Total users: {total_users}")
-        self.stdout.write(f"Chefs: {chefs}")
-        self.stdout.write(f"Confirmed emails: {confirmed_users}")
-
-        # Rating stats
+        ratings = stats["ratings"]
         self.stdout.write("\n=== RATING STATISTICS ===")
-        total_ratings = Rating.objects.count()
-        avg_rating = Rating.objects.aggregate(avg=Avg("rating"))["avg"]
-
-        self.stdout.write(f"Total ratings: {total_ratings}")
-        self.stdout.write(f"Average rating: {avg_rating:.2f if avg_rating else 0}")
+        self.stdout.write(f"Total ratings: {ratings['total']}")
+        self.stdout.write(f"Average rating: {ratings['average']:.2f}")
+        self.stdout.write(f"Total comments: {stats['comments']['total']}")
 
-        # Top rated recipes
         self.stdout.write("\n=== TOP RATED RECIPES ===")
-        top_recipes = (
-            Recipe.objects.filter(is_draft=False)
-            .annotate(avg_rating=Avg("rating__rating"), rating_count=Count("rating"))
-            .filter(rating_count__gte=1)
-            .order_by("-avg_rating", "-rating_count")[:5]
-        )
-
-        for recipe in top_recipes:
+        for recipe in stats["top_recipes"]:
             self.stdout.write(
-                f"{recipe.title}: {recipe.avg_rating:.2f}/5 "
-                f"({recipe.rating_count} ratings)"
+                f"{recipe['title']}: {recipe['average_rating']:.2f}/5 "
+                f"({recipe['ratings_count']} ratings, score {recipe['popularity_score']:.2f})"
             )
+
+        if "trend" in stats:
+            self.stdout.write("\n=== DAILY TREND ===")
+            for row in stats["trend"]:
+                growth = {
+                    name: "n/a" if row[f"{name}_total_growth"] is None
+                    else f"{row[f'{name}_total_growth']:+d}"
+                    for name in ("recipes", "users", "ratings", "comments")
+                }
+                self.stdout.write(
+                    f"{row['date']}: {growth['recipes']} recipes, "
+                    f"{growth['users']} users, {growth['ratings']} ratings, "
+                    f"{growth['comments']} comments"
+                )
+
+        if "snapshot" in stats:
+            self.stdout.write(self.style.SUCCESS(f"\nSnapshot saved for {stats['snapshot']}"))
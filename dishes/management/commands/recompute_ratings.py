@@ -0,0 +1,50 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from dishes.models import Recipe
+from dishes.ratings import recompute_rating_aggregates
+
+logger = logging.getLogger("dishes")
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized rating aggregates on recipes in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of recipes recomputed per transaction (default: 1000)",
+        )
+        parser.add_argument(
+            "recipe_ids",
+            nargs="*",
+            help="Only recompute these recipes (default: all recipes)",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        queryset = Recipe.objects.order_by("pk")
+        if options["recipe_ids"]:
+            queryset = queryset.filter(pk__in=options["recipe_ids"])
+
+        total = 0
+        last_pk = None
+        while True:
+            chunk = queryset
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            ids = list(chunk.values_list("pk", flat=True)[:chunk_size])
+            if not ids:
+                break
+
+            total += recompute_rating_aggregates(ids)
+            last_pk = ids[-1]
+            self.stdout.write(f"  - Recomputed {total} recipes")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully recomputed ratings for {total} recipes")
+        )
+        logger.info(f"Recomputed rating aggregates for {total} recipes")
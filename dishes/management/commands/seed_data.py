@@ -0,0 +1,69 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dishes.seeding import DataSeeder
+
+logger = logging.getLogger("dishes")
+
+
+class Command(BaseCommand):
+    help = "Bulk-generate synthetic users, categories, recipes, ratings and comments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Users to create (default: 1000)")
+        parser.add_argument("--categories", type=int, default=20, help="Categories to create (default: 20)")
+        parser.add_argument("--recipes", type=int, default=10000, help="Recipes to create (default: 10000)")
+        parser.add_argument("--ratings", type=int, default=100000, help="Ratings to create (default: 100000)")
+        parser.add_argument("--comments", type=int, default=20000, help="Comments to create (default: 20000)")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Recipes written per COPY batch and transaction (default: 5000)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread creation dates over this many past days (default: 365)",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed for reproducible data")
+        parser.add_argument(
+            "--skip-search-index",
+            action="store_true",
+            help="Do not build full-text search vectors (run rebuild_search_index later)",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("users", "categories", "recipes", "ratings", "comments"):
+            if options[name] < 0:
+                raise CommandError(f"--{name} must not be negative")
+        if options["recipes"] and not (options["users"] and options["categories"]):
+            raise CommandError("Recipes need at least one user and one category")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        seeder = DataSeeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            days=options["days"],
+            search_index=not options["skip_search_index"],
+            log=lambda message: self.stdout.write(f"  - {message}"),
+        )
+        started = time.perf_counter()
+        stats = seeder.seed(
+            users=options["users"],
+            categories=options["categories"],
+            recipes=options["recipes"],
+            ratings=options["ratings"],
+            comments=options["comments"],
+        )
+        elapsed = time.perf_counter() - started
+
+        summary = ", ".join(f"{count} {name}" for name, count in stats.items())
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully seeded {summary} in {elapsed:.1f}s")
+        )
+        logger.info(f"Seeded synthetic data: {summary}")
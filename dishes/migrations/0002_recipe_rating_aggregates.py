@@ -0,0 +1,74 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='1-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='2-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='3-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='4-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='5-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Ratings count'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Ratings sum'),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE dishes_recipe AS r
+                SET rating_count = s.rating_count,
+                    rating_sum = s.rating_sum,
+                    rating_1_count = s.rating_1_count,
+                    rating_2_count = s.rating_2_count,
+                    rating_3_count = s.rating_3_count,
+                    rating_4_count = s.rating_4_count,
+                    rating_5_count = s.rating_5_count
+                FROM (
+                    SELECT recipe_id,
+                           COUNT(*) AS rating_count,
+                           SUM(rating) AS rating_sum,
+                           COUNT(*) FILTER (WHERE rating = 1) AS rating_1_count,
+                           COUNT(*) FILTER (WHERE rating = 2) AS rating_2_count,
+                           COUNT(*) FILTER (WHERE rating = 3) AS rating_3_count,
+                           COUNT(*) FILTER (WHERE rating = 4) AS rating_4_count,
+                           COUNT(*) FILTER (WHERE rating = 5) AS rating_5_count
+                    FROM dishes_rating
+                    GROUP BY recipe_id
+                ) AS s
+                WHERE r.id = s.recipe_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
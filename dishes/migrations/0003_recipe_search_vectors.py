@@ -0,0 +1,84 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:48
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Coalesce
+
+SEARCH_CONFIGS = {"en": "english", "uz": "simple", "ru": "russian"}
+SEARCH_WEIGHTS = (
+    ("title", "A"),
+    ("description", "B"),
+    ("ingredients", "C"),
+    ("instructions", "D"),
+)
+
+
+def build_search_vector(language):
+    vector = None
+    for field, weight in SEARCH_WEIGHTS:
+        source = Coalesce(
+            F(f"{field}_{language}"), F(f"{field}_en"), Value(""), output_field=TextField()
+        )
+        part = SearchVector(source, weight=weight, config=SEARCH_CONFIGS[language])
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def populate_search_vectors(apps, schema_editor):
+    Recipe = apps.get_model("dishes", "Recipe")
+    last_pk = None
+    while True:
+        queryset = Recipe.objects.order_by("pk")
+        if last_pk is not None:
+            queryset = queryset.filter(pk__gt=last_pk)
+        ids = list(queryset.values_list("pk", flat=True)[:1000])
+        if not ids:
+            break
+        Recipe.objects.filter(pk__in=ids).update(
+            **{
+                f"search_vector_{language}": build_search_vector(language)
+                for language in SEARCH_CONFIGS
+            }
+        )
+        last_pk = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0002_recipe_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector_en',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector_ru',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector_uz',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector_en'], name='dishes_recipe_search_en_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector_uz'], name='dishes_recipe_search_uz_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector_ru'], name='dishes_recipe_search_ru_gin'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0003_recipe_search_vectors'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['recipe', 'created_at'], name='dishes_rati_recipe__5d4173_idx'),
+        ),
+    ]
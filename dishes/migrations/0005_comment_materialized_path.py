@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0004_rating_recipe_created_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Depth'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Thread path'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='root',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread_comments', to='dishes.comment', verbose_name='Thread root comment'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['recipe', 'parent', 'created_at'], name='dishes_comm_recipe__7b95ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['root', 'path'], name='dishes_comm_root_id_670dcc_idx'),
+        ),
+        migrations.RunSQL(
+            sql="""
+                WITH RECURSIVE tree AS (
+                    SELECT id, id AS root_id, 0 AS depth,
+                           lpad(id::text, 10, '0') || '/' AS path
+                    FROM dishes_comment
+                    WHERE parent_id IS NULL
+                    UNION ALL
+                    SELECT c.id, t.root_id, t.depth + 1,
+                           t.path || lpad(c.id::text, 10, '0') || '/'
+                    FROM dishes_comment AS c
+                    JOIN tree AS t ON c.parent_id = t.id
+                )
+                UPDATE dishes_comment AS c
+                SET root_id = CASE WHEN tree.depth = 0 THEN NULL ELSE tree.root_id END,
+                    depth = tree.depth,
+                    path = tree.path
+                FROM tree
+                WHERE c.id = tree.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
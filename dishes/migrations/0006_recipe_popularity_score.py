@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_popularity_score(apps, schema_editor):
+    weight = settings.POPULARITY_PRIOR_WEIGHT
+    prior = settings.POPULARITY_PRIOR_MEAN * weight
+    schema_editor.execute(
+        """
+        UPDATE dishes_recipe
+        SET popularity_score = (rating_sum + %s)::double precision / (rating_count + %s)
+        WHERE rating_count > 0
+        """,
+        [prior, weight],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0005_comment_materialized_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='popularity_score',
+            field=models.FloatField(default=0, editable=False, verbose_name='Popularity score'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['is_draft', '-popularity_score'], name='dishes_recipe_popularity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['category', 'is_draft', '-popularity_score'], name='dishes_recipe_cat_popular_idx'),
+        ),
+        migrations.RunPython(populate_popularity_score, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0006_recipe_popularity_score'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='recipe',
+            name='dishes_reci_slug_fa75c9_idx',
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['slug'], name='dishes_recipe_slug_like_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0008_recipe_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Date')),
+                ('recipes_total', models.PositiveIntegerField(default=0, verbose_name='Recipes')),
+                ('recipes_published', models.PositiveIntegerField(default=0, verbose_name='Published recipes')),
+                ('recipes_featured', models.PositiveIntegerField(default=0, verbose_name='Featured recipes')),
+                ('users_total', models.PositiveIntegerField(default=0, verbose_name='Users')),
+                ('users_chefs', models.PositiveIntegerField(default=0, verbose_name='Chefs')),
+                ('users_confirmed', models.PositiveIntegerField(default=0, verbose_name='Confirmed users')),
+                ('ratings_total', models.PositiveIntegerField(default=0, verbose_name='Ratings')),
+                ('ratings_sum', models.PositiveBigIntegerField(default=0, verbose_name='Ratings sum')),
+                ('comments_total', models.PositiveIntegerField(default=0, verbose_name='Comments')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+            ],
+            options={
+                'verbose_name': 'Statistics snapshot',
+                'verbose_name_plural': 'Statistics snapshots',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
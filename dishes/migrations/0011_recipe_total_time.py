@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:31
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0010_recipe_ingredients'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='total_time',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('prep_time'), '+', models.F('cook_time')), output_field=models.PositiveIntegerField(), verbose_name='Total time (minutes)'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['is_draft', 'total_time'], name='dishes_reci_is_draf_0bd227_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dishes', '0011_recipe_total_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_version',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Ratings version'),
+        ),
+    ]
@@ -1,11 +1,14 @@
 import uuid
 
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.utils.text import slugify
+from django.db import IntegrityError, models, transaction
 from django.utils.translation import gettext_lazy as _
 
+from .slugs import SLUG_RETRIES, allocate_slug, is_slug_conflict
+
 User = get_user_model()
 
 
@@ -24,9 +27,17 @@ class Recipe(models.Model):
         _("Ingredients"), help_text=_("Each ingredient on a new line")
     )
     instructions = models.TextField(_("Instructions"))
+    # Tuzilgan ingredientlar soni (dishes.ingredients, "bor narsalardan" qidiruv uchun)
+    ingredient_count = models.PositiveSmallIntegerField(
+        _("Ingredient count"), default=0, editable=False
+    )
     image = models.ImageField(
         _("Image"), upload_to="recipes/%Y/%m/%d/", null=True, blank=True
     )
+    # Kichraytirilgan WebP/JPEG variantlar (core.images, Celery orqali yaratiladi)
+    image_renditions = models.JSONField(
+        _("Image renditions"), default=dict, blank=True, editable=False
+    )
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, verbose_name=_("Author")
     )
@@ -38,9 +49,48 @@ class Recipe(models.Model):
     )
     prep_time = models.PositiveIntegerField(_("Preparation time (minutes)"), default=0)
     cook_time = models.PositiveIntegerField(_("Cooking time (minutes)"), default=0)
+    # Baza tomonidan hisoblanadi - filter va saralash indeksdan foydalanadi
+    total_time = models.GeneratedField(
+        expression=models.F("prep_time") + models.F("cook_time"),
+        output_field=models.PositiveIntegerField(),
+        db_persist=True,
+        verbose_name=_("Total time (minutes)"),
+    )
     servings = models.PositiveIntegerField(_("Servings"), default=1)
     is_draft = models.BooleanField(_("Is draft"), default=True)
     is_featured = models.BooleanField(_("Is featured"), default=False)
+    # Reyting agregatlari (dishes.ratings orqali Rating yozuvlari bilan sinxron)
+    rating_count = models.PositiveIntegerField(
+        _("Ratings count"), default=0, editable=False
+    )
+    rating_sum = models.PositiveIntegerField(_("Ratings sum"), default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField(
+        _("1-star ratings"), default=0, editable=False
+    )
+    rating_2_count = models.PositiveIntegerField(
+        _("2-star ratings"), default=0, editable=False
+    )
+    rating_3_count = models.PositiveIntegerField(
+        _("3-star ratings"), default=0, editable=False
+    )
+    rating_4_count = models.PositiveIntegerField(
+        _("4-star ratings"), default=0, editable=False
+    )
+    rating_5_count = models.PositiveIntegerField(
+        _("5-star ratings"), default=0, editable=False
+    )
+    # Agregatlar har o'zgarganda max(versiya + 1, hozirgi vaqt µs) - ETag/Last-Modified uchun
+    rating_version = models.BigIntegerField(
+        _("Ratings version"), default=0, editable=False
+    )
+    # Bayes o'rtacha bo'yicha ommaboplik (leaderboard indeksi uchun)
+    popularity_score = models.FloatField(
+        _("Popularity score"), default=0, editable=False
+    )
+    # Full-text qidiruv uchun tsvector ustunlari (dishes.search orqali yangilanadi)
+    search_vector_en = SearchVectorField(null=True, editable=False)
+    search_vector_uz = SearchVectorField(null=True, editable=False)
+    search_vector_ru = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
 
@@ -49,35 +99,63 @@ class Recipe(models.Model):
         verbose_name_plural = _("Recipes")
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["slug"]),
+            # LIKE 'base-%' so'rovlari uchun (dishes.slugs)
+            models.Index(
+                fields=["slug"],
+                name="dishes_recipe_slug_like_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
             models.Index(fields=["is_draft", "created_at"]),
+            models.Index(fields=["is_draft", "total_time"]),
+            models.Index(fields=["ingredient_count"]),
+            models.Index(
+                fields=["is_draft", "-popularity_score"],
+                name="dishes_recipe_popularity_idx",
+            ),
+            models.Index(
+                fields=["category", "is_draft", "-popularity_score"],
+                name="dishes_recipe_cat_popular_idx",
+            ),
+            GinIndex(fields=["search_vector_en"], name="dishes_recipe_search_en_gin"),
+            GinIndex(fields=["search_vector_uz"], name="dishes_recipe_search_uz_gin"),
+            GinIndex(fields=["search_vector_ru"], name="dishes_recipe_search_ru_gin"),
         ]
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Recipe.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        # Slug bitta so'rovda tanlanadi; parallel yaratishda unique indeks
+        # to'qnashuvi bo'lsa, yangi slug bilan qayta uriniladi
+        for attempt in range(SLUG_RETRIES):
+            self.slug = allocate_slug(self.title)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError as e:
+                self.slug = ""
+                if not is_slug_conflict(e) or attempt == SLUG_RETRIES - 1:
+                    raise
 
     def __str__(self):
         return self.title
 
-    def total_time(self):
-        return self.prep_time + self.cook_time
-
     def average_rating(self):
-        ratings = self.rating_set.all()
-        if ratings:
-            return sum(r.rating for r in ratings) / len(ratings)
+        if self.rating_count:
+            return self.rating_sum / self.rating_count
         return 0
 
+    average_rating.short_description = _("Average rating")
+
     def ratings_count(self):
-        return self.rating_set.count()
+        return self.rating_count
+
+    ratings_count.short_description = _("Ratings count")
+
+    def rating_histogram(self):
+        return {star: getattr(self, f"rating_{star}_count") for star in range(1, 6)}
+
+    rating_histogram.short_description = _("Rating histogram")
 
 
 class Rating(models.Model):
@@ -99,10 +177,29 @@ class Rating(models.Model):
         verbose_name_plural = _("Ratings")
         unique_together = ("recipe", "user")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["recipe", "created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.recipe.title} ({self.rating}/5)"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Bazadagi holatni eslab qolamiz: signal agregat deltasini shundan hisoblaydi
+        instance._loaded_values = {
+            "recipe_id": instance.__dict__.get("recipe_id"),
+            "rating": instance.__dict__.get("rating"),
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Recipe agregatlari post_save signalida shu tranzaksiya ichida yangilanadi
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_values = {"recipe_id": self.recipe_id, "rating": self.rating}
+
 
 class Comment(models.Model):
     recipe = models.ForeignKey(
@@ -119,6 +216,18 @@ class Comment(models.Model):
         blank=True,
         verbose_name=_("Parent comment"),
     )
+    # Materialized path: butun thread bitta so'rovda yuklanadi (dishes.comments)
+    root = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="thread_comments",
+        verbose_name=_("Thread root comment"),
+    )
+    path = models.CharField(_("Thread path"), max_length=255, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(_("Depth"), default=0, editable=False)
     is_active = models.BooleanField(_("Is active"), default=True)
     created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
@@ -127,9 +236,129 @@ class Comment(models.Model):
         verbose_name = _("Comment")
         verbose_name_plural = _("Comments")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["recipe", "parent", "created_at"]),
+            models.Index(fields=["root", "path"]),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.recipe.title}"
 
+    def save(self, *args, **kwargs):
+        creating = self._state.adding
+        if creating and self.parent_id:
+            self.root_id = self.parent.root_id or self.parent_id
+            self.depth = self.parent.depth + 1
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if creating:
+                # path id'ga bog'liq, shuning uchun INSERT'dan keyin yoziladi
+                prefix = self.parent.path if self.parent_id else ""
+                self.path = f"{prefix}{self.pk:010d}/"
+                Comment.objects.filter(pk=self.pk).update(path=self.path)
+
     def replies(self):
         return Comment.objects.filter(parent=self, is_active=True)
+
+
+class Ingredient(models.Model):
+    """Normallashtirilgan ingredientlar lug'ati (barcha tillar uchun umumiy)"""
+
+    name = models.CharField(_("Name"), max_length=100, unique=True)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Ingredient")
+        verbose_name_plural = _("Ingredients")
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class RecipeIngredient(models.Model):
+    """Retsept ingredienti - (ingredient, recipe) indeksi teskari indeks vazifasini bajaradi"""
+
+    recipe = models.ForeignKey(
+        "dishes.Recipe",
+        on_delete=models.CASCADE,
+        related_name="recipe_ingredients",
+        verbose_name=_("Recipe"),
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name="recipe_ingredients",
+        verbose_name=_("Ingredient"),
+    )
+    # Matndagi qator raqami - tarjimalardagi bir xil ingredient bir marta sanaladi
+    position = models.PositiveSmallIntegerField(_("Position"))
+    quantity = models.DecimalField(
+        _("Quantity"), max_digits=8, decimal_places=2, null=True, blank=True
+    )
+    unit = models.CharField(_("Unit"), max_length=20, blank=True)
+
+    class Meta:
+        verbose_name = _("Recipe ingredient")
+        verbose_name_plural = _("Recipe ingredients")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipe", "ingredient"], name="dishes_recipe_ingredient_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["ingredient", "recipe", "position"]),
+        ]
+
+    def __str__(self):
+        return f"{self.recipe.title} - {self.ingredient.name}"
+
+
+class StatsSnapshot(models.Model):
+    """Kunlik umumiy statistika (trend hisobotlari to'liq jadvallarni o'qimaydi)"""
+
+    date = models.DateField(_("Date"), unique=True)
+    recipes_total = models.PositiveIntegerField(_("Recipes"), default=0)
+    recipes_published = models.PositiveIntegerField(_("Published recipes"), default=0)
+    recipes_featured = models.PositiveIntegerField(_("Featured recipes"), default=0)
+    users_total = models.PositiveIntegerField(_("Users"), default=0)
+    users_chefs = models.PositiveIntegerField(_("Chefs"), default=0)
+    users_confirmed = models.PositiveIntegerField(_("Confirmed users"), default=0)
+    ratings_total = models.PositiveIntegerField(_("Ratings"), default=0)
+    ratings_sum = models.PositiveBigIntegerField(_("Ratings sum"), default=0)
+    comments_total = models.PositiveIntegerField(_("Comments"), default=0)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Statistics snapshot")
+        verbose_name_plural = _("Statistics snapshots")
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"{self.date}: {self.recipes_total} recipes, {self.ratings_total} ratings"
+
+    def average_rating(self):
+        if self.ratings_total:
+            return self.ratings_sum / self.ratings_total
+        return 0
+
+    average_rating.short_description = _("Average rating")
+
+
+class ImportCheckpoint(models.Model):
+    """``import_recipes`` holati - har bir partiya bilan bitta tranzaksiyada yoziladi"""
+
+    name = models.CharField(_("Name"), max_length=500, unique=True)
+    source = models.CharField(_("Source"), max_length=500)
+    line = models.PositiveBigIntegerField(_("Last imported line"), default=0)
+    stats = models.JSONField(_("Stats"), default=dict)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Import checkpoint")
+        verbose_name_plural = _("Import checkpoints")
+
+    def __str__(self):
+        return f"{self.name}: line {self.line}"
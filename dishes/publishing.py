@@ -0,0 +1,88 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.cache import bump_namespaces_on_commit
+
+from .models import Recipe
+from .search import update_search_vectors
+
+
+def old_drafts_cutoff(days):
+    return timezone.now() - timedelta(days=days)
+
+
+def iter_old_drafts(cutoff, chunk_size=500, max_rows=None):
+    """Publish qilinadigan draftlarni (created_at, id) keyset bo'yicha o'qish (dry-run)"""
+    queryset = Recipe.objects.filter(is_draft=True, created_at__lt=cutoff).order_by(
+        "created_at", "id"
+    )
+    seen = 0
+    position = None
+    while max_rows is None or seen < max_rows:
+        chunk = queryset
+        if position is not None:
+            created_at, pk = position
+            chunk = chunk.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            )
+        limit = chunk_size if max_rows is None else min(chunk_size, max_rows - seen)
+        rows = list(chunk.values("id", "title", "slug", "created_at")[:limit])
+        if not rows:
+            return
+        seen += len(rows)
+        position = (rows[-1]["created_at"], rows[-1]["id"])
+        yield rows
+
+
+def publish_old_drafts(cutoff, chunk_size=500, max_rows=None):
+    """Eski draftlarni kichik tranzaksiyalarda publish qilish.
+
+    Har bir partiya ``(created_at, id)`` keyset bo'yicha tanlanadi va bitta
+    ``UPDATE ... RETURNING`` bilan yangilanadi - qulflar faqat partiya
+    davomida ushlanadi. Boshqa tranzaksiya qulflagan qatorlar
+    ``SKIP LOCKED`` bilan o'tkazib yuboriladi. Har bir partiyadan keyin
+    kesh eskirtiriladi va qidiruv vektori yo'q retseptlar indekslanadi.
+
+    Har bir partiya uchun publish qilingan qatorlar ro'yxatini qaytaradi.
+    """
+    table = Recipe._meta.db_table
+    sql = f"""
+        WITH batch AS (
+            SELECT id FROM {table}
+            WHERE is_draft AND created_at < %s AND (created_at, id) > (%s, %s)
+            ORDER BY created_at, id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE {table} AS r
+        SET is_draft = false, updated_at = %s
+        FROM batch
+        WHERE r.id = batch.id
+        RETURNING r.id, r.title, r.slug, r.created_at, r.search_vector_en IS NULL
+    """
+    published = 0
+    # Keyset boshlang'ich pozitsiyasi: barcha (created_at, id) juftliklaridan kichik
+    position = (datetime.min.replace(tzinfo=UTC), uuid.UUID(int=0))
+    while max_rows is None or published < max_rows:
+        limit = chunk_size if max_rows is None else min(chunk_size, max_rows - published)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [cutoff, *position, limit, timezone.now()])
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            unindexed = [row[0] for row in rows if row[4]]
+            if unindexed:
+                update_search_vectors(unindexed)
+            bump_namespaces_on_commit("recipes", "categories")
+
+        rows.sort(key=lambda row: (row[3], row[0]))
+        position = (rows[-1][3], rows[-1][0])
+        published += len(rows)
+        yield [
+            {"id": pk, "title": title, "slug": slug, "created_at": created_at}
+            for pk, title, slug, created_at, _ in rows
+        ]
@@ -0,0 +1,303 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Greatest
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from core.cache import bump_namespaces_on_commit, version_clock
+
+from .models import Rating, Recipe
+
+STARS = range(1, 6)
+AGGREGATE_FIELDS = ("rating_count", "rating_sum", *(f"rating_{star}_count" for star in STARS))
+
+
+def popularity_score(count, total):
+    """Bayes o'rtacha: kam baholangan retseptlar prior o'rtachaga tortiladi.
+
+    ``(sum + C * m) / (count + C)``, bu yerda ``m`` - POPULARITY_PRIOR_MEAN,
+    ``C`` - POPULARITY_PRIOR_WEIGHT. Baholanmagan retseptlar 0 oladi va
+    reytingning oxiriga tushadi.
+    """
+    if not count:
+        return 0.0
+    weight = settings.POPULARITY_PRIOR_WEIGHT
+    return (total + settings.POPULARITY_PRIOR_MEAN * weight) / (count + weight)
+
+
+def with_user_rating(queryset, user):
+    """Foydalanuvchi bahosini ``user_rating`` sifatida bitta ``Subquery`` bilan qo'shish.
+
+    Anonim foydalanuvchi uchun queryset o'zgarmaydi (serializer ``null`` qaytaradi).
+    """
+    if not user.is_authenticated:
+        return queryset
+    ratings = Rating.objects.filter(recipe=OuterRef("pk"), user=user).order_by()
+    return queryset.annotate(user_rating=Subquery(ratings.values("rating")[:1]))
+
+
+def popularity_score_expression(count, total):
+    """``popularity_score`` ning SQL ko'rinishi (``count``/``total`` - ifodalar)"""
+    weight = settings.POPULARITY_PRIOR_WEIGHT
+    prior = Value(settings.POPULARITY_PRIOR_MEAN * weight, output_field=FloatField())
+    return Case(
+        When(GreaterThan(count, 0), then=(total + prior) / (count + weight)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def apply_rating_change(recipe_id, old=None, new=None):
+    """Bitta reyting o'zgarishini Recipe agregatlariga qo'llash.
+
+    ``old`` - avvalgi baho (yangi reyting uchun None),
+    ``new`` - yangi baho (o'chirilgan reyting uchun None).
+    Yangilash bitta ``UPDATE ... SET col = col + delta`` so'rovi bilan bajariladi,
+    shuning uchun parallel yozuvlar bir-birini yo'qotmaydi.
+    """
+    if old == new:
+        return
+    deltas = Counter()
+    if old is not None:
+        deltas["rating_count"] -= 1
+        deltas["rating_sum"] -= old
+        deltas[f"rating_{old}_count"] -= 1
+    if new is not None:
+        deltas["rating_count"] += 1
+        deltas["rating_sum"] += new
+        deltas[f"rating_{new}_count"] += 1
+
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if updates:
+        # Postgres SET ifodalarida eski qiymatlarni ko'radi, shuning uchun delta qo'shiladi
+        updates["popularity_score"] = popularity_score_expression(
+            F("rating_count") + deltas["rating_count"],
+            F("rating_sum") + deltas["rating_sum"],
+        )
+        updates["rating_version"] = Greatest(F("rating_version") + 1, Value(version_clock()))
+        Recipe.objects.filter(pk=recipe_id).update(**updates)
+
+
+def recompute_rating_aggregates(recipe_ids):
+    """Berilgan retseptlar agregatlarini Rating jadvalidan qayta hisoblash.
+
+    Retsept qatorlari ``SELECT ... FOR UPDATE`` bilan qulflanadi, shuning uchun
+    hisoblash vaqtida kelgan reyting yozuvlari natijani buzmaydi.
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return 0
+
+    with transaction.atomic():
+        locked_ids = list(
+            Recipe.objects.select_for_update()
+            .filter(pk__in=recipe_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        stats = {
+            row.pop("recipe_id"): row
+            for row in Rating.objects.filter(recipe_id__in=locked_ids)
+            .order_by()
+            .values("recipe_id")
+            .annotate(
+                rating_count=Count("id"),
+                rating_sum=Sum("rating"),
+                **{
+                    f"rating_{star}_count": Count("id", filter=Q(rating=star))
+                    for star in STARS
+                },
+            )
+        }
+
+        columns = (*AGGREGATE_FIELDS, "popularity_score")
+        values = {field: [] for field in columns}
+        for recipe_id in locked_ids:
+            row = stats.get(recipe_id, {})
+            for field in AGGREGATE_FIELDS:
+                values[field].append(row.get(field) or 0)
+            values["popularity_score"].append(
+                popularity_score(row.get("rating_count"), row.get("rating_sum") or 0)
+            )
+
+        # bulk_update har bir qator uchun CASE quradi; unnest bitta tekis UPDATE beradi
+        arrays = ", ".join(
+            ["%s::integer[]"] * len(AGGREGATE_FIELDS) + ["%s::double precision[]"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {Recipe._meta.db_table} AS r
+                SET {", ".join(f"{field} = d.{field}" for field in columns)},
+                    rating_version = GREATEST(r.rating_version + 1, %s)
+                FROM unnest(%s::uuid[], {arrays}) AS d(recipe_id, {", ".join(columns)})
+                WHERE r.id = d.recipe_id
+                """,
+                [version_clock(), locked_ids, *(values[field] for field in columns)],
+            )
+
+    return len(locked_ids)
+
+
+def rating_change_deltas(changes):
+    """``(recipe_id, old, new)`` o'zgarishlarini retsept bo'yicha deltalarga yig'ish"""
+    deltas = {}
+    for recipe_id, old, new in changes:
+        if old == new:
+            continue
+        delta = deltas.setdefault(recipe_id, Counter())
+        if old is not None:
+            delta["rating_count"] -= 1
+            delta["rating_sum"] -= old
+            delta[f"rating_{old}_count"] -= 1
+        if new is not None:
+            delta["rating_count"] += 1
+            delta["rating_sum"] += new
+            delta[f"rating_{new}_count"] += 1
+    return {recipe_id: delta for recipe_id, delta in deltas.items() if +delta or -delta}
+
+
+def apply_rating_changes(changes):
+    """Ko'p reyting o'zgarishini bitta ``UPDATE ... FROM unnest(...)`` bilan qo'llash"""
+    deltas = rating_change_deltas(changes)
+    if not deltas:
+        return 0
+
+    recipe_ids = sorted(deltas)
+    columns = ", ".join(
+        f"{field} = r.{field} + d.{field}" for field in AGGREGATE_FIELDS
+    )
+    arrays = ", ".join(["%s::integer[]"] * len(AGGREGATE_FIELDS))
+    weight = settings.POPULARITY_PRIOR_WEIGHT
+    sql = f"""
+        UPDATE {Recipe._meta.db_table} AS r
+        SET {columns},
+            popularity_score = CASE
+                WHEN r.rating_count + d.rating_count > 0
+                THEN (r.rating_sum + d.rating_sum + %s)::double precision
+                     / (r.rating_count + d.rating_count + %s)
+                ELSE 0
+            END,
+            rating_version = GREATEST(r.rating_version + 1, %s)
+        FROM unnest(%s::uuid[], {arrays})
+            AS d(recipe_id, {", ".join(AGGREGATE_FIELDS)})
+        WHERE r.id = d.recipe_id
+    """
+    params = [
+        settings.POPULARITY_PRIOR_MEAN * weight,
+        weight,
+        version_clock(),
+        recipe_ids,
+        *(
+            [deltas[recipe_id][field] for recipe_id in recipe_ids]
+            for field in AGGREGATE_FIELDS
+        ),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def upsert_ratings(user, items):
+    """Foydalanuvchi reytinglarini bitta ``INSERT ... ON CONFLICT DO UPDATE`` bilan yozish.
+
+    ``items`` - ``(recipe_id, rating, review)`` ro'yxati (bir retsept uchun
+    oxirgisi olinadi, ``review=None`` - mavjud sharhni saqlash). Avval mavjud
+    qatorlar ``FOR UPDATE`` bilan qulflanib, eski baholari o'qiladi - Recipe
+    agregatlari delta bilan yangilanadi.
+    Parallel so'rov shu orada qator qo'shgan bo'lsa (eski baho noma'lum),
+    o'sha retsept agregatlari qayta hisoblanadi.
+
+    Qaytaradi: ``[(Rating, created), ...]``. Signal chaqirilmaydi, shuning
+    uchun agregatlar va kesh shu yerning o'zida yangilanadi.
+    """
+    latest = {}
+    for recipe_id, rating, review in items:
+        latest[recipe_id] = (rating, review)
+    if not latest:
+        return []
+
+    recipe_ids = sorted(latest)
+    table = Rating._meta.db_table
+    select_sql = f"""
+        SELECT recipe_id, rating, review FROM {table}
+        WHERE user_id = %s AND recipe_id = ANY(%s::uuid[])
+        ORDER BY recipe_id
+        FOR UPDATE
+    """
+    upsert_sql = f"""
+        INSERT INTO {table} (recipe_id, user_id, rating, review, created_at, updated_at)
+        SELECT recipe_id, %s, rating, review, %s, %s
+        FROM unnest(%s::uuid[], %s::smallint[], %s::text[]) AS t(recipe_id, rating, review)
+        ON CONFLICT (recipe_id, user_id) DO UPDATE
+        SET rating = EXCLUDED.rating,
+            review = EXCLUDED.review,
+            updated_at = EXCLUDED.updated_at
+        RETURNING id, recipe_id, rating, review, created_at, updated_at, (xmax = 0)
+    """
+    results, changes, unknown = [], [], []
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Mavjud qatorlar qulflanadi: eski baholar upsert'gacha o'zgarmaydi
+        cursor.execute(select_sql, [user.pk, recipe_ids])
+        previous = {
+            recipe_id: (rating, review) for recipe_id, rating, review in cursor.fetchall()
+        }
+        now = timezone.now()
+        cursor.execute(
+            upsert_sql,
+            [
+                user.pk,
+                now,
+                now,
+                recipe_ids,
+                [latest[recipe_id][0] for recipe_id in recipe_ids],
+                [
+                    # review berilmagan bo'lsa mavjud sharh saqlanadi
+                    latest[recipe_id][1]
+                    if latest[recipe_id][1] is not None
+                    else previous.get(recipe_id, (None, ""))[1]
+                    for recipe_id in recipe_ids
+                ],
+            ],
+        )
+        rows = cursor.fetchall()
+
+        for pk, recipe_id, rating, review, created_at, updated_at, inserted in rows:
+            if inserted:
+                changes.append((recipe_id, None, rating))
+            elif recipe_id in previous:
+                changes.append((recipe_id, previous[recipe_id][0], rating))
+            else:
+                # Qator parallel so'rovda qo'shilgan - eski baho noma'lum
+                unknown.append(recipe_id)
+            instance = Rating(
+                pk=pk,
+                recipe_id=recipe_id,
+                user=user,
+                rating=rating,
+                review=review,
+                created_at=created_at,
+                updated_at=updated_at,
+            )
+            instance._loaded_values = {"recipe_id": recipe_id, "rating": rating}
+            results.append((instance, inserted))
+
+        apply_rating_changes(changes)
+        recompute_rating_aggregates(unknown)
+        bump_namespaces_on_commit("recipes")
+
+    return results
@@ -0,0 +1,120 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Q, TextField, Value
+from django.db.models.functions import Coalesce, Greatest
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Recipe
+
+# Har bir til uchun PostgreSQL text search konfiguratsiyasi.
+# O'zbek tili uchun stemmer yo'q, shuning uchun "simple" ishlatiladi.
+SEARCH_CONFIGS = {
+    "en": "english",
+    "uz": "simple",
+    "ru": "russian",
+}
+
+# Maydon -> tsvector og'irligi (A eng yuqori)
+SEARCH_WEIGHTS = (
+    ("title", "A"),
+    ("description", "B"),
+    ("ingredients", "C"),
+    ("instructions", "D"),
+)
+
+# Shu maydonlardan biri o'zgarsa, tsvector qayta hisoblanadi
+SEARCH_SOURCE_FIELDS = frozenset(
+    name
+    for field, _weight in SEARCH_WEIGHTS
+    for name in [field, *(f"{field}_{language}" for language in SEARCH_CONFIGS)]
+)
+
+
+def search_vector_field(language):
+    return f"search_vector_{language}"
+
+
+def build_search_vector(language):
+    """Bitta til uchun og'irlangan tsvector ifodasi"""
+    config = SEARCH_CONFIGS[language]
+    default_language = settings.LANGUAGE_CODE
+    vector = None
+    for field, weight in SEARCH_WEIGHTS:
+        # Tarjima bo'lmasa, asosiy til matniga qaytamiz (modeltranslation fallback)
+        source = Coalesce(
+            F(f"{field}_{language}"),
+            F(f"{field}_{default_language}"),
+            Value(""),
+            output_field=TextField(),
+        )
+        part = SearchVector(source, weight=weight, config=config)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(recipe_ids):
+    """Berilgan retseptlar uchun barcha tillardagi tsvector ustunlarini yangilash"""
+    return Recipe.objects.filter(pk__in=list(recipe_ids)).update(
+        **{
+            search_vector_field(language): build_search_vector(language)
+            for language in SEARCH_CONFIGS
+        }
+    )
+
+
+def search_recipes(queryset, query, languages=None):
+    """Barcha (yoki tanlangan) tillar bo'yicha qidirish va relevantlik bo'yicha reyting"""
+    languages = languages or list(SEARCH_CONFIGS)
+    condition = Q()
+    ranks = []
+    for language in languages:
+        field = search_vector_field(language)
+        search_query = SearchQuery(
+            query, config=SEARCH_CONFIGS[language], search_type="websearch"
+        )
+        condition |= Q(**{field: search_query})
+        ranks.append(SearchRank(F(field), search_query))
+
+    rank = ranks[0] if len(ranks) == 1 else Greatest(*ranks)
+    return queryset.filter(condition).annotate(search_rank=rank)
+
+
+class RecipeFullTextSearchFilter(BaseFilterBackend):
+    """``?q=`` - GIN indekslangan full-text qidiruv.
+
+    ``?q_lang=uz`` qidiruvni bitta til bilan cheklaydi. ``ordering`` parametri
+    berilmagan bo'lsa, natijalar relevantlik bo'yicha saralanadi.
+    """
+
+    search_param = "q"
+    language_param = "q_lang"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+
+        language = request.query_params.get(self.language_param)
+        languages = [language] if language in SEARCH_CONFIGS else None
+        queryset = search_recipes(queryset, query, languages)
+        if not request.query_params.get("ordering"):
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search across all translated languages",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.language_param,
+                "required": False,
+                "in": "query",
+                "description": "Restrict full-text search to one language",
+                "schema": {"type": "string", "enum": list(SEARCH_CONFIGS)},
+            },
+        ]
@@ -0,0 +1,303 @@
+import random
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.utils import timezone
+
+from categories.models import Category
+from core.cache import bump_namespaces
+
+from .ingredients import sync_recipe_ingredients
+from .models import Comment, Rating, Recipe
+from .ratings import recompute_rating_aggregates
+from .search import update_search_vectors
+
+User = get_user_model()
+
+LANGUAGES = ("en", "uz", "ru")
+
+# Sintetik matnlar uchun kichik lug'at (har bir til uchun)
+WORDS = {
+    "en": {
+        "dishes": ["Plov", "Soup", "Salad", "Pie", "Stew", "Kebab", "Noodles", "Bread"],
+        "adjectives": ["Spicy", "Classic", "Quick", "Smoky", "Fresh", "Golden", "Hearty"],
+        "ingredients": ["rice", "lamb", "carrot", "onion", "garlic", "flour", "egg", "butter"],
+        "steps": ["Chop", "Fry", "Boil", "Bake", "Stir", "Season", "Simmer", "Serve"],
+        "categories": ["Soups", "Salads", "Desserts", "Breakfast", "Grill", "Pastry"],
+    },
+    "uz": {
+        "dishes": ["Palov", "Sho'rva", "Salat", "Somsa", "Dimlama", "Kabob", "Lag'mon", "Non"],
+        "adjectives": ["Achchiq", "Klassik", "Tezkor", "Dudlangan", "Yangi", "Oltin", "To'yimli"],
+        "ingredients": ["guruch", "qo'y go'shti", "sabzi", "piyoz", "sarimsoq", "un", "tuxum", "sariyog'"],
+        "steps": ["To'g'rang", "Qovuring", "Qaynating", "Pishiring", "Aralashtiring", "Tuzlang", "Dimlang", "Torting"],
+        "categories": ["Sho'rvalar", "Salatlar", "Shirinliklar", "Nonushta", "Grill", "Xamir ovqatlar"],
+    },
+    "ru": {
+        "dishes": ["Плов", "Суп", "Салат", "Пирог", "Рагу", "Кебаб", "Лапша", "Хлеб"],
+        "adjectives": ["Острый", "Классический", "Быстрый", "Копчёный", "Свежий", "Золотой", "Сытный"],
+        "ingredients": ["рис", "баранина", "морковь", "лук", "чеснок", "мука", "яйцо", "масло"],
+        "steps": ["Нарежьте", "Обжарьте", "Сварите", "Запеките", "Перемешайте", "Посолите", "Тушите", "Подавайте"],
+        "categories": ["Супы", "Салаты", "Десерты", "Завтраки", "Гриль", "Выпечка"],
+    },
+}
+REVIEWS = ["", "", "Tasty!", "Too salty", "Will cook again", "Zo'r chiqdi", "Очень вкусно"]
+
+
+def copy_rows(model, rows):
+    """Qatorlarni ``COPY ... FROM STDIN`` bilan yozish.
+
+    ``rows`` - ``{attname: qiymat}`` lug'atlari. Berilmagan maydonlar model
+    default qiymatini oladi; id berilmagan AutoField va GeneratedField
+    ustunlari bazaga qoldiriladi.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if not getattr(field, "generated", False)
+        and not (isinstance(field, models.AutoField) and field.attname not in rows[0])
+    ]
+    defaults = {
+        field.attname: field.get_default()
+        for field in fields
+        if field.attname not in rows[0]
+    }
+    # Proxy orqali har bir qiymatda ulanishni qidirmaslik uchun
+    connection = connections[DEFAULT_DB_ALIAS]
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        with cursor.copy(
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                copy.write_row(
+                    [
+                        field.get_db_prep_save(
+                            row.get(field.attname, defaults.get(field.attname)),
+                            connection,
+                        )
+                        for field in fields
+                    ]
+                )
+    return len(rows)
+
+
+def reserve_ids(model, count):
+    """Sequence'dan oldindan id olish (materialized path id'ga bog'liq)"""
+    if not count:
+        return []
+    table = model._meta.db_table
+    column = model._meta.pk.column
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [table, column, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def split_quota(rng, total, keys, limit):
+    """``total`` ta elementni kalitlar bo'yicha notekis (Pareto) taqsimlash"""
+    if not total or not keys:
+        return Counter()
+    weights = [rng.paretovariate(1.5) for _ in keys]
+    counts = Counter(rng.choices(keys, weights=weights, k=total))
+    return Counter({key: min(count, limit) for key, count in counts.items()})
+
+
+class DataSeeder:
+    """Lokal yuklama sinovlari uchun sintetik ma'lumotlar generatori.
+
+    Foydalanuvchilar va kategoriyalar ``bulk_create``, retseptlar, reytinglar
+    va izohlar esa retseptlar partiyasi bo'yicha ``COPY`` orqali yoziladi -
+    xotira partiya hajmi bilan cheklanadi. Har bir partiyadan keyin reyting
+    agregatlari va (ixtiyoriy) qidiruv vektorlari hisoblanadi.
+    """
+
+    def __init__(self, seed=None, batch_size=5000, days=365, search_index=True, log=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.days = days
+        self.search_index = search_index
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        # Takroriy ishga tushirishlarda email/slug/nomlar to'qnashmasligi uchun
+        self.run = f"{int(self.now.timestamp()):x}"
+
+    def random_datetime(self, after=None):
+        start = after or self.now - timedelta(days=self.days)
+        seconds = max(int((self.now - start).total_seconds()), 1)
+        return start + timedelta(seconds=self.rng.randrange(seconds))
+
+    def text(self, lang, kind, count):
+        return self.rng.sample(WORDS[lang][kind], count)
+
+    def create_users(self, count):
+        password = make_password("password123")
+        users = [
+            User(
+                email=f"seed-{self.run}-{number}@example.com",
+                first_name=f"Seed{number}",
+                last_name="User",
+                password=password,
+                is_chef=self.rng.random() < 0.2,
+                email_confirmed=True,
+            )
+            for number in range(count)
+        ]
+        created = []
+        for start in range(0, count, self.batch_size):
+            created += User.objects.bulk_create(users[start : start + self.batch_size])
+        return [user.pk for user in created]
+
+    def create_categories(self, count):
+        categories = []
+        for number in range(count):
+            values = {}
+            for lang in LANGUAGES:
+                name = self.rng.choice(WORDS[lang]["categories"])
+                values[f"name_{lang}"] = f"{name} {self.run}-{number}"
+                values[f"description_{lang}"] = " ".join(self.text(lang, "dishes", 3))
+            categories.append(
+                Category(
+                    name=values["name_en"],
+                    description=values["description_en"],
+                    **values,
+                )
+            )
+        return [category.pk for category in Category.objects.bulk_create(categories)]
+
+    def recipe_row(self, number, author_ids, category_ids):
+        row = {
+            "id": uuid.uuid4(),
+            "slug": f"seed-{self.run}-{number}",
+            "author_id": self.rng.choice(author_ids),
+            "category_id": self.rng.choice(category_ids),
+            "difficulty": self.rng.choice(("easy", "medium", "hard")),
+            "prep_time": self.rng.randrange(5, 60),
+            "cook_time": self.rng.randrange(0, 180),
+            "servings": self.rng.randrange(1, 12),
+            "is_draft": self.rng.random() < 0.1,
+            "is_featured": self.rng.random() < 0.02,
+            "created_at": self.random_datetime(),
+        }
+        row["updated_at"] = row["created_at"]
+        for lang in LANGUAGES:
+            adjective, dish = self.text(lang, "adjectives", 1) + self.text(lang, "dishes", 1)
+            ingredients = self.text(lang, "ingredients", self.rng.randrange(3, 8))
+            steps = self.text(lang, "steps", self.rng.randrange(2, 6))
+            row[f"title_{lang}"] = f"{adjective} {dish}"
+            row[f"description_{lang}"] = f"{adjective} {dish.lower()}: {', '.join(ingredients[:3])}"
+            row[f"ingredients_{lang}"] = "\n".join(ingredients)
+            # Har bir qadam bitta ingredient bilan - ortiqchasi tashlanadi
+            pairs = min(len(steps), len(ingredients))
+            row[f"instructions_{lang}"] = "\n".join(
+                f"{step} {ingredient}."
+                for step, ingredient in zip(steps[:pairs], ingredients[:pairs], strict=True)
+            )
+        # Asosiy ustunlar default til qiymatini saqlaydi (modeltranslation kabi)
+        for field in ("title", "description", "ingredients", "instructions"):
+            row[field] = row[f"{field}_{settings.LANGUAGE_CODE}"]
+        return row
+
+    def rating_rows(self, recipes, user_ids, total):
+        quota = split_quota(self.rng, total, list(recipes), len(user_ids))
+        for recipe_id, count in quota.items():
+            # Har bir retsept uchun turli foydalanuvchilar: (recipe, user) noyob
+            bias = self.rng.uniform(-1.5, 1.5)
+            for user_id in self.rng.sample(user_ids, count):
+                created_at = self.random_datetime(after=recipes[recipe_id])
+                yield {
+                    "recipe_id": recipe_id,
+                    "user_id": user_id,
+                    "rating": min(5, max(1, round(self.rng.gauss(3.5 + bias, 1)))),
+                    "review": self.rng.choice(REVIEWS),
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+
+    def comment_rows(self, recipes, user_ids, total, max_depth):
+        quota = split_quota(self.rng, total, list(recipes), total)
+        ids = iter(reserve_ids(Comment, sum(quota.values())))
+        for recipe_id, count in quota.items():
+            parents = []  # javob yozish mumkin bo'lgan izohlar
+            created_at = recipes[recipe_id]
+            for _ in range(count):
+                pk = next(ids)
+                created_at = self.random_datetime(after=created_at)
+                row = {
+                    "id": pk,
+                    "recipe_id": recipe_id,
+                    "user_id": self.rng.choice(user_ids),
+                    "content": " ".join(self.text("en", "adjectives", 2)),
+                    "is_active": self.rng.random() > 0.03,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "parent_id": None,
+                    "root_id": None,
+                    "depth": 0,
+                    "path": f"{pk:010d}/",
+                }
+                if parents and self.rng.random() < 0.6:
+                    parent = self.rng.choice(parents)
+                    row["parent_id"] = parent["id"]
+                    row["root_id"] = parent["root_id"] or parent["id"]
+                    row["depth"] = parent["depth"] + 1
+                    row["path"] = f"{parent['path']}{pk:010d}/"
+                if row["depth"] < max_depth:
+                    parents.append(row)
+                yield row
+
+    def seed(self, users, categories, recipes, ratings, comments):
+        """Berilgan hajmda ma'lumot yaratish; yaratilganlar sonini qaytaradi"""
+        stats = Counter()
+        user_ids = self.create_users(users)
+        stats["users"] = len(user_ids)
+        self.log(f"Created {len(user_ids)} users")
+        category_ids = self.create_categories(categories)
+        stats["categories"] = len(category_ids)
+        self.log(f"Created {len(category_ids)} categories")
+        if not user_ids or not category_ids:
+            return stats
+
+        for start in range(0, recipes, self.batch_size):
+            size = min(self.batch_size, recipes - start)
+            # Reyting va izohlar partiyalar bo'yicha proporsional taqsimlanadi
+            rating_quota = ratings * (start + size) // recipes - ratings * start // recipes
+            comment_quota = comments * (start + size) // recipes - comments * start // recipes
+
+            with transaction.atomic():
+                rows = [
+                    self.recipe_row(start + offset, user_ids, category_ids)
+                    for offset in range(size)
+                ]
+                stats["recipes"] += copy_rows(Recipe, rows)
+                batch = {row["id"]: row["created_at"] for row in rows}
+                stats["ratings"] += copy_rows(
+                    Rating, self.rating_rows(batch, user_ids, rating_quota)
+                )
+                stats["comments"] += copy_rows(
+                    Comment,
+                    self.comment_rows(
+                        batch, user_ids, comment_quota, settings.COMMENT_MAX_DEPTH
+                    ),
+                )
+                recompute_rating_aggregates(batch)
+                sync_recipe_ingredients(batch)
+                if self.search_index:
+                    update_search_vectors(list(batch))
+
+            self.log(
+                f"Seeded {stats['recipes']}/{recipes} recipes, "
+                f"{stats['ratings']} ratings, {stats['comments']} comments"
+            )
+
+        bump_namespaces("recipes", "categories")
+        return stats
@@ -1,6 +1,13 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from categories.serializers import CategoryListSerializer
+from core.images import ImageRenditionsField
+from core.pagination import KeysetPagination
 from users.serializers import UserSerializer
 
 from .models import Comment, Rating, Recipe
@@ -10,8 +17,12 @@ class RecipeListSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source="author.get_full_name", read_only=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
     average_rating = serializers.SerializerMethodField()
-    ratings_count = serializers.IntegerField(read_only=True)
-    total_time = serializers.IntegerField(read_only=True)
+    ratings_count = serializers.IntegerField(source="rating_count", read_only=True)
+    image_renditions = ImageRenditionsField()
+    # Faqat ?have= filtri bilan (RecipeIngredientFilter annotatsiyasi)
+    missing_ingredients = serializers.IntegerField(read_only=True)
+    # ratings.with_user_rating annotatsiyasi; anonim uchun null
+    user_rating = serializers.IntegerField(read_only=True, allow_null=True)
 
     class Meta:
         model = Recipe
@@ -21,6 +32,7 @@ class RecipeListSerializer(serializers.ModelSerializer):
             "slug",
             "description",
             "image",
+            "image_renditions",
             "author",
             "author_name",
             "category",
@@ -32,6 +44,9 @@ class RecipeListSerializer(serializers.ModelSerializer):
             "servings",
             "average_rating",
             "ratings_count",
+            "ingredient_count",
+            "missing_ingredients",
+            "user_rating",
             "is_featured",
             "created_at",
         )
@@ -44,24 +59,35 @@ class RecipeDetailSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     category = CategoryListSerializer(read_only=True)
     average_rating = serializers.SerializerMethodField()
-    ratings_count = serializers.IntegerField(read_only=True)
-    total_time = serializers.IntegerField(read_only=True)
-    user_rating = serializers.SerializerMethodField()
+    ratings_count = serializers.IntegerField(source="rating_count", read_only=True)
+    rating_histogram = serializers.SerializerMethodField()
+    image_renditions = ImageRenditionsField()
+    # ratings.with_user_rating annotatsiyasi; anonim uchun null
+    user_rating = serializers.IntegerField(read_only=True, allow_null=True)
 
     class Meta:
         model = Recipe
-        fields = "__all__"
+        exclude = (
+            "rating_count",
+            "rating_sum",
+            "rating_1_count",
+            "rating_2_count",
+            "rating_3_count",
+            "rating_4_count",
+            "rating_5_count",
+            "popularity_score",
+            "rating_version",
+            "search_vector_en",
+            "search_vector_uz",
+            "search_vector_ru",
+        )
         read_only_fields = ("author", "slug", "created_at", "updated_at")
 
     def get_average_rating(self, obj):
         return obj.average_rating()
 
-    def get_user_rating(self, obj):
-        user = self.context["request"].user
-        if user.is_authenticated:
-            rating = Rating.objects.filter(recipe=obj, user=user).first()
-            return rating.rating if rating else None
-        return None
+    def get_rating_histogram(self, obj):
+        return {str(star): count for star, count in obj.rating_histogram().items()}
 
 
 class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
@@ -105,20 +131,102 @@ class RatingCreateUpdateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class RatingBulkItemSerializer(serializers.Serializer):
+    recipe = serializers.UUIDField()
+    rating = serializers.IntegerField(min_value=1, max_value=5)
+    review = serializers.CharField(required=False, allow_blank=True)
+
+
+class MyRatingsQuerySerializer(serializers.Serializer):
+    """``?ids=`` - vergul bilan ajratilgan retsept ID'lari"""
+
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+    def to_internal_value(self, data):
+        ids = [value for param in data.getlist("ids") for value in param.split(",") if value]
+        return super().to_internal_value({"ids": ids})
+
+    def validate_ids(self, value):
+        if len(value) > settings.MY_RATINGS_MAX_IDS:
+            raise serializers.ValidationError(
+                _("At most {max} recipe ids per request.").format(
+                    max=settings.MY_RATINGS_MAX_IDS
+                )
+            )
+        return value
+
+
+class RatingBulkSerializer(serializers.Serializer):
+    """Ko'p reytingni bitta so'rovda yozish (masalan offline sinxronizatsiya)"""
+
+    ratings = RatingBulkItemSerializer(many=True, allow_empty=False)
+
+    def validate_ratings(self, value):
+        if len(value) > settings.RATING_BULK_MAX_SIZE:
+            raise serializers.ValidationError(
+                _("At most {max} ratings per request.").format(
+                    max=settings.RATING_BULK_MAX_SIZE
+                )
+            )
+        recipe_ids = {item["recipe"] for item in value}
+        existing = set(
+            Recipe.objects.filter(pk__in=recipe_ids).values_list("pk", flat=True)
+        )
+        missing = recipe_ids - existing
+        if missing:
+            raise serializers.ValidationError(
+                _("Recipes not found: {ids}").format(
+                    ids=", ".join(sorted(str(pk) for pk in missing))
+                )
+            )
+        return value
+
+
 class CommentSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
+    thread_size = serializers.SerializerMethodField()
+    replies_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
-        fields = "__all__"
-        read_only_fields = ("user", "created_at", "updated_at")
+        exclude = ("root", "path")
+        read_only_fields = ("user", "parent", "created_at", "updated_at")
 
     def get_replies(self, obj):
-        if obj.parent is None:  # Only get replies for parent comments
-            replies = obj.replies()
-            return CommentSerializer(replies, many=True, context=self.context).data
-        return []
+        # Javoblar dishes.comments.load_comment_threads tomonidan oldindan yuklanadi
+        replies = getattr(obj, "thread_replies", None)
+        if not replies:
+            return []
+        return CommentSerializer(replies, many=True, context=self.context).data
+
+    def get_thread_size(self, obj):
+        if obj.parent_id is None:
+            return getattr(obj, "thread_size", None)
+        return None
+
+    def get_replies_next(self, obj):
+        """Thread'ning keyingi javoblar sahifasi uchun havola"""
+        last_reply = getattr(obj, "last_loaded_reply", None)
+        if obj.parent_id is not None or last_reply is None:
+            return None
+        if obj.thread_size <= settings.COMMENT_REPLIES_PER_THREAD:
+            return None
+        url = reverse("dishes:comment_replies", kwargs={"pk": obj.pk})
+        cursor = KeysetPagination.encode_cursor(last_reply.path, last_reply.pk)
+        request = self.context.get("request")
+        url = f"{url}?{urlencode({KeysetPagination.cursor_query_param: cursor})}"
+        return request.build_absolute_uri(url) if request else url
+
+
+class CommentReplySerializer(serializers.ModelSerializer):
+    """Thread javoblari uchun tekis (nested bo'lmagan) serializer"""
+
+    user = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Comment
+        exclude = ("root", "path")
 
 
 class CommentCreateUpdateSerializer(serializers.ModelSerializer):
@@ -126,6 +234,19 @@ class CommentCreateUpdateSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ("recipe", "content", "parent")
 
+    def validate(self, attrs):
+        parent = attrs.get("parent")
+        if parent is not None:
+            if parent.recipe_id != attrs["recipe"].pk:
+                raise serializers.ValidationError(
+                    {"parent": _("Parent comment belongs to another recipe.")}
+                )
+            if parent.depth + 1 > settings.COMMENT_MAX_DEPTH:
+                raise serializers.ValidationError(
+                    {"parent": _("Maximum reply depth reached.")}
+                )
+        return attrs
+
     def create(self, validated_data):
         validated_data["user"] = self.context["request"].user
         return super().create(validated_data)
@@ -1,28 +1,49 @@
 import logging
 import os
 
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.utils.text import slugify
 
-from .models import Recipe
+from core.cache import bump_namespaces_on_commit
+from core.images import delete_renditions, renditions_outdated
+
+from .ingredients import ingredient_source_fields, sync_recipe_ingredients
+from .models import Rating, Recipe
+from .ratings import apply_rating_change, recompute_rating_aggregates
+from .search import SEARCH_SOURCE_FIELDS, update_search_vectors
+from .tasks import generate_recipe_thumbnails
 
 logger = logging.getLogger("dishes")
 
+INGREDIENT_SOURCE_FIELDS = frozenset(["ingredients", *ingredient_source_fields()])
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_update_search_vectors(sender, instance, update_fields=None, **kwargs):
+    """Matn maydonlari o'zgarganda full-text qidiruv indeksini yangilash"""
+    if update_fields is not None and not SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        return
+    update_search_vectors([instance.pk])
+
 
 @receiver(post_save, sender=Recipe)
-def recipe_post_save(sender, instance, created, **kwargs):
-    """Recipe saqlangandan keyin slug yaratish"""
-    if created and not instance.slug:
-        base_slug = slugify(instance.title)
-        slug = base_slug
-        counter = 1
-        while Recipe.objects.filter(slug=slug).exclude(id=instance.id).exists():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
+def recipe_update_ingredients(sender, instance, update_fields=None, **kwargs):
+    """Ingredientlar matni o'zgarganda tuzilgan ingredient indeksini yangilash"""
+    if update_fields is not None and not INGREDIENT_SOURCE_FIELDS.intersection(update_fields):
+        return
+    sync_recipe_ingredients([instance.pk])
 
-        Recipe.objects.filter(id=instance.id).update(slug=slug)
-        logger.info(f"Recipe slug created: {slug} for recipe {instance.title}")
+
+@receiver(post_save, sender=Recipe)
+def recipe_generate_renditions(sender, instance, **kwargs):
+    """Rasm yuklangan yoki o'zgartirilganda variantlarni fonda yaratish"""
+    if not renditions_outdated(instance.image, instance.image_renditions):
+        return
+    recipe_id = str(instance.pk)
+    transaction.on_commit(
+        lambda: generate_recipe_thumbnails.delay(recipe_id), robust=True
+    )
 
 
 @receiver(post_delete, sender=Recipe)
@@ -32,3 +53,51 @@ def recipe_post_delete(sender, instance, **kwargs):
         if os.path.isfile(instance.image.path):
             os.remove(instance.image.path)
             logger.info(f"Recipe image deleted: {instance.image.path}")
+    delete_renditions(instance, instance.image_renditions)
+
+
+@receiver(post_save, sender=Rating)
+def rating_post_save(sender, instance, created, **kwargs):
+    """Reyting saqlangandan keyin Recipe agregatlarini yangilash"""
+    if created:
+        apply_rating_change(instance.recipe_id, new=instance.rating)
+        return
+
+    loaded = getattr(instance, "_loaded_values", None)
+    if not loaded or loaded["rating"] is None:
+        # Avvalgi qiymat noma'lum - retsept agregatlarini to'liq qayta hisoblaymiz
+        recompute_rating_aggregates([instance.recipe_id])
+        return
+
+    if loaded["recipe_id"] != instance.recipe_id:
+        apply_rating_change(loaded["recipe_id"], old=loaded["rating"])
+        apply_rating_change(instance.recipe_id, new=instance.rating)
+    else:
+        apply_rating_change(instance.recipe_id, old=loaded["rating"], new=instance.rating)
+
+
+@receiver(post_delete, sender=Rating)
+def rating_post_delete(sender, instance, origin=None, **kwargs):
+    """Reyting o'chirilgandan keyin Recipe agregatlarini yangilash"""
+    if isinstance(origin, Recipe) or getattr(origin, "model", None) is Recipe:
+        # Retseptning o'zi o'chirilyapti - agregatlarni yangilash shart emas
+        return
+    loaded = getattr(instance, "_loaded_values", None) or {}
+    apply_rating_change(
+        loaded.get("recipe_id") or instance.recipe_id,
+        old=loaded.get("rating") or instance.rating,
+    )
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def recipe_invalidate_cache(sender, instance, **kwargs):
+    """Retsept o'zgarganda retsept va kategoriya javoblari keshini eskirtirish"""
+    bump_namespaces_on_commit("recipes", "categories")
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+def rating_invalidate_cache(sender, instance, **kwargs):
+    """Reyting o'zgarganda retsept javoblari keshini eskirtirish"""
+    bump_namespaces_on_commit("recipes")
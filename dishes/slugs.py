@@ -0,0 +1,103 @@
+import re
+from collections import defaultdict
+from functools import cache, reduce
+from operator import or_
+
+from django.db.models import Q
+from django.utils.text import slugify
+
+SLUG_MAX_LENGTH = 50
+SLUG_SUFFIX_RESERVE = 8  # "-1234567" uchun joy
+SLUG_FALLBACK = "recipe"
+SLUG_QUERY_CHUNK = 200  # bitta so'rovdagi bazaviy sluglar soni
+SLUG_RETRIES = 5
+SUFFIX_PATTERN = re.compile(r"^(?P<base>.+)-(?P<n>[0-9]+)$")
+
+
+def slug_base(title):
+    """Sarlavhadan bazaviy slug (suffikssiz, uzunligi chegaralangan)"""
+    base = slugify(title)[: SLUG_MAX_LENGTH - SLUG_SUFFIX_RESERVE].strip("-")
+    # Kirill yoki faqat belgilardan iborat sarlavhalar bo'sh slug beradi
+    return base or SLUG_FALLBACK
+
+
+@cache
+def route_slugs():
+    """``recipes/`` ostidagi statik yo'llar (``featured``, ``export``, ...).
+
+    Ular ``<slug:slug>/`` dan oldin turadi - shunday slugli retsept sahifasi
+    hech qachon ochilmaydi, shuning uchun bu nomlar band hisoblanadi.
+    """
+    from .urls import urlpatterns
+
+    segments = (str(pattern.pattern).split("/")[0] for pattern in urlpatterns)
+    return frozenset(segment for segment in segments if segment and "<" not in segment)
+
+
+def taken_slugs(bases):
+    """Bazalarga tegishli bazadagi band sluglar (bazaning o'zi yoki ``base-...``)"""
+    from .models import Recipe
+
+    bases = sorted(set(bases))
+    taken = set()
+    for start in range(0, len(bases), SLUG_QUERY_CHUNK):
+        chunk = bases[start : start + SLUG_QUERY_CHUNK]
+        # slug__startswith -> LIKE 'base-%', varchar_pattern_ops indeksidan foydalanadi
+        condition = Q(slug__in=chunk) | reduce(
+            or_, (Q(slug__startswith=f"{base}-") for base in chunk)
+        )
+        taken.update(Recipe.objects.filter(condition).values_list("slug", flat=True))
+    return taken
+
+
+def next_suffixes(bases, taken):
+    """Har bir baza uchun keyingi suffiks: ``{base: eng katta band suffiks + 1}``.
+
+    Suffiks faqat aynan o'sha bazaga yoziladi: ``plov-2`` ``plov`` uchun 2,
+    ``plov-2`` bazasi uchun esa 0 (bazaning o'zi) hisoblanadi.
+    """
+    bases = set(bases)
+    numbers = defaultdict(int)
+    for slug in taken:
+        if slug in bases:
+            numbers[slug] = max(numbers[slug], 1)
+        match = SUFFIX_PATTERN.match(slug)
+        if match and match["base"] in bases:
+            numbers[match["base"]] = max(numbers[match["base"]], int(match["n"]) + 1)
+    return numbers
+
+
+def allocate_slugs(titles, reserved=()):
+    """Sarlavhalar ro'yxati uchun noyob sluglar (bulk import uchun).
+
+    Band sluglar bitta so'rovda (har SLUG_QUERY_CHUNK baza uchun) olinadi va
+    keyingi bo'sh raqam (eng katta suffiks + 1) tanlanadi. Har bir nomzod
+    bazadagi va shu ro'yxatda berilgan barcha sluglar bilan tekshiriladi -
+    ``Plov``, ``Plov`` va ``Plov 1`` ham bir-biridan farqli slug oladi.
+    ``reserved`` - bazada bo'lmasa ham band deb hisoblanadigan sluglar
+    (``route_slugs()`` doim qo'shiladi).
+    """
+    bases = [slug_base(title) for title in titles]
+    taken = taken_slugs(bases) | route_slugs() | set(reserved)
+    numbers = next_suffixes(bases, taken)
+    slugs = []
+    for base in bases:
+        number = numbers[base]
+        slug = f"{base}-{number}" if number else base
+        while slug in taken:
+            number += 1
+            slug = f"{base}-{number}"
+        numbers[base] = number + 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def allocate_slug(title):
+    return allocate_slugs([title])[0]
+
+
+def is_slug_conflict(error):
+    """IntegrityError slug unique indeksidan kelganmi"""
+    constraint = getattr(getattr(error.__cause__, "diag", None), "constraint_name", "")
+    return "slug" in (constraint or "")
@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import Coalesce, Lag
+from django.utils import timezone
+
+from categories.models import Category
+
+from .models import Comment, Recipe, StatsSnapshot
+
+User = get_user_model()
+
+SNAPSHOT_FIELDS = (
+    "recipes_total",
+    "recipes_published",
+    "recipes_featured",
+    "users_total",
+    "users_chefs",
+    "users_confirmed",
+    "ratings_total",
+    "ratings_sum",
+    "comments_total",
+)
+
+
+def collect_totals():
+    """Umumiy sonlar: har bir jadval uchun bitta shartli agregatsiya so'rovi.
+
+    Reytinglar soni va yig'indisi Recipe agregat ustunlaridan olinadi, shuning
+    uchun Rating jadvali o'qilmaydi.
+    """
+    recipes = Recipe.objects.aggregate(
+        recipes_total=Count("id"),
+        recipes_published=Count("id", filter=Q(is_draft=False)),
+        recipes_featured=Count("id", filter=Q(is_featured=True)),
+        ratings_total=Coalesce(Sum("rating_count"), 0),
+        ratings_sum=Coalesce(Sum("rating_sum"), 0),
+    )
+    users = User.objects.aggregate(
+        users_total=Count("id"),
+        users_chefs=Count("id", filter=Q(is_chef=True)),
+        users_confirmed=Count("id", filter=Q(email_confirmed=True)),
+    )
+    comments = Comment.objects.aggregate(comments_total=Count("id"))
+    return {**recipes, **users, **comments}
+
+
+def collect_stats(top=5):
+    """``recipe_stats`` hisobotining barcha bo'limlari (jami 5 ta so'rov)"""
+    totals = collect_totals()
+    categories = (
+        Category.objects.annotate(recipe_count=Count("recipe"))
+        .order_by("-recipe_count", "name")
+        .values("id", "name", "recipe_count")
+    )
+    top_recipes = Recipe.objects.filter(
+        is_draft=False, popularity_score__gt=0
+    ).order_by("-popularity_score", "-rating_count")[:top]
+
+    return {
+        "recipes": {
+            "total": totals["recipes_total"],
+            "published": totals["recipes_published"],
+            "drafts": totals["recipes_total"] - totals["recipes_published"],
+            "featured": totals["recipes_featured"],
+        },
+        "categories": list(categories),
+        "users": {
+            "total": totals["users_total"],
+            "chefs": totals["users_chefs"],
+            "confirmed": totals["users_confirmed"],
+        },
+        "ratings": {
+            "total": totals["ratings_total"],
+            "average": (
+                round(totals["ratings_sum"] / totals["ratings_total"], 2)
+                if totals["ratings_total"]
+                else 0
+            ),
+        },
+        "comments": {"total": totals["comments_total"]},
+        "top_recipes": [
+            {
+                "id": str(recipe.pk),
+                "title": recipe.title,
+                "slug": recipe.slug,
+                "average_rating": round(recipe.average_rating(), 2),
+                "ratings_count": recipe.rating_count,
+                "popularity_score": round(recipe.popularity_score, 2),
+            }
+            for recipe in top_recipes
+        ],
+    }
+
+
+def take_snapshot(date=None):
+    """Berilgan kun (default - bugun) uchun snapshot yozish yoki yangilash"""
+    date = date or timezone.localdate()
+    snapshot, _ = StatsSnapshot.objects.update_or_create(
+        date=date, defaults=collect_totals()
+    )
+    return snapshot
+
+
+def snapshot_trend(days):
+    """Oxirgi ``days`` kunlik snapshotlar va oldingi snapshotga nisbatan o'sish"""
+    since = timezone.localdate() - timedelta(days=days)
+    growth = {
+        f"{field}_growth": F(field)
+        - Window(Lag(field), order_by=F("date").asc())
+        for field in ("recipes_total", "users_total", "ratings_total", "comments_total")
+    }
+    # Lag birinchi qatorda oldingi kunni ko'rishi uchun bir kun oldinroqdan olinadi
+    rows = (
+        StatsSnapshot.objects.filter(date__gte=since - timedelta(days=1))
+        .annotate(**growth)
+        .order_by("date")
+        .values("date", *SNAPSHOT_FIELDS, *growth)
+    )
+    return [row for row in rows if row["date"] >= since]
@@ -1,24 +1,26 @@
 import logging
-from datetime import timedelta
 
 from celery import shared_task
-from django.utils import timezone
+
+from core.cache import bump_namespaces
+from core.images import refresh_renditions
 
 from .models import Recipe
+from .publishing import old_drafts_cutoff, publish_old_drafts
+from .stats import take_snapshot
 
 logger = logging.getLogger("dishes")
 
 
 @shared_task
-def publish_old_drafts_task(days=30):
-    """Eski draft retseptlarni avtomatik publish qilish"""
-    cutoff_date = timezone.now() - timedelta(days=days)
-
-    old_drafts = Recipe.objects.filter(is_draft=True, created_at__lt=cutoff_date)
+def publish_old_drafts_task(days=30, chunk_size=500):
+    """Eski draft retseptlarni kichik partiyalarda avtomatik publish qilish"""
+    cutoff_date = old_drafts_cutoff(days)
 
-    count = old_drafts.count()
+    count = 0
+    for rows in publish_old_drafts(cutoff_date, chunk_size=chunk_size):
+        count += len(rows)
     if count > 0:
-        old_drafts.update(is_draft=False)
         logger.info(f"Auto-published {count} old draft recipes")
 
     return f"Published {count} recipes"
@@ -26,14 +28,30 @@ def publish_old_drafts_task(days=30):
 
 @shared_task
 def generate_recipe_thumbnails(recipe_id):
-    """Retsept rasmlari uchun thumbnaillar yaratish"""
+    """Retsept rasmi uchun kichraytirilgan WebP/JPEG variantlar yaratish"""
     try:
-        recipe = Recipe.objects.get(id=recipe_id)
-        if recipe.image:
-            # Thumbnail yaratish logikasi
-            # PIL yoki boshqa kutubxona ishlatilishi mumkin
-            logger.info(f"Generated thumbnail for recipe: {recipe.title}")
-            return f"Thumbnail generated for {recipe.title}"
+        recipe = Recipe.objects.only("id", "title", "image", "image_renditions").get(
+            id=recipe_id
+        )
     except Recipe.DoesNotExist:
         logger.error(f"Recipe {recipe_id} not found for thumbnail generation")
         return f"Recipe {recipe_id} not found"
+
+    renditions = refresh_renditions(recipe, "image", "image_renditions")
+    if renditions is None:
+        # Shu orada rasm almashtirilgan - yangi rasm uchun alohida task ishlaydi
+        return f"Image changed for {recipe.title}, skipped"
+
+    # Ro'yxat javoblarida variantlar ko'rinishi uchun
+    bump_namespaces("recipes", "categories")
+    count = len(renditions.get("renditions", []))
+    logger.info(f"Generated {count} renditions for recipe: {recipe.title}")
+    return f"{count} renditions generated for {recipe.title}"
+
+
+@shared_task
+def take_stats_snapshot():
+    """Kunlik statistika snapshotini yozish (trend hisobotlari uchun)"""
+    snapshot = take_snapshot()
+    logger.info(f"Stats snapshot saved for {snapshot.date}")
+    return f"Snapshot saved for {snapshot.date}"
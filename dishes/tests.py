@@ -1 +1,204 @@
-# Create your tests here.
+from collections import Counter
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from categories.models import Category
+from dishes.ingredients import (
+    cook_with,
+    normalize_ingredient_name,
+    parse_ingredient_line,
+    parse_ingredients,
+    sync_recipe_ingredients,
+)
+from dishes.models import Recipe
+from dishes.ratings import (
+    AGGREGATE_FIELDS,
+    rating_change_deltas,
+    recompute_rating_aggregates,
+    upsert_ratings,
+)
+from dishes.slugs import SLUG_FALLBACK, SLUG_MAX_LENGTH, allocate_slugs, slug_base
+
+User = get_user_model()
+
+
+class RecipeTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            email="chef@example.com", password="pass", first_name="Chef", last_name="Cook"
+        )
+        cls.category = Category.objects.create(name="Main")
+
+    @classmethod
+    def create_recipe(cls, title, **kwargs):
+        kwargs.setdefault("description", "Description")
+        kwargs.setdefault("ingredients", "rice")
+        kwargs.setdefault("instructions", "Cook")
+        return Recipe.objects.create(
+            title=title, author=cls.author, category=cls.category, **kwargs
+        )
+
+
+class SlugBaseTests(SimpleTestCase):
+    def test_slugify_and_truncate(self):
+        self.assertEqual(slug_base("Osh  Plov!"), "osh-plov")
+        base = slug_base("a " * 100)
+        self.assertLessEqual(len(f"{base}-1234567"), SLUG_MAX_LENGTH)
+        self.assertFalse(base.endswith("-"))
+
+    def test_fallback_for_unsluggable_titles(self):
+        self.assertEqual(slug_base("Палов"), SLUG_FALLBACK)
+        self.assertEqual(slug_base("!!!"), SLUG_FALLBACK)
+
+
+class AllocateSlugsTests(RecipeTestMixin, TestCase):
+    def test_unique_within_batch(self):
+        self.assertEqual(
+            allocate_slugs(["Plov", "Plov", "Plov 1", "Manti"]),
+            ["plov", "plov-1", "plov-1-1", "manti"],
+        )
+
+    def test_continues_after_highest_existing_suffix(self):
+        self.create_recipe("Plov")
+        self.create_recipe("Plov", slug="plov-7")
+        self.create_recipe("Plov 2", slug="plov-2-3")
+
+        self.assertEqual(allocate_slugs(["Plov", "Plov"]), ["plov-8", "plov-9"])
+        self.assertEqual(allocate_slugs(["Plov 2"]), ["plov-2-4"])
+
+    def test_other_bases_do_not_count(self):
+        self.create_recipe("Plov Special", slug="plov-special")
+        self.assertEqual(allocate_slugs(["Plov"]), ["plov"])
+
+    def test_reserved_slugs_are_skipped(self):
+        self.assertEqual(allocate_slugs(["Plov"], reserved={"plov", "plov-1"}), ["plov-2"])
+
+    def test_route_slugs_are_skipped(self):
+        self.assertEqual(allocate_slugs(["Featured", "Export"]), ["featured-1", "export-1"])
+
+    def test_recipe_save_assigns_slug(self):
+        first = self.create_recipe("Lagman")
+        second = self.create_recipe("Lagman")
+        self.assertEqual((first.slug, second.slug), ("lagman", "lagman-1"))
+
+
+class RatingDeltaTests(SimpleTestCase):
+    def test_insert_update_and_delete(self):
+        deltas = rating_change_deltas([("a", None, 4), ("a", 4, 2), ("b", 5, None)])
+
+        self.assertEqual(
+            deltas["a"],
+            Counter(rating_count=1, rating_sum=2, rating_2_count=1),
+        )
+        self.assertEqual(
+            deltas["b"],
+            Counter(rating_count=-1, rating_sum=-5, rating_5_count=-1),
+        )
+
+    def test_unchanged_and_cancelled_changes_are_dropped(self):
+        deltas = rating_change_deltas([("a", 3, 3), ("b", None, 5), ("b", 5, None)])
+        self.assertEqual(deltas, {})
+
+
+class UpsertRatingsTests(RecipeTestMixin, TestCase):
+    def aggregates(self, recipe):
+        recipe.refresh_from_db()
+        return {field: getattr(recipe, field) for field in AGGREGATE_FIELDS}
+
+    def test_aggregates_match_recompute(self):
+        plov, manti = self.create_recipe("Plov"), self.create_recipe("Manti")
+        critic = User.objects.create_user(
+            email="critic@example.com", password="pass", first_name="A", last_name="B"
+        )
+
+        upsert_ratings(self.author, [(plov.pk, 3, "ok"), (manti.pk, 5, "")])
+        upsert_ratings(critic, [(plov.pk, 5, "")])
+        # Bir retsept uchun oxirgi baho olinadi; review=None sharhni saqlaydi
+        results = upsert_ratings(
+            self.author, [(plov.pk, 1, None), (plov.pk, 4, None), (manti.pk, 2, None)]
+        )
+
+        self.assertEqual(sorted(created for _, created in results), [False, False])
+        self.assertEqual(self.author.rating_set.get(recipe=plov).review, "ok")
+        expected = {plov: self.aggregates(plov), manti: self.aggregates(manti)}
+        self.assertEqual(expected[plov]["rating_sum"], 9)
+        self.assertEqual(expected[plov]["rating_4_count"], 1)
+        self.assertEqual(expected[plov]["rating_3_count"], 0)
+
+        recompute_rating_aggregates([plov.pk, manti.pk])
+        for recipe, aggregates in expected.items():
+            self.assertEqual(self.aggregates(recipe), aggregates)
+
+
+class IngredientParsingTests(SimpleTestCase):
+    def test_parse_ingredient_line(self):
+        cases = {
+            "200 g rice": ("rice", Decimal("200.00"), "g"),
+            "- 2 eggs": ("egg", Decimal("2.00"), ""),
+            "rice - 200 g": ("rice", Decimal("200.00"), "g"),
+            "tuxum 3 ta": ("tuxum", Decimal("3.00"), "pcs"),
+            "1 1/2 cups of flour": ("flour", Decimal("1.50"), "cup"),
+            "½ tsp salt": ("salt", Decimal("0.50"), "tsp"),
+            "2 ст. л. сахара": ("сахара", Decimal("2.00"), "tbsp"),
+            "2-3 potatoes": ("potato", Decimal("2.00"), ""),
+            "Onion, chopped (large)": ("onion", None, ""),
+            "100000000 g sugar": ("sugar", None, "g"),
+        }
+        for line, expected in cases.items():
+            with self.subTest(line=line):
+                self.assertEqual(parse_ingredient_line(line), expected)
+
+    def test_line_without_name(self):
+        self.assertIsNone(parse_ingredient_line("!!!"))
+        self.assertIsNone(parse_ingredient_line("200 g"))
+
+    def test_normalize_ingredient_name(self):
+        self.assertEqual(normalize_ingredient_name("Fresh Tomatoes (ripe)"), "fresh tomato")
+        self.assertEqual(normalize_ingredient_name("Cherries, pitted"), "cherry")
+        self.assertEqual(normalize_ingredient_name("Glass"), "glass")
+
+    def test_parse_ingredients_skips_blank_and_duplicate_lines(self):
+        self.assertEqual(
+            parse_ingredients("2 eggs\n\n1 egg\n* salt\n!!!\nflour"),
+            [(0, "egg", Decimal("2.00"), ""), (2, "salt", None, ""), (4, "flour", None, "")],
+        )
+        self.assertEqual(parse_ingredients(None), [])
+
+
+class CookWithTests(RecipeTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.plov = cls.create_recipe(
+            "Plov",
+            is_draft=False,
+            ingredients="500 g rice\n2 carrots\n1 onion",
+            ingredients_uz="500 g guruch\n2 ta sabzi\n1 ta piyoz",
+        )
+        # Faqat uz tilida yozilgan retsept
+        cls.salad = cls.create_recipe(
+            "Salad", is_draft=False, ingredients="", ingredients_uz="pomidor\nbodring"
+        )
+        sync_recipe_ingredients([cls.plov.pk, cls.salad.pk])
+
+    def missing(self, names, missing_max=None):
+        queryset = cook_with(Recipe.objects.all(), names, missing_max)
+        return dict(queryset.values_list("title", "missing_ingredients"))
+
+    def test_translations_count_once(self):
+        self.plov.refresh_from_db()
+        self.salad.refresh_from_db()
+        self.assertEqual((self.plov.ingredient_count, self.salad.ingredient_count), (3, 2))
+        # "rice" va "guruch" bitta pozitsiya - ikki marta sanalmaydi
+        self.assertEqual(self.missing(["Rice", "guruch", "sabzi"]), {"Plov": 1})
+
+    def test_uz_only_recipe(self):
+        self.assertEqual(self.missing(["pomidor", "onion"]), {"Salad": 1, "Plov": 2})
+
+    def test_missing_max(self):
+        self.assertEqual(self.missing(["pomidor", "onion"], missing_max=1), {"Salad": 1})
+        self.assertEqual(self.missing(["pomidor", "bodring"], missing_max=0), {"Salad": 0})
+        self.assertEqual(self.missing(["mango"]), {})
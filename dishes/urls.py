@@ -1,21 +1,44 @@
 from django.urls import path
+
+from core.async_views import select_view
+
 from . import views
 
 app_name = "dishes"
 
 urlpatterns = [
     # Recipes
-    path("", views.RecipeListCreateView.as_view(), name="recipe_list_create"),
-    path("<slug:slug>/", views.RecipeDetailView.as_view(), name="recipe_detail"),
-    path("featured/", views.FeaturedRecipesView.as_view(), name="featured_recipes"),
-    path("popular/", views.PopularRecipesView.as_view(), name="popular_recipes"),
+    path(
+        "",
+        select_view(views.RecipeListCreateView, views.AsyncRecipeListCreateView).as_view(),
+        name="recipe_list_create",
+    ),
+    path(
+        "featured/",
+        select_view(views.FeaturedRecipesView, views.AsyncFeaturedRecipesView).as_view(),
+        name="featured_recipes",
+    ),
+    path(
+        "popular/",
+        select_view(views.PopularRecipesView, views.AsyncPopularRecipesView).as_view(),
+        name="popular_recipes",
+    ),
+    path("export/", views.RecipeExportView.as_view(), name="export_recipes"),
+    path("my-ratings/", views.MyRatingsView.as_view(), name="my_ratings"),
+    path(
+        "<slug:slug>/",
+        select_view(views.RecipeDetailView, views.AsyncRecipeDetailView).as_view(),
+        name="recipe_detail",
+    ),
 
     # Ratings
+    path("ratings/bulk/", views.RatingBulkUpsertView.as_view(), name="bulk_ratings"),
     path("<slug:recipe_id>/ratings/", views.RatingListCreateView.as_view(), name="recipe_ratings"),
     path("<slug:recipe_id>/ratings/delete/", views.RatingDeleteView.as_view(), name="delete_rating"),
 
     # Comments
     path("<slug:recipe_id>/comments/", views.CommentListCreateView.as_view(), name="recipe_comments"),
     path("comments/<int:pk>/", views.CommentDetailView.as_view(), name="comment_detail"),
+    path("comments/<int:pk>/replies/", views.CommentRepliesView.as_view(), name="comment_replies"),
     path('', views.home, name='home'),
 ]
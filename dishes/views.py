@@ -1,16 +1,30 @@
 import logging
 
-from django.db.models import Avg, Count
 from django_filters.rest_framework import DjangoFilterBackend as DjangoFilterFilter
+from django_filters.utils import translate_validation
 from rest_framework import filters, generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.async_views import AsyncAPIViewMixin
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
+
+from .comments import load_comment_threads, thread_replies_queryset
+from .exporting import aiter_chunks, filter_export_queryset, iter_gzip, iter_ndjson
 from .filters import RecipeFilter
+from .ingredients import RecipeIngredientFilter
 from .models import Comment, Rating, Recipe
+from .ratings import upsert_ratings, with_user_rating
+from .search import RecipeFullTextSearchFilter
 from .serializers import (
     CommentCreateUpdateSerializer,
+    CommentReplySerializer,
     CommentSerializer,
+    MyRatingsQuerySerializer,
+    RatingBulkSerializer,
     RatingCreateUpdateSerializer,
     RatingSerializer,
     RecipeCreateUpdateSerializer,
@@ -18,6 +32,8 @@ from .serializers import (
     RecipeListSerializer,
 )
 
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
 from django.utils import timezone
 
@@ -27,19 +43,24 @@ logger = logging.getLogger("dishes")
 # -------------------- RECIPE VIEWS --------------------
 class RecipeListCreateView(generics.ListCreateAPIView):
     serializer_class = RecipeListSerializer
-    filter_backends = [DjangoFilterFilter, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [
+        DjangoFilterFilter,
+        filters.SearchFilter,
+        filters.OrderingFilter,
+        RecipeFullTextSearchFilter,
+        RecipeIngredientFilter,
+    ]
     filterset_class = RecipeFilter
+    pagination_class = KeysetPagination
     search_fields = ["title", "description", "ingredients"]
-    ordering_fields = ["created_at", "title", "prep_time", "cook_time"]
+    ordering_fields = ["created_at", "title", "prep_time", "cook_time", "total_time"]
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        queryset = Recipe.objects.select_related("author", "category").annotate(
-            ratings_count=Count("rating")
-        )
+        queryset = Recipe.objects.select_related("author", "category")
         if not self.request.user.is_authenticated or self.request.GET.get("my_recipes") != "true":
             queryset = queryset.filter(is_draft=False)
-        return queryset
+        return with_user_rating(queryset, self.request.user)
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -56,10 +77,15 @@ class RecipeListCreateView(generics.ListCreateAPIView):
         logger.info(f"New recipe created: {recipe.title} by {recipe.author.email}")
 
 
-class RecipeDetailView(generics.RetrieveUpdateDestroyAPIView):
+class RecipeDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = RecipeDetailSerializer
     queryset = Recipe.objects.select_related("author", "category")
     lookup_field = "slug"
+    # Ichki category.recipes_count retsept saqlanganda o'zgaradi
+    conditional_namespaces = ("categories",)
+
+    def get_queryset(self):
+        return with_user_rating(super().get_queryset(), self.request.user)
 
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
@@ -73,7 +99,30 @@ class RecipeDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_object(self):
         obj = super().get_object()
+        self.check_recipe_access(obj)
+        return obj
+
+    def get_validator_queryset(self):
+        return Recipe.objects.filter(slug=self.kwargs["slug"]).values_list(
+            "updated_at", "rating_version", "author__updated_at", "is_draft", "author_id"
+        )
+
+    def get_validator_row(self):
+        return self.visible_validator_row(self.get_validator_queryset().first())
+
+    async def aget_validator_row(self):
+        return self.visible_validator_row(await self.get_validator_queryset().afirst())
 
+    def visible_validator_row(self, row):
+        """Qoralama boshqalarga ko'rinmaydi - 404 ni oddiy yo'l qaytaradi"""
+        if row is None:
+            return None
+        *versions, is_draft, author_id = row
+        if is_draft and self.request.user.pk != author_id:
+            return None
+        return versions
+
+    def check_recipe_access(self, obj):
         if obj.is_draft and (not self.request.user.is_authenticated or obj.author != self.request.user):
             from django.http import Http404
             raise Http404("Recipe not found.")
@@ -84,35 +133,103 @@ class RecipeDetailView(generics.RetrieveUpdateDestroyAPIView):
                 logger.warning(f"User {self.request.user.email} tried to access recipe {obj.id} they don't own")
                 raise PermissionDenied("You can only edit your own recipes.")
 
-        return obj
-
 
-class FeaturedRecipesView(generics.ListAPIView):
+class FeaturedRecipesView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
     """Featured retseptlar"""
     serializer_class = RecipeListSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespaces = ("recipes",)
+    conditional_namespaces = ("recipes",)
 
     def get_queryset(self):
-        return Recipe.objects.filter(is_featured=True, is_draft=False)\
-            .select_related("author", "category")\
-            .order_by("-created_at")[:10]
+        queryset = Recipe.objects.filter(is_featured=True, is_draft=False)\
+            .select_related("author", "category")
+        return with_user_rating(queryset, self.request.user).order_by("-created_at")[:10]
 
 
-class PopularRecipesView(generics.ListAPIView):
-    """Ommabop retseptlar (reyting bo'yicha)"""
+class PopularRecipesView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    """Ommabop retseptlar (Bayes reytingi bo'yicha, ?category= bilan kategoriya ichida)"""
     serializer_class = RecipeListSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespaces = ("recipes",)
+    conditional_namespaces = ("recipes",)
 
     def get_queryset(self):
-        return Recipe.objects.filter(is_draft=False)\
-            .annotate(avg_rating=Avg("rating__rating"), ratings_count=Count("rating"))\
-            .filter(ratings_count__gte=3)\
-            .order_by("-avg_rating", "-ratings_count")[:10]
+        # popularity_score reyting yozilganda yangilanadi - bu shunchaki indeks skani
+        queryset = Recipe.objects.filter(is_draft=False, popularity_score__gt=0)\
+            .select_related("author", "category")
+        category = self.request.query_params.get("category")
+        if category:
+            if not category.isdigit():
+                raise ValidationError({"category": "A valid category id is required."})
+            queryset = queryset.filter(category_id=category)
+        return with_user_rating(queryset, self.request.user)\
+            .order_by("-popularity_score", "-rating_count")[:10]
+
+
+class RecipeExportView(APIView):
+    """Barcha retseptlarni NDJSON (ixtiyoriy gzip) ko'rinishida oqim bilan eksport qilish"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        queryset, errors = filter_export_queryset(request.query_params)
+        if errors:
+            raise translate_validation(errors)
+
+        chunks = iter_ndjson(queryset)
+        filename = "recipes.ndjson"
+        content_type = "application/x-ndjson"
+        if request.query_params.get("gzip") == "true":
+            chunks = iter_gzip(chunks)
+            filename += ".gz"
+            content_type = "application/gzip"
+
+        if settings.ASYNC_API_VIEWS:
+            # ASGI (core/asgi.py) ostida sync iterator oldindan to'liq o'qiladi
+            chunks = aiter_chunks(chunks)
+
+        logger.info(f"Recipe export started by {request.user.email}")
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+# -------------------- ASYNC RECIPE VIEWS (ASGI) --------------------
+class AsyncRecipeListCreateView(AsyncAPIViewMixin, RecipeListCreateView):
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncRecipeDetailView(AsyncAPIViewMixin, RecipeDetailView):
+    async def aget_object(self):
+        obj = await super().aget_object()
+        self.check_recipe_access(obj)
+        return obj
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aget_conditional_response(request, self.aretrieve, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        # Model metodi o'rniga - CategoryListSerializer aks holda sync COUNT bajaradi
+        instance.category.recipes_count = await instance.category.recipe_set.acount()
+        return Response(self.get_serializer(instance).data)
+
+
+class AsyncFeaturedRecipesView(AsyncAPIViewMixin, FeaturedRecipesView):
+    async def get(self, request, *args, **kwargs):
+        return await self.aget_conditional_response(request, self.acached_list, *args, **kwargs)
+
+
+class AsyncPopularRecipesView(AsyncAPIViewMixin, PopularRecipesView):
+    async def get(self, request, *args, **kwargs):
+        return await self.aget_conditional_response(request, self.acached_list, *args, **kwargs)
 
 
 # -------------------- RATING VIEWS --------------------
 class RatingListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         recipe_id = self.kwargs.get("recipe_id")
@@ -124,21 +241,65 @@ class RatingListCreateView(generics.ListCreateAPIView):
         return RatingSerializer
 
     def create(self, request, *args, **kwargs):
-        recipe_id = self.kwargs.get("recipe_id")
-        existing_rating = Rating.objects.filter(recipe_id=recipe_id, user=request.user).first()
-
-        if existing_rating:
-            serializer = RatingCreateUpdateSerializer(existing_rating, data=request.data)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        else:
-            data = request.data.copy()
-            data["recipe"] = recipe_id
-            serializer = self.get_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        data = request.data.copy()
+        data["recipe"] = self.kwargs.get("recipe_id")
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        # SELECT + INSERT/UPDATE o'rniga bitta atomar upsert
+        [(rating, created)] = upsert_ratings(
+            request.user,
+            [
+                (
+                    serializer.validated_data["recipe"].pk,
+                    serializer.validated_data["rating"],
+                    serializer.validated_data.get("review"),
+                )
+            ],
+        )
+        return Response(
+            RatingCreateUpdateSerializer(rating).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class RatingBulkUpsertView(APIView):
+    """Ko'p reytingni bitta batch so'rov bilan yozish"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = RatingBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = upsert_ratings(
+            request.user,
+            [
+                (item["recipe"], item["rating"], item.get("review"))
+                for item in serializer.validated_data["ratings"]
+            ],
+        )
+        created = sum(1 for _, inserted in results if inserted)
+        return Response(
+            {
+                "created": created,
+                "updated": len(results) - created,
+                "results": RatingSerializer(
+                    [rating for rating, _ in results], many=True
+                ).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class MyRatingsView(APIView):
+    """Foydalanuvchining bir nechta retseptga bergan baholari (?ids=) - bitta so'rov"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        serializer = MyRatingsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        ratings = Rating.objects.filter(
+            user=request.user, recipe_id__in=serializer.validated_data["ids"]
+        ).values_list("recipe_id", "rating")
+        return Response({"ratings": {str(recipe_id): rating for recipe_id, rating in ratings}})
 
 
 class RatingDeleteView(APIView):
@@ -157,6 +318,7 @@ class RatingDeleteView(APIView):
 # -------------------- COMMENT VIEWS --------------------
 class CommentListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         recipe_id = self.kwargs.get("recipe_id")
@@ -168,6 +330,17 @@ class CommentListCreateView(generics.ListCreateAPIView):
             return CommentCreateUpdateSerializer
         return CommentSerializer
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        comments = page if page is not None else list(queryset)
+        # Sahifadagi barcha thread'lar javoblari bilan bitta so'rovda yuklanadi
+        load_comment_threads(comments)
+        serializer = self.get_serializer(comments, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
     def create(self, request, *args, **kwargs):
         data = request.data.copy()
         data["recipe"] = self.kwargs.get("recipe_id")
@@ -187,6 +360,25 @@ class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
         if obj.user != self.request.user and not self.request.user.is_staff:
             from django.core.exceptions import PermissionDenied
             raise PermissionDenied("You can only edit your own comments.")
+        if obj.parent_id is None:
+            load_comment_threads([obj])
+        return obj
+
+
+class CommentRepliesView(generics.ListAPIView):
+    """Thread javoblarining keyingi sahifalari (path tartibida)"""
+    serializer_class = CommentReplySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    filter_backends = []
+
+    def get_queryset(self):
+        comment = generics.get_object_or_404(
+            Comment.objects.only("pk", "root_id", "path", "depth"),
+            pk=self.kwargs["pk"],
+            is_active=True,
+        )
+        return thread_replies_queryset(comment)
 
 def home(request):
     # Faqat "featured" bo'lgan retseptlarni olib kelamiz
@@ -1,8 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .models import User
+from .models import OutboxEmail, User
+from .outbox import schedule_dispatch
 
 
 @admin.register(User)
@@ -103,3 +105,23 @@ class CustomUserAdmin(UserAdmin):
         self.message_user(request, _("Email confirmed for selected users."))
 
     confirm_email.short_description = _("Confirm email for selected users")
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("to", "subject", "provider", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status", "provider")
+    search_fields = ("to", "subject")
+    readonly_fields = ("attempts", "last_error", "sent_at", "created_at", "updated_at")
+    ordering = ("-created_at",)
+
+    actions = ["retry_now"]
+
+    def retry_now(self, request, queryset):
+        queryset.exclude(status=OutboxEmail.Status.SENT).update(
+            status=OutboxEmail.Status.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        schedule_dispatch(countdown=0)
+        self.message_user(request, _("Selected emails queued for sending."))
+
+    retry_now.short_description = _("Retry selected emails now")
@@ -0,0 +1,55 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.outbox import dispatch_outbox, enqueue_email
+
+logger = logging.getLogger("users")
+
+
+class Command(BaseCommand):
+    help = "Send pending outbox emails in batches over one SMTP connection per provider"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--provider",
+            action="append",
+            default=[],
+            help="Only dispatch this provider (repeatable, default: all providers)",
+        )
+        parser.add_argument(
+            "--test-to",
+            action="append",
+            default=[],
+            help="Queue a test email to this address before dispatching (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["provider"]) - set(settings.EMAIL_OUTBOX_PROVIDERS)
+        if unknown:
+            raise CommandError(f"Unknown provider(s): {', '.join(sorted(unknown))}")
+
+        for address in options["test_to"]:
+            enqueue_email(
+                address,
+                "Culinary Canvas test email",
+                "This is a test message from the email outbox.",
+                provider=(options["provider"] or ["default"])[0],
+            )
+
+        started = time.perf_counter()
+        stats = dispatch_outbox(options["provider"] or None)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{stats['sent']} sent, {stats['retry']} to retry, {stats['failed']} failed, "
+            f"{stats['expired']} expired in {elapsed:.2f}s"
+        )
+        if stats["throttled"]:
+            self.stdout.write(
+                self.style.WARNING("Rate limit reached - remaining emails are sent next minute")
+            )
+        self.stdout.write(self.style.SUCCESS(f"Successfully sent {stats['sent']} emails"))
+        logger.info(f"Dispatched outbox: {stats['sent']} sent, {stats['retry']} to retry")
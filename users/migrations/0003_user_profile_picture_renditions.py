@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_user_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_picture_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Profile picture renditions'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=models.ImageField(blank=True, default='static/image.png', help_text='Upload your profile picture', null=True, upload_to='profiles/%Y/%m/%d/', verbose_name='Profile picture'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.functions import Concat, Lower
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from .managers import CustomUserManager  # <-- qo'shing
 
@@ -17,6 +20,10 @@ class User(AbstractUser):
         help_text=_("Upload your profile picture"),
         default="static/image.png"
     )
+    # Kichraytirilgan WebP/JPEG variantlar (core.images, Celery orqali yaratiladi)
+    profile_picture_renditions = models.JSONField(
+        _("Profile picture renditions"), default=dict, blank=True, editable=False
+    )
     telegram_id = models.BigIntegerField(
         _("Telegram ID"),
         null=True,
@@ -24,6 +31,22 @@ class User(AbstractUser):
         help_text=_("Telegram user ID for bot integration"),
     )
     email_confirmed = models.BooleanField(_("Email confirmed"), default=False)
+    # "ism familiya email" kichik harflarda - pg_trgm GIN indeksi bilan qidiriladi (users.search)
+    search_name = models.GeneratedField(
+        expression=Lower(
+            Concat(
+                "first_name",
+                models.Value(" "),
+                "last_name",
+                models.Value(" "),
+                "email",
+                output_field=models.TextField(),
+            )
+        ),
+        output_field=models.TextField(),
+        db_persist=True,
+        verbose_name=_("Search name"),
+    )
     created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
 
@@ -36,9 +59,59 @@ class User(AbstractUser):
         verbose_name = _("User")
         verbose_name_plural = _("Users")
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(
+                fields=["search_name"],
+                name="users_user_search_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
 
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
+
+
+class OutboxEmail(models.Model):
+    """Yuborilishi kerak bo'lgan xat (users.outbox dispatcheri partiyalab yuboradi)"""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+        EXPIRED = "expired", _("Expired")
+
+    provider = models.CharField(_("Provider"), max_length=50, default="default")
+    to = models.EmailField(_("To"))
+    from_email = models.CharField(_("From"), max_length=254, blank=True)
+    subject = models.CharField(_("Subject"), max_length=255)
+    body = models.TextField(_("Body"))
+    status = models.CharField(
+        _("Status"), max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    last_error = models.TextField(_("Last error"), blank=True)
+    # Navbatdagi urinish: backoff yoki dispatcher "ijarasi" (ishchi o'lsa xat qaytadan olinadi)
+    next_attempt_at = models.DateTimeField(_("Next attempt at"), default=timezone.now)
+    # Shu vaqtdan keyin yuborilmaydi (masalan, muddati o'tgan tasdiqlash kodi)
+    expires_at = models.DateTimeField(_("Expires at"), null=True, blank=True)
+    sent_at = models.DateTimeField(_("Sent at"), null=True, blank=True)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Outbox email")
+        verbose_name_plural = _("Outbox emails")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["provider", "next_attempt_at"],
+                name="users_outbox_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.to}: {self.subject} ({self.status})"
@@ -0,0 +1,257 @@
+import logging
+import random
+import smtplib
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from core.redis_client import get_redis
+
+from .models import OutboxEmail
+
+logger = logging.getLogger("users")
+
+RATE_KEY = "email_outbox:rate:{}:{}"
+SCHEDULED_KEY = "email_outbox:scheduled"
+
+# Faqat bitta xatga tegishli xatolar - ulanish ochiq qoladi (ValueError - noto'g'ri manzil)
+MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+    ValueError,
+)
+
+
+def get_provider(name):
+    return settings.EMAIL_OUTBOX_PROVIDERS[name]
+
+
+def enqueue_email(to, subject, body, from_email=None, provider="default", expires_in=None):
+    """Xatni outbox'ga yozish; dispatcher tranzaksiya commit bo'lgach rejalashtiriladi.
+
+    ``expires_in`` (s) - shu vaqtdan keyin xat yuborilmaydi (masalan, tasdiqlash kodi).
+    """
+    get_provider(provider)
+    email = OutboxEmail.objects.create(
+        provider=provider,
+        to=to,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        subject=subject,
+        body=body,
+        expires_at=timezone.now() + timedelta(seconds=expires_in) if expires_in else None,
+    )
+    transaction.on_commit(schedule_dispatch)
+    return email
+
+
+def schedule_dispatch(countdown=None):
+    """Dispatcher taskini rejalashtirish.
+
+    Kalit mavjud bo'lsa task allaqachon navbatda - shu oraliqdagi xatlar bitta
+    partiyaga tushadi (har bir xat uchun alohida task va ulanish ochilmaydi).
+    """
+    from .tasks import dispatch_email_outbox
+
+    if countdown is None:
+        countdown = settings.EMAIL_OUTBOX_DISPATCH_DELAY
+    try:
+        if not get_redis().set(SCHEDULED_KEY, 1, nx=True, ex=max(int(countdown), 1)):
+            return False
+    except Exception as e:
+        logger.error(f"Outbox schedule error: {e!s}")
+    dispatch_email_outbox.apply_async(countdown=countdown)
+    return True
+
+
+def acquire_send_slots(provider, wanted):
+    """Provayderning daqiqalik limitidan ``wanted`` tagacha joy olish.
+
+    Hisoblagich Redis'da - limit barcha Celery ishchilari uchun umumiy.
+    """
+    limit = get_provider(provider)["RATE_LIMIT"]
+    if not limit:
+        return wanted
+    key = RATE_KEY.format(provider, int(time.time() // 60))
+    try:
+        with get_redis().pipeline() as pipe:
+            pipe.incrby(key, wanted)
+            pipe.expire(key, 120)
+            used, _ = pipe.execute()
+        granted = max(0, min(wanted, limit - (used - wanted)))
+        if granted < wanted:
+            get_redis().decrby(key, wanted - granted)
+        return granted
+    except Exception as e:
+        # Limitni tekshirib bo'lmasa yubormaymiz - provayder bloklamasin
+        logger.error(f"Outbox rate limit error ({provider}): {e!s}")
+        return 0
+
+
+def release_send_slots(provider, count):
+    """Ishlatilmagan joylarni joriy daqiqa hisoblagichiga qaytarish"""
+    if not count or not get_provider(provider)["RATE_LIMIT"]:
+        return
+    try:
+        get_redis().decrby(RATE_KEY.format(provider, int(time.time() // 60)), count)
+    except Exception as e:
+        logger.error(f"Outbox rate limit error ({provider}): {e!s}")
+
+
+def seconds_until_next_window():
+    return 60 - int(time.time() % 60)
+
+
+def retry_delay(attempts):
+    """Eksponensial backoff (±20% jitter - xatlar bir vaqtda qaytmasligi uchun)"""
+    delay = min(
+        settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_RETRY_MAX_DELAY,
+    )
+    return delay * random.uniform(0.8, 1.2)
+
+
+def expire_emails():
+    """Muddati o'tgan xatlarni yubormasdan yopish"""
+    return OutboxEmail.objects.filter(
+        status=OutboxEmail.Status.PENDING, expires_at__lt=timezone.now()
+    ).update(status=OutboxEmail.Status.EXPIRED, updated_at=timezone.now())
+
+
+def claim_batch(provider, size):
+    """Navbatdagi xatlarni olish (``SKIP LOCKED`` - parallel dispatcherlar to'qnashmaydi).
+
+    Olingan xatlarning ``next_attempt_at`` qiymati ``EMAIL_OUTBOX_LEASE`` ga
+    suriladi: ishchi yuborish o'rtasida o'lsa, xat shundan keyin qayta olinadi.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(provider=provider, status=OutboxEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")
+            .values_list("pk", flat=True)[:size]
+        )
+        OutboxEmail.objects.filter(pk__in=ids).update(
+            next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        )
+    return list(OutboxEmail.objects.filter(pk__in=ids).order_by("created_at"))
+
+
+def build_message(email, connection):
+    return EmailMessage(
+        email.subject,
+        email.body,
+        email.from_email or settings.DEFAULT_FROM_EMAIL,
+        [email.to],
+        connection=connection,
+    )
+
+
+def send_batch(connection, emails):
+    """Xatlarni ochiq ulanish orqali birma-bir yuborish.
+
+    Qaytaradi: ``(sent, failures, healthy)``. Ulanish xatosida (uzilish,
+    autentifikatsiya, timeout) qolgan xatlar ham muvaffaqiyatsiz deb
+    belgilanadi va ``healthy=False`` bo'ladi.
+    """
+    try:
+        # Oldindan ochilgan ulanishni send_messages() yopmaydi - partiyalar orasida qayta ishlatiladi
+        connection.open()
+    except (smtplib.SMTPException, OSError) as e:
+        return [], [(email, e) for email in emails], False
+
+    sent, failures = [], []
+    for index, email in enumerate(emails):
+        try:
+            connection.send_messages([build_message(email, connection)])
+        except MESSAGE_ERRORS as e:
+            failures.append((email, e))
+        except (smtplib.SMTPException, OSError) as e:
+            failures.extend((rest, e) for rest in emails[index:])
+            return sent, failures, False
+        else:
+            sent.append(email)
+    return sent, failures, True
+
+
+def record_results(sent, failures):
+    """Natijalarni yozish: yuborilganlar, qayta urinish va yakuniy xatolar soni"""
+    now = timezone.now()
+    stats = Counter()
+    if sent:
+        stats["sent"] = OutboxEmail.objects.filter(pk__in=[email.pk for email in sent]).update(
+            status=OutboxEmail.Status.SENT, sent_at=now, last_error="", updated_at=now
+        )
+    for email, error in failures:
+        email.attempts += 1
+        email.last_error = f"{type(error).__name__}: {error!s}"
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboxEmail.Status.FAILED
+            stats["failed"] += 1
+            logger.error(f"Email to {email.to} failed after {email.attempts} attempts: {error!s}")
+        else:
+            email.next_attempt_at = now + timedelta(seconds=retry_delay(email.attempts))
+            stats["retry"] += 1
+        email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at", "updated_at"])
+    return stats
+
+
+def dispatch_provider(provider):
+    """Bitta provayder xatlarini limit doirasida bitta SMTP ulanishi orqali yuborish"""
+    batch_size = get_provider(provider)["BATCH_SIZE"]
+    stats = Counter()
+    connection = None
+    try:
+        while True:
+            slots = acquire_send_slots(provider, batch_size)
+            if not slots:
+                # Limit tugadi - keyingi daqiqada davom etamiz
+                if OutboxEmail.objects.filter(
+                    provider=provider,
+                    status=OutboxEmail.Status.PENDING,
+                    next_attempt_at__lte=timezone.now(),
+                ).exists():
+                    stats["throttled"] += 1
+                    schedule_dispatch(countdown=seconds_until_next_window())
+                break
+
+            emails = claim_batch(provider, slots)
+            release_send_slots(provider, slots - len(emails))
+            if not emails:
+                break
+
+            if connection is None:
+                connection = get_connection(
+                    fail_silently=False, **get_provider(provider).get("OPTIONS", {})
+                )
+            sent, failures, healthy = send_batch(connection, emails)
+            stats.update(record_results(sent, failures))
+            if not healthy:
+                logger.error(f"Email connection error ({provider}): {failures[-1][1]!s}")
+                break
+            if len(emails) < slots:
+                break
+    finally:
+        if connection is not None:
+            try:
+                connection.close()
+            except (smtplib.SMTPException, OSError):
+                pass
+    return stats
+
+
+def dispatch_outbox(providers=None):
+    """Outbox'dagi xatlarni provayderlar bo'yicha partiyalab yuborish.
+
+    Qaytaradi: ``{"sent": n, "retry": n, "failed": n, "expired": n, "throttled": n}``.
+    """
+    stats = Counter(expired=expire_emails())
+    for provider in providers or settings.EMAIL_OUTBOX_PROVIDERS:
+        stats.update(dispatch_provider(provider))
+    return {key: stats[key] for key in ("sent", "retry", "failed", "expired", "throttled")}
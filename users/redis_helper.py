@@ -1,34 +1,44 @@
 import logging
-import redis
+
+from core.redis_client import get_async_redis, get_redis
 
 logger = logging.getLogger("django")
 
+EMAIL_VERIFY_KEY = "email_verify:{}"
+EMAIL_VERIFY_TTL = 120  # tasdiqlash kodi amal qilish muddati (s)
+
 
 class RedisHelper:
-    def __init__(self):
-        self.redis_client = redis.Redis(
-            host="localhost", port=6379, db=0, decode_responses=True
-        )
+    """Umumiy ``REDIS_URL`` pool'i ustidagi yordamchi (web va Celery uchun bitta)"""
+
+    @property
+    def redis_client(self):
+        return get_redis()
 
-    def set_email_verification_code(self, user_id, code, expiry=120):
+    def set_email_verification_code(self, user_id, code, expiry=EMAIL_VERIFY_TTL):
         """Email verify kodini saqlash (2 daqiqa default)"""
         try:
-            key = f"email_verify:{user_id}"
-            self.redis_client.setex(key, expiry, code)
+            self.redis_client.setex(EMAIL_VERIFY_KEY.format(user_id), expiry, code)
             return True
         except Exception as e:
             logger.error(f"Redis set error: {e!s}")
             return False
 
     def get_email_verification_code(self, user_id):
-        """Email verify kodini olish"""
+        """Email verify kodini olish va o'chirish (GETDEL - bitta atomar buyruq)"""
         try:
-            key = f"email_verify:{user_id}"
-            code = self.redis_client.get(key)
-            if code:
-                self.redis_client.delete(key)  # Kod ishlatilgandan keyin o'chirish
-                return code
+            return self.redis_client.getdel(EMAIL_VERIFY_KEY.format(user_id))
+        except Exception as e:
+            logger.error(f"Redis get error: {e!s}")
             return None
+
+    async def aget_email_verification_code(self, user_id):
+        """``get_email_verification_code`` ning asyncio varianti"""
+        try:
+            return await get_async_redis().getdel(EMAIL_VERIFY_KEY.format(user_id))
         except Exception as e:
             logger.error(f"Redis get error: {e!s}")
             return None
+
+
+redis_helper = RedisHelper()
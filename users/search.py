@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Exists, OuterRef, Q
+
+User = get_user_model()
+
+
+def normalize_search_query(query):
+    """``search_name`` ustuni bilan bir xil ko'rinish: kichik harf, bitta probel"""
+    return " ".join(query.lower().split())
+
+
+def search_users(query, queryset=None):
+    """Ism, familiya yoki email bo'yicha foydalanuvchilar (o'xshashlik bo'yicha saralangan).
+
+    Qism-satr (``LIKE '%...%'``) va xatoli yozuvlar (``%>`` trigram word
+    similarity) ``search_name`` ustunidagi ``gin_trgm_ops`` indeksidan foydalanadi.
+    """
+    query = normalize_search_query(query)
+    if queryset is None:
+        queryset = User.objects.all()
+    if not query:
+        return queryset.none()
+    return (
+        queryset.filter(
+            Q(search_name__contains=query) | Q(search_name__trigram_word_similar=query)
+        )
+        .annotate(similarity=TrigramWordSimilarity(query, "search_name"))
+        .order_by("-similarity", "pk")
+    )
+
+
+def author_matches(query, field="author_id"):
+    """Muallifi ``query`` ni o'z ichiga olgan qatorlar sharti (``queryset.filter(...)`` uchun).
+
+    Korrelyatsiyalangan ``EXISTS`` - mos mualliflar soni cheklanmaydi va
+    ``LIKE '%...%'`` ``search_name`` trigram indeksidan foydalanadi. Xatoli
+    yozuvlar (``%>``) qo'shilmaydi - bu faqat ``search_users`` uchun.
+    """
+    query = normalize_search_query(query)
+    if not query:
+        return Q(pk__in=[])
+    return Exists(User.objects.filter(pk=OuterRef(field), search_name__contains=query))
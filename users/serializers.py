@@ -3,11 +3,14 @@ from django.contrib.auth.password_validation import validate_password
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from core.images import ImageRenditionsField
+
 User = get_user_model()
 
 
 class UserSerializer(serializers.ModelSerializer):
     full_name = serializers.CharField(source="get_full_name", read_only=True)
+    profile_picture_renditions = ImageRenditionsField()
 
     class Meta:
         model = User
@@ -19,12 +22,24 @@ class UserSerializer(serializers.ModelSerializer):
             "full_name",
             "is_chef",
             "profile_picture",
+            "profile_picture_renditions",
             "email_confirmed",
             "created_at",
         )
         read_only_fields = ("id", "email_confirmed", "created_at")
 
 
+class AuthorSearchSerializer(serializers.ModelSerializer):
+    """Muallif qidiruvi natijasi (email qaytarilmaydi)"""
+
+    full_name = serializers.CharField(source="get_full_name", read_only=True)
+    profile_picture_renditions = ImageRenditionsField()
+
+    class Meta:
+        model = User
+        fields = ("id", "full_name", "is_chef", "profile_picture_renditions")
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password_confirm = serializers.CharField(write_only=True)
     profile_picture = serializers.ImageField(required=False)  # rasm maydoni
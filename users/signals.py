@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.images import delete_renditions, renditions_outdated
+
+from .tasks import generate_profile_picture_renditions
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def user_generate_renditions(sender, instance, **kwargs):
+    """Profil rasmi yuklangan yoki o'zgartirilganda variantlarni fonda yaratish"""
+    if not renditions_outdated(
+        instance.profile_picture, instance.profile_picture_renditions
+    ):
+        return
+    user_id = instance.pk
+    transaction.on_commit(
+        lambda: generate_profile_picture_renditions.delay(user_id), robust=True
+    )
+
+
+@receiver(post_delete, sender=User)
+def user_delete_renditions(sender, instance, **kwargs):
+    """Foydalanuvchi o'chirilganda profil rasmi variantlarini o'chirish"""
+    delete_renditions(instance, instance.profile_picture_renditions)
@@ -2,16 +2,15 @@ import logging
 import random
 
 from celery import shared_task
-from django.core.mail import send_mail
-from django.conf import settings
 from django.utils.translation import gettext as _
 from django.contrib.auth import get_user_model
-from .redis_helper import RedisHelper
+from core.images import refresh_renditions
+from .outbox import dispatch_outbox, enqueue_email
+from .redis_helper import EMAIL_VERIFY_TTL, redis_helper
 
 User = get_user_model()
 
 logger = logging.getLogger("users")
-redis_helper = RedisHelper()
 
 
 @shared_task
@@ -26,7 +25,7 @@ def send_verification_email(user_id):
         # Redis ga saqlash (24 soat)
         redis_helper.set_email_verification_code(user_id=user.id, code=verify_code)
 
-        # Email yuborish
+        # Outbox'ga qo'shish - dispatcher partiyalab yuboradi (kod muddati o'tsa yuborilmaydi)
         subject = _("Confirm your email address")
         message = _("""
         Hello {full_name},
@@ -41,16 +40,10 @@ def send_verification_email(user_id):
         Culinary Canvas Team
         """).format(full_name=user.get_full_name(), verify_code=verify_code)
 
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
+        enqueue_email(user.email, subject, message, expires_in=EMAIL_VERIFY_TTL)
 
-        logger.info(f"Verification code sent to {user.email}")
-        return f"Code sent to {user.email}"
+        logger.info(f"Verification code queued for {user.email}")
+        return f"Code queued for {user.email}"
 
     except User.DoesNotExist:
         logger.error(f"User with id {user_id} not found")
@@ -83,17 +76,45 @@ def send_welcome_email(user_id):
         Culinary Canvas Team
         """).format(full_name=user.get_full_name())
 
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
+        enqueue_email(user.email, subject, message)
 
-        logger.info(f"Welcome email sent to {user.email}")
-        return f"Welcome email sent to {user.email}"
+        logger.info(f"Welcome email queued for {user.email}")
+        return f"Welcome email queued for {user.email}"
 
     except Exception as e:
         logger.error(f"Error sending welcome email: {e!s}")
         return f"Error: {e!s}"
+
+
+@shared_task
+def dispatch_email_outbox():
+    """Outbox'dagi xatlarni bitta SMTP ulanishi orqali partiyalab yuborish"""
+    stats = dispatch_outbox()
+    if stats["sent"] or stats["retry"] or stats["failed"]:
+        logger.info(
+            f"Email outbox: {stats['sent']} sent, {stats['retry']} to retry, "
+            f"{stats['failed']} failed"
+        )
+    return f"Sent {stats['sent']} emails"
+
+
+@shared_task
+def generate_profile_picture_renditions(user_id):
+    """Profil rasmi uchun kichraytirilgan WebP/JPEG variantlar yaratish"""
+    try:
+        user = User.objects.only(
+            "id", "email", "profile_picture", "profile_picture_renditions"
+        ).get(id=user_id)
+    except User.DoesNotExist:
+        logger.error(f"User with id {user_id} not found")
+        return f"User {user_id} not found"
+
+    renditions = refresh_renditions(
+        user, "profile_picture", "profile_picture_renditions"
+    )
+    if renditions is None:
+        return f"Profile picture changed for {user.email}, skipped"
+
+    count = len(renditions.get("renditions", []))
+    logger.info(f"Generated {count} profile picture renditions for {user.email}")
+    return f"{count} renditions generated for {user.email}"
@@ -1 +1,181 @@
-# Create your tests here.
+import smtplib
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.redis_client import get_redis
+from users import outbox
+from users.models import OutboxEmail
+
+TEST_PROVIDERS = {
+    "default": {"OPTIONS": {}, "RATE_LIMIT": 0, "BATCH_SIZE": 2},
+    "limited": {"OPTIONS": {}, "RATE_LIMIT": 5, "BATCH_SIZE": 10},
+}
+
+
+class DisconnectingBackend(EmailBackend):
+    """``fail_after`` ta xatdan keyin server ulanishni uzadi"""
+
+    def __init__(self, fail_after=1, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_after = fail_after
+
+    def send_messages(self, messages):
+        if len(mail.outbox) >= self.fail_after:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+class RefusingBackend(EmailBackend):
+    """Faqat bitta manzilni rad etadi - ulanish ochiq qoladi"""
+
+    def send_messages(self, messages):
+        to = messages[0].to[0]
+        if to.startswith("refused"):
+            raise smtplib.SMTPRecipientsRefused({to: (550, b"No such user")})
+        return super().send_messages(messages)
+
+
+def create_emails(*names, provider="default"):
+    return [
+        OutboxEmail.objects.create(
+            provider=provider, to=f"{name}@example.com", subject="Hi", body="Body"
+        )
+        for name in names
+    ]
+
+
+class SendBatchTests(TestCase):
+    def test_sends_all_messages_over_one_connection(self):
+        emails = create_emails("a", "b", "c")
+        sent, failures, healthy = outbox.send_batch(EmailBackend(), emails)
+
+        self.assertEqual(sent, emails)
+        self.assertEqual(failures, [])
+        self.assertTrue(healthy)
+        self.assertEqual([m.to for m in mail.outbox], [[e.to] for e in emails])
+
+    def test_disconnect_fails_the_rest_of_the_batch(self):
+        emails = create_emails("a", "b", "c")
+        sent, failures, healthy = outbox.send_batch(DisconnectingBackend(fail_after=1), emails)
+
+        self.assertEqual(sent, emails[:1])
+        self.assertEqual([email for email, _ in failures], emails[1:])
+        self.assertIsInstance(failures[0][1], smtplib.SMTPServerDisconnected)
+        self.assertFalse(healthy)
+
+    def test_message_error_keeps_connection(self):
+        emails = create_emails("a", "refused", "c")
+        sent, failures, healthy = outbox.send_batch(RefusingBackend(), emails)
+
+        self.assertEqual(sent, [emails[0], emails[2]])
+        self.assertEqual([email for email, _ in failures], [emails[1]])
+        self.assertTrue(healthy)
+
+    def test_open_error_fails_whole_batch(self):
+        emails = create_emails("a", "b")
+        connection = EmailBackend()
+        with mock.patch.object(connection, "open", side_effect=ConnectionRefusedError("refused")):
+            sent, failures, healthy = outbox.send_batch(connection, emails)
+
+        self.assertEqual(sent, [])
+        self.assertEqual([email for email, _ in failures], emails)
+        self.assertFalse(healthy)
+        self.assertEqual(mail.outbox, [])
+
+
+@override_settings(
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3, EMAIL_OUTBOX_RETRY_DELAY=30, EMAIL_OUTBOX_RETRY_MAX_DELAY=100
+)
+class RecordResultsTests(TestCase):
+    def test_marks_sent(self):
+        emails = create_emails("a", "b")
+        stats = outbox.record_results(emails, [])
+
+        self.assertEqual(stats["sent"], 2)
+        for email in emails:
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboxEmail.Status.SENT)
+            self.assertIsNotNone(email.sent_at)
+
+    @mock.patch("users.outbox.random.uniform", return_value=1)
+    def test_backoff_doubles_up_to_max_delay(self, uniform):
+        (email,) = create_emails("a")
+        error = smtplib.SMTPServerDisconnected("gone")
+        delays = []
+        for _ in range(2):
+            before = timezone.now()
+            stats = outbox.record_results([], [(email, error)])
+            self.assertEqual(stats["retry"], 1)
+            email.refresh_from_db()
+            delays.append(round((email.next_attempt_at - before).total_seconds()))
+
+        self.assertEqual(delays, [30, 60])
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+        self.assertEqual(email.last_error, "SMTPServerDisconnected: gone")
+        self.assertEqual(round(outbox.retry_delay(5)), 100)
+
+    def test_jitter_stays_within_twenty_percent(self):
+        for _ in range(50):
+            self.assertTrue(24 <= outbox.retry_delay(1) <= 36)
+
+    def test_fails_after_max_attempts(self):
+        (email,) = create_emails("a")
+        email.attempts = 2
+        stats = outbox.record_results([], [(email, ValueError("bad address"))])
+
+        self.assertEqual(stats, {"failed": 1})
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxEmail.Status.FAILED)
+        self.assertEqual(email.attempts, 3)
+
+
+@override_settings(EMAIL_OUTBOX_PROVIDERS=TEST_PROVIDERS)
+class SendSlotsTests(TestCase):
+    def setUp(self):
+        # Daqiqa chegarasida hisoblagich kaliti almashmasligi uchun vaqt qotiriladi
+        patcher = mock.patch.object(outbox, "time", wraps=outbox.time)
+        self.time = patcher.start()
+        self.time.time.return_value = 1_700_000_000
+        self.addCleanup(patcher.stop)
+        self.key = outbox.RATE_KEY.format("limited", 1_700_000_000 // 60)
+        get_redis().delete(self.key)
+        self.addCleanup(get_redis().delete, self.key)
+
+    def test_grants_up_to_limit(self):
+        self.assertEqual(outbox.acquire_send_slots("limited", 3), 3)
+        self.assertEqual(outbox.acquire_send_slots("limited", 3), 2)
+        self.assertEqual(outbox.acquire_send_slots("limited", 3), 0)
+        self.assertEqual(int(get_redis().get(self.key)), 5)
+
+    def test_release_returns_slots(self):
+        self.assertEqual(outbox.acquire_send_slots("limited", 5), 5)
+        outbox.release_send_slots("limited", 2)
+        self.assertEqual(outbox.acquire_send_slots("limited", 3), 2)
+
+    def test_unlimited_provider(self):
+        self.assertEqual(outbox.acquire_send_slots("default", 1000), 1000)
+
+    def test_redis_error_grants_nothing(self):
+        with mock.patch.object(outbox, "get_redis", side_effect=ConnectionError("down")):
+            self.assertEqual(outbox.acquire_send_slots("limited", 3), 0)
+
+
+@override_settings(EMAIL_OUTBOX_PROVIDERS=TEST_PROVIDERS)
+class DispatchOutboxTests(TestCase):
+    def test_sends_pending_emails_in_batches(self):
+        create_emails("a", "b", "c")
+        expired = create_emails("late")[0]
+        expired.expires_at = timezone.now() - timedelta(minutes=1)
+        expired.save()
+
+        stats = outbox.dispatch_outbox(["default"])
+
+        self.assertEqual(stats["sent"], 3)
+        self.assertEqual(stats["expired"], 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboxEmail.objects.filter(status=OutboxEmail.Status.PENDING).exists())
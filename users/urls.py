@@ -1,5 +1,5 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
 
 from . import views
 
@@ -7,7 +7,7 @@ app_name = "users"
 
 urlpatterns = [
     # ===================== Authentication =====================
-    path("login/", TokenObtainPairView.as_view(), name="login"),
+    path("login/", views.LoginView.as_view(), name="login"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("register/", views.RegisterView.as_view(), name="register"),
 
@@ -26,4 +26,5 @@ urlpatterns = [
     # ===================== User Data =====================
     path("my-recipes/", views.UserRecipesView.as_view(), name="user-recipes"),
     path("stats/", views.UserStatsView.as_view(), name="user-stats"),
+    path("authors/", views.AuthorSearchView.as_view(), name="author-search"),
 ]
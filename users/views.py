@@ -1,19 +1,23 @@
 import logging
-from django.db.models import Avg
+from django.db.models import Avg, Exists, OuterRef
 from django.utils.translation import gettext_lazy as _
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import authenticate
 from rest_framework.permissions import AllowAny
 from django.core.cache import cache
 from rest_framework.parsers import MultiPartParser, FormParser
 
-from users.redis_helper import RedisHelper
+from dishes.ratings import with_user_rating
+from users.redis_helper import redis_helper
+from users.search import search_users
 
 from .models import User
 from .serializers import (
+    AuthorSearchSerializer,
     PasswordChangeSerializer,
     UserProfileUpdateSerializer,
     UserRegistrationSerializer,
@@ -26,10 +30,16 @@ from .tasks import send_verification_email, send_welcome_email
 
 logger = logging.getLogger("users")
 
+class LoginView(TokenObtainPairView):
+    """JWT login (parol tanlashga qarshi "auth" limiti bilan)"""
+    throttle_scope = "auth"
+
+
 class RegisterView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     queryset = User.objects.all()
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "auth"
     parser_classes = [MultiPartParser, FormParser]  # <- bu qo'shildi
 
     def create(self, request, *args, **kwargs):
@@ -69,6 +79,7 @@ class PasswordChangeView(generics.GenericAPIView):
     serializer_class = PasswordChangeSerializer
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
+    throttle_scope = "auth"
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -93,7 +104,8 @@ class UserRecipesView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Recipe.objects.filter(author=self.request.user).order_by("-created_at")
+        queryset = Recipe.objects.filter(author=self.request.user)
+        return with_user_rating(queryset, self.request.user).order_by("-created_at")
 
 
 class UserStatsView(APIView):
@@ -121,9 +133,30 @@ class UserStatsView(APIView):
             }
         )
 
-redis_helper = RedisHelper()
+
+class AuthorSearchView(generics.ListAPIView):
+    """Mualliflarni ism, familiya yoki email bo'yicha qidirish (``?q=``).
+
+    Natijalar trigram o'xshashligi bo'yicha saralanadi (xatoli yozuvlar ham
+    topiladi) - ``/recipes/?author=`` filtri uchun avtoto'ldirish manbai.
+    Faqat chop etilgan retsepti bor foydalanuvchilar qaytariladi.
+    """
+    serializer_class = AuthorSearchSerializer
+    permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        authors = User.objects.filter(
+            Exists(Recipe.objects.filter(author=OuterRef("pk"), is_draft=False))
+        )
+        return search_users(self.request.query_params.get("q", ""), authors)
+
+
 class VerifyEmailView(APIView):
     permission_classes = [AllowAny]
+    # 6 xonali kodni tanlab topishga qarshi
+    throttle_scope = "auth"
+    throttle_account_scope = "verify"
+    throttle_account_field = "email"
     serializer_class = VerifyEmailSerializer
     parser_classes = [MultiPartParser, FormParser]
 